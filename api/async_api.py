@@ -0,0 +1,535 @@
+import asyncio
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import sqlalchemy
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from api.cache import DEFAULT_TTL, ResultCache, make_key
+from api.coalesce import AsyncSingleFlight
+from api.incremental import IncrementalStore, filter_range
+from api.instrumentation import QueryRecorder
+from api.internal_api import (
+    SUPPORTED_BACKENDS,
+    SynthetixAPI,
+    _concat_results,
+    _from_arrow,
+    _incremental_bounds,
+    _to_arrow,
+)
+from api.queries import Query, as_query
+from api.streaming import write_chunks
+from api.windows import OPEN_WINDOW_TTL, align_window, split_window
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSynthetixAPI(SynthetixAPI):
+    """
+    Asyncio variant of the SynthetixAPI.
+
+    Exposes the same get_* methods, but every query runs on an async engine
+    and the methods return coroutines. This lets callers `asyncio.gather` DB
+    queries together with other awaitables, such as on-chain reads.
+    """
+
+    def __init__(
+        self,
+        db_config: dict,
+        environment: str = "prod",
+        streamlit: bool = True,
+        cache: Optional[ResultCache] = None,
+        incremental_store: Optional[IncrementalStore] = None,
+        recorder: Optional[QueryRecorder] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the AsyncSynthetixAPI.
+
+        Args:
+            environment (str): The environment to query data for ('prod' or 'dev')
+            cache (ResultCache, optional): Shared cache for query results
+            incremental_store (IncrementalStore, optional): Local store for
+                incremental queries. Defaults to an in-memory store.
+            recorder (QueryRecorder, optional): Records timings and plans of
+                every query
+            max_concurrency (int, optional): Maximum number of queries in flight.
+                Defaults to the size of the connection pool including overflow.
+            timeout (float, optional): Seconds after which a query is cancelled
+        """
+        super().__init__(
+            db_config,
+            environment=environment,
+            streamlit=streamlit,
+            cache=cache,
+            incremental_store=incremental_store,
+            recorder=recorder,
+        )
+        self.Session = async_sessionmaker(bind=self.engine)
+        self.single_flight = AsyncSingleFlight()
+        # background refreshes and plan captures, referenced until they finish
+        self._background_tasks = set()
+        self.max_concurrency = max_concurrency or self.POOL_SIZE + self.MAX_OVERFLOW
+        self.timeout = timeout
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._incremental_locks = weakref.WeakKeyDictionary()
+
+    def _create_engine(self):
+        """Create and return an async database engine with connection pooling."""
+        connection_string = self._connection_string().replace(
+            "postgresql://", "postgresql+psycopg_async://", 1
+        )
+        return create_async_engine(
+            connection_string,
+            pool_size=self.POOL_SIZE,
+            max_overflow=self.MAX_OVERFLOW,
+            connect_args={"prepare_threshold": self.PREPARE_THRESHOLD},
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.engine.dispose()
+        self.arrow_pool.dispose()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.engine.sync_engine.dispose()
+        self.arrow_pool.dispose()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency limiter for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[loop]
+
+    def _incremental_lock(self, key: tuple) -> asyncio.Lock:
+        """Return the lock serializing incremental updates to a key on the running event loop."""
+        locks = self._incremental_locks.setdefault(asyncio.get_running_loop(), {})
+        return locks.setdefault(key, asyncio.Lock())
+
+    @asynccontextmanager
+    async def _get_connection(self) -> AsyncGenerator[AsyncConnection, None]:
+        """
+        Context manager for async database connections.
+
+        If the surrounding task is cancelled, the running statement is cancelled
+        on the server before the connection is returned to the pool.
+        """
+        async with self.engine.connect() as connection:
+            try:
+                yield connection
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                raw_connection = await connection.get_raw_connection()
+                await raw_connection.driver_connection.cancel_safe()
+                raise
+
+    def _background(self, coroutine):
+        """Run a coroutine as a task on the running event loop, logging its failure."""
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._background_tasks.add(task)
+
+        def done(task: asyncio.Task):
+            self._background_tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning("Background query failed", exc_info=task.exception())
+
+        task.add_done_callback(done)
+
+    async def _run_query(
+        self,
+        query: Union[str, Query],
+        backend: str = "pandas",
+        ttl: Optional[float] = DEFAULT_TTL,
+        params: Optional[dict] = None,
+    ) -> Union[pd.DataFrame, pl.DataFrame, pa.Table]:
+        """
+        Run a SQL query and return the results as a DataFrame.
+
+        Same as `SynthetixAPI._run_query`: identical concurrent queries share
+        one execution, and stale results are returned while they are refreshed
+        in a background task. Cache reads and writes run in a worker thread,
+        so disk and network caches do not block the event loop.
+
+        Args:
+            query (str | Query): The SQL query to run, with `:name` bind parameters.
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            ttl (float, optional): Seconds to cache the results for. Defaults to
+                the cache ttl, None caches them until they are evicted.
+            params (dict, optional): Values of the bind parameters.
+
+        Returns:
+            pandas.DataFrame | polars.DataFrame | pyarrow.Table: The query results.
+        """
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(f"Invalid backend: {backend}")
+
+        start = time.perf_counter()
+        query = as_query(query, params)
+
+        async def execute():
+            result = await self._execute(query, backend)
+            await asyncio.to_thread(self._set_cached, query, result, ttl)
+            return result
+
+        key = f"{backend}:{make_key(*query)}"
+        cached, stale = await asyncio.to_thread(self._lookup_cached, query, backend)
+        if cached is not None:
+            if stale:
+                self._refresh(key, execute)
+            self._record(
+                query, backend, "stale" if stale else "cache", start, result=cached
+            )
+            return cached
+
+        # concurrent identical queries share one execution
+        return await self.single_flight.do(
+            key,
+            execute,
+            copy=lambda df: df.copy() if isinstance(df, pd.DataFrame) else df,
+        )
+
+    def _refresh(self, key: str, execute: Callable[[], Awaitable]):
+        """Re-run a query in a background task, unless it is already running."""
+        if self.single_flight.is_running(key):
+            return
+        self._background(self.single_flight.do(key, execute))
+
+    async def _execute(
+        self, query: Query, backend: str = "pandas"
+    ) -> Union[pd.DataFrame, pl.DataFrame, pa.Table]:
+        """Run a SQL query against the database, bypassing the cache."""
+        start = time.perf_counter()
+        pool_wait = connect = None
+        try:
+            async with self._semaphore():
+                if backend == "pandas":
+                    connect_start = time.perf_counter()
+                    async with self._get_connection() as conn:
+                        pool_wait = time.perf_counter() - connect_start
+                        result = await asyncio.wait_for(
+                            conn.run_sync(
+                                lambda sync_conn: pd.read_sql_query(
+                                    query.text(), sync_conn, params=query.params
+                                )
+                            ),
+                            self.timeout,
+                        )
+                else:
+                    table, pool_wait, connect = await self._fetch_arrow_async(query)
+                    result = _from_arrow(table, backend)
+        except Exception as e:
+            self._record(
+                query,
+                backend,
+                "db",
+                start,
+                error=str(e),
+                pool_wait=pool_wait,
+                connect=connect,
+            )
+            raise
+
+        self._record(
+            query,
+            backend,
+            "db",
+            start,
+            result=result,
+            pool_wait=pool_wait,
+            connect=connect,
+        )
+        return result
+
+    async def _fetch_arrow_async(
+        self, query: Query
+    ) -> Tuple[pa.Table, float, Optional[float]]:
+        """
+        Fetch a query through ADBC in a worker thread.
+
+        A thread cannot be interrupted, so when the caller is cancelled or the
+        timeout expires the running statement is cancelled on the server, and
+        the thread is awaited before the error propagates. The caller's
+        concurrency slot and the connection are released only once the
+        statement has stopped.
+
+        Returns:
+            tuple: The query results, the seconds spent waiting for a pooled
+                connection and the seconds spent opening it, if it was new
+        """
+        connections = []
+
+        def on_connect(connection):
+            # runs in the worker thread, which holds the connection timings
+            connections.append((connection, self._local.pool_wait, self._local.connect))
+
+        fetch = asyncio.ensure_future(
+            asyncio.to_thread(self._fetch_arrow, query, on_connect)
+        )
+        try:
+            table = await asyncio.wait_for(asyncio.shield(fetch), self.timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            for connection, _, _ in connections:
+                connection.adbc_cancel()
+            await asyncio.gather(fetch, return_exceptions=True)
+            raise
+        _, pool_wait, connect = connections[0]
+        return table, pool_wait, connect
+
+    def _schedule_explain(self, query: Query, record: dict):
+        """Capture the plan of a slow query in a background task."""
+        self._background(self._explain(query, record))
+
+    async def _explain(self, query: Query, record: dict):
+        """Capture the plan of a slow query with EXPLAIN (ANALYZE, BUFFERS)."""
+        try:
+            async with self._semaphore():
+                async with self._get_connection() as conn:
+                    result = await conn.execute(
+                        sqlalchemy.text(
+                            f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query.sql}"
+                        ),
+                        query.params,
+                    )
+                    plan = result.scalar()
+            self.recorder.attach_plan(record, plan)
+        except Exception as e:
+            logger.warning(f"Failed to capture query plan: {e}")
+
+    async def _run_windowed(
+        self,
+        query: Callable[[datetime, datetime], Query],
+        start_date: datetime,
+        end_date: datetime,
+        resolution: str = "daily",
+        backend: str = "pandas",
+    ) -> Union[pd.DataFrame, pl.DataFrame, pa.Table]:
+        """
+        Run a date range query with its window aligned to bucket boundaries.
+
+        Same as `SynthetixAPI._run_windowed`, with the closed months and the
+        open bucket queried concurrently.
+
+        Args:
+            query (callable): Builds the Query for a (start_date, end_date) range,
+                with an inclusive end day
+            start_date (datetime): Start date for the query
+            end_date (datetime): End date for the query
+            resolution (str): Bucket resolution ('daily', 'hourly' or 'monthly')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+
+        Returns:
+            pandas.DataFrame | polars.DataFrame | pyarrow.Table: The query results.
+        """
+        start_date, end_date = align_window(start_date, end_date, resolution)
+        windows = (
+            split_window(start_date, end_date, resolution)
+            if self.cache is not None
+            else []
+        )
+        if not windows:
+            return await self._run_query(query(start_date, end_date), backend=backend)
+
+        results = await asyncio.gather(
+            *[
+                self._run_query(
+                    query(window_start, window_end),
+                    backend=backend,
+                    ttl=ttl,
+                )
+                for window_start, window_end, ttl in windows
+            ]
+        )
+        return _concat_results(list(results), backend)
+
+    async def _run_incremental(
+        self,
+        key: tuple,
+        query: Callable[[datetime, datetime], Query],
+        start_date: datetime,
+        end_date: datetime,
+        backend: str = "pandas",
+        ts_col: str = "ts",
+        resolution: str = "daily",
+    ) -> Union[pd.DataFrame, pl.DataFrame, pa.Table]:
+        """
+        Run a time-series query incrementally against the local store.
+
+        Same as `SynthetixAPI._run_incremental`, with updates to a key
+        serialized by an asyncio lock instead of blocking the event loop.
+
+        Args:
+            key (tuple): Store key, usually (method, chain, resolution)
+            query (callable): Builds the Query for a (start_date, end_date) range
+            start_date (datetime): Start date for the query
+            end_date (datetime): End date for the query
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            ts_col (str): The timestamp column of the query
+            resolution (str): Bucket resolution of the query ('daily', 'hourly'
+                or 'monthly')
+
+        Returns:
+            pandas.DataFrame | polars.DataFrame | pyarrow.Table: The query results.
+        """
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(f"Invalid backend: {backend}")
+
+        key = (self.environment, *key)
+        start, end = _incremental_bounds(start_date, end_date)
+
+        async with self._incremental_lock(key):
+            stored = self.incremental_store.get(key)
+            if stored is None or start < stored[1]:
+                df = await self._execute(query(start_date, end_date))
+                self.incremental_store.put(key, df, start)
+            else:
+                since = self._delta_start(*stored, ts_col, resolution)
+                if end > since:
+                    delta = await self._run_query(
+                        query(since.to_pydatetime(), end_date), ttl=OPEN_WINDOW_TTL
+                    )
+                    self.incremental_store.merge(key, delta, ts_col)
+            df, _ = self.incremental_store.get(key)
+
+        result = filter_range(df, start_date, end_date, ts_col)
+        return result if backend == "pandas" else _from_arrow(_to_arrow(result), backend)
+
+    async def iter_query(
+        self,
+        query: Union[str, Query],
+        chunk_rows: int = 100_000,
+        backend: str = "pandas",
+        params: Optional[dict] = None,
+    ) -> AsyncIterator[Union[pd.DataFrame, pl.DataFrame, pa.Table]]:
+        """
+        Stream the results of a SQL query in chunks of at most `chunk_rows` rows.
+
+        Same as `SynthetixAPI.iter_query`, as an async generator. The 'pandas'
+        backend streams a server-side cursor on the async engine, the Arrow
+        backends read each chunk of the ADBC COPY stream in a worker thread.
+        The stream counts towards `max_concurrency` until it is exhausted or
+        closed.
+
+        Args:
+            query (str | Query): The SQL query to run, with `:name` bind parameters.
+            chunk_rows (int): Maximum number of rows per chunk.
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            params (dict, optional): Values of the bind parameters.
+
+        Yields:
+            pandas.DataFrame | polars.DataFrame | pyarrow.Table: The query results.
+        """
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(f"Invalid backend: {backend}")
+
+        query = as_query(query, params)
+        async with self._semaphore():
+            if backend == "pandas":
+                async with self._get_connection() as conn:
+                    result = await conn.stream(query.text(), query.params)
+                    columns = list(result.keys())
+                    async for rows in result.partitions(chunk_rows):
+                        yield pd.DataFrame.from_records(
+                            rows, columns=columns, coerce_float=True
+                        )
+                return
+
+            chunks = self._iter_arrow(query, chunk_rows, backend)
+            try:
+                while True:
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if chunk is None:
+                        break
+                    yield chunk
+            finally:
+                await asyncio.to_thread(chunks.close)
+
+    async def export_query(
+        self,
+        query: Union[str, Query],
+        sink: Union[str, BinaryIO],
+        file_format: str = "csv",
+        chunk_rows: int = 100_000,
+        params: Optional[dict] = None,
+    ) -> int:
+        """
+        Stream the results of a SQL query to a CSV or Parquet file.
+
+        Same as `SynthetixAPI.export_query`, with the export running in a
+        worker thread so the event loop is not blocked by the file writes.
+
+        Args:
+            query (str | Query): The SQL query to run, with `:name` bind parameters.
+            sink (str | file): Path or binary file object to write to.
+            file_format (str): 'csv' or 'parquet'
+            chunk_rows (int): Maximum number of rows per chunk.
+            params (dict, optional): Values of the bind parameters.
+
+        Returns:
+            int: The number of rows written
+        """
+        chunks = self._iter_arrow(as_query(query, params), chunk_rows, "pyarrow")
+        async with self._semaphore():
+            return await asyncio.to_thread(write_chunks, chunks, sink, file_format)
+
+    async def fetch_many(
+        self, specs: Dict[str, List[dict]], max_workers: Optional[int] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Run many independent get_* queries concurrently.
+
+        Args:
+            specs (dict): Mapping of result name to a list of specs, each a dict
+                with a 'method' key and the keyword arguments for that method.
+            max_workers (int, optional): Unused, concurrency is bounded by
+                `max_concurrency`. Accepted for compatibility with SynthetixAPI.
+
+        Returns:
+            dict: Mapping of result name to the concatenated DataFrame
+        """
+        for spec in [spec for name_specs in specs.values() for spec in name_specs]:
+            if not spec.get("method", "").startswith("get_"):
+                raise ValueError(f"Invalid method: {spec.get('method')}")
+
+        names = list(specs.keys())
+        results = await asyncio.gather(
+            *[
+                asyncio.gather(
+                    *[
+                        getattr(self, spec["method"])(
+                            **{k: v for k, v in spec.items() if k != "method"}
+                        )
+                        for spec in specs[name]
+                    ]
+                )
+                for name in names
+            ]
+        )
+        return {
+            name: (pd.concat(frames, ignore_index=True) if frames else pd.DataFrame())
+            for name, frames in zip(names, results)
+        }
@@ -0,0 +1,376 @@
+import functools
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Callable, Optional, Tuple
+
+import pyarrow as pa
+import streamlit as st
+from dotenv import load_dotenv
+
+# ttl sentinel meaning "use the default ttl of the cache"
+DEFAULT_TTL = -1
+
+# schema metadata key holding the unix time an entry expires at
+EXPIRES_AT_KEY = b"synthetix:expires_at"
+
+# matches single quoted SQL literals, including escaped quotes
+SQL_LITERAL_RE = re.compile(r"('(?:[^']|'')*')")
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace outside of string literals so equivalent queries share a key."""
+    parts = SQL_LITERAL_RE.split(query)
+    return "".join(
+        part if i % 2 else re.sub(r"\s+", " ", part) for i, part in enumerate(parts)
+    ).strip()
+
+
+def make_key(query: str, params: Optional[dict] = None) -> str:
+    """Return a stable cache key for a query and its parameters."""
+    payload = json.dumps(
+        {"query": normalize_query(query), "params": params or {}},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _to_ipc(table: pa.Table) -> bytes:
+    """Serialize an Arrow table to the Arrow IPC stream format."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _from_ipc(data: bytes) -> pa.Table:
+    """Deserialize an Arrow table from the Arrow IPC stream format."""
+    return pa.ipc.open_stream(pa.py_buffer(data)).read_all()
+
+
+class ResultCache:
+    """
+    Base class for query result caches.
+
+    Entries are Arrow tables keyed on the normalized query and its parameters,
+    so they can be shared between processes and returned as any result backend.
+    Subclasses implement `_read`, `_write`, `_delete` and `clear`.
+    """
+
+    def __init__(self, ttl: Optional[float] = 1800, stale_ttl: float = 0):
+        """
+        Args:
+            ttl (float, optional): Default seconds before an entry expires.
+                None keeps entries until they are evicted.
+            stale_ttl (float): Seconds after expiry that an entry may still be
+                served by `lookup` while it is refreshed
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+        }
+        self._stats_lock = threading.Lock()
+
+    def _count(self, stat: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[stat] += n
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups that were served from the cache, fresh or stale."""
+        hits = self.stats["hits"] + self.stats["stale_hits"]
+        lookups = hits + self.stats["misses"]
+        return hits / lookups if lookups > 0 else 0
+
+    def _find(self, key: str) -> Tuple[Optional[pa.Table], bool]:
+        """Return the cached table for a key and whether it is stale, without counting."""
+        table = self._read(key)
+        stale = False
+        if table is not None:
+            expires_at = (table.schema.metadata or {}).get(EXPIRES_AT_KEY)
+            if expires_at is not None and float(expires_at) < time.time():
+                if float(expires_at) + self.stale_ttl < time.time():
+                    self._delete(key)
+                    table = None
+                else:
+                    stale = True
+        return table, stale
+
+    def lookup(self, key: str) -> Tuple[Optional[pa.Table], bool]:
+        """
+        Return the cached table for a key and whether it is stale.
+
+        Expired entries are returned as stale until `stale_ttl` seconds after
+        their expiry, so callers can serve them while refreshing them.
+
+        Returns:
+            tuple: The table, or None if it is missing, and the stale flag
+        """
+        table, stale = self._find(key)
+        if table is None:
+            self._count("misses")
+        else:
+            self._count("stale_hits" if stale else "hits")
+        return table, stale
+
+    def get(self, key: str) -> Optional[pa.Table]:
+        """
+        Return the cached table for a key, or None if it is missing or expired.
+
+        Stale entries are not served by `get`, so they count as misses.
+        """
+        table, stale = self._find(key)
+        if table is None or stale:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return table
+
+    def set(self, key: str, table: pa.Table, ttl: Optional[float] = DEFAULT_TTL):
+        """
+        Store a table under a key.
+
+        Args:
+            key (str): The cache key
+            table (pyarrow.Table): The table to store
+            ttl (float, optional): Seconds before the entry expires. Defaults to
+                the cache ttl, None keeps the entry until it is evicted.
+        """
+        ttl = self.ttl if ttl == DEFAULT_TTL else ttl
+        metadata = dict(table.schema.metadata or {})
+        metadata.pop(EXPIRES_AT_KEY, None)
+        if ttl is not None:
+            metadata[EXPIRES_AT_KEY] = str(time.time() + ttl).encode()
+        self._write(key, table.replace_schema_metadata(metadata), ttl)
+        self._count("sets")
+
+    def delete(self, key: str):
+        """Remove an entry from the cache."""
+        self._delete(key)
+
+    def clear(self):
+        raise NotImplementedError
+
+    def _read(self, key: str) -> Optional[pa.Table]:
+        raise NotImplementedError
+
+    def _write(self, key: str, table: pa.Table, ttl: Optional[float]):
+        raise NotImplementedError
+
+    def _delete(self, key: str):
+        raise NotImplementedError
+
+    def cached(self, ttl: Optional[float] = DEFAULT_TTL) -> Callable:
+        """
+        Decorator caching a function that returns a DataFrame or a dict of DataFrames.
+
+        This is the cross-process counterpart to `st.cache_data` for dashboard
+        `fetch_data` functions. Arguments are part of the key, so they must have
+        a stable string representation.
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                base_key = make_key(
+                    f"{func.__module__}.{func.__qualname__}",
+                    {"args": args, "kwargs": kwargs},
+                )
+                names = self.get(base_key)
+                if names is not None:
+                    tables = {
+                        name: self.get(f"{base_key}:{name}")
+                        for name in names.column("name").to_pylist()
+                    }
+                    if all(table is not None for table in tables.values()):
+                        frames = {
+                            name: table.to_pandas() for name, table in tables.items()
+                        }
+                        return frames[None] if None in frames else frames
+
+                result = func(*args, **kwargs)
+                frames = result if isinstance(result, dict) else {None: result}
+                for name, df in frames.items():
+                    self.set(
+                        f"{base_key}:{name}",
+                        pa.Table.from_pandas(df, preserve_index=False),
+                        ttl,
+                    )
+                self.set(base_key, pa.table({"name": list(frames.keys())}), ttl)
+                return result
+
+            return wrapper
+
+        return decorator
+
+
+class DiskCache(ResultCache):
+    """
+    Result cache stored as Arrow IPC files in a local directory.
+
+    Files are written atomically, so several processes can share the same
+    directory. The directory is bounded to `max_bytes`, evicting the least
+    recently used entries first.
+    """
+
+    def __init__(
+        self,
+        directory: str = ".cache/results",
+        max_bytes: int = 1024**3,
+        ttl: Optional[float] = 1800,
+        stale_ttl: float = 0,
+    ):
+        """
+        Args:
+            directory (str): Directory to store the cache files in
+            max_bytes (int): Maximum total size of the cache files
+            ttl (float, optional): Default seconds before an entry expires
+            stale_ttl (float): Seconds after expiry an entry may be served stale
+        """
+        super().__init__(ttl=ttl, stale_ttl=stale_ttl)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.arrow")
+
+    def _read(self, key: str) -> Optional[pa.Table]:
+        path = self._path(key)
+        try:
+            with pa.OSFile(path) as source:
+                table = pa.ipc.open_file(source).read_all()
+            # bump the modification time, which orders entries for eviction
+            os.utime(path)
+            return table
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+
+    def _write(self, key: str, table: pa.Table, ttl: Optional[float]):
+        tmp_path = os.path.join(self.directory, f".{key}.{uuid.uuid4().hex}.tmp")
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(
+                sink, table.schema, options=pa.ipc.IpcWriteOptions(compression="zstd")
+            ) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".arrow"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self._count("evictions")
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".arrow"):
+                os.remove(entry.path)
+
+
+class RedisCache(ResultCache):
+    """
+    Result cache stored in Redis, or any client with the same get/set/delete API.
+
+    Keys expire in Redis once their stale window has passed, and size-bounded
+    LRU eviction is delegated to the server's `maxmemory` and
+    `maxmemory-policy allkeys-lru` settings.
+    """
+
+    def __init__(
+        self,
+        client,
+        prefix: str = "synthetix:",
+        ttl: Optional[float] = 1800,
+        stale_ttl: float = 0,
+    ):
+        """
+        Args:
+            client: A Redis client, or a compatible local stand-in
+            prefix (str): Prefix for all keys written by this cache
+            ttl (float, optional): Default seconds before an entry expires
+            stale_ttl (float): Seconds after expiry an entry may be served stale
+        """
+        super().__init__(ttl=ttl, stale_ttl=stale_ttl)
+        self.client = client
+        self.prefix = prefix
+
+    def _write(self, key: str, table: pa.Table, ttl: Optional[float]):
+        self.client.set(
+            f"{self.prefix}{key}",
+            _to_ipc(table),
+            ex=int(ttl + self.stale_ttl) if ttl is not None else None,
+        )
+
+    def _read(self, key: str) -> Optional[pa.Table]:
+        data = self.client.get(f"{self.prefix}{key}")
+        return _from_ipc(data) if data is not None else None
+
+    def _delete(self, key: str):
+        self.client.delete(f"{self.prefix}{key}")
+
+    def clear(self):
+        keys = list(self.client.scan_iter(f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def get_result_cache(streamlit: bool = True) -> ResultCache:
+    """
+    Create the result cache from the `cache` secrets or environment variables.
+
+    Uses Redis when REDIS_URL is set, otherwise a local disk cache in CACHE_DIR.
+    """
+    if streamlit:
+        config = st.secrets.get("cache", {})
+    else:
+        load_dotenv()
+        config = os.environ
+
+    ttl = float(config.get("CACHE_TTL", 1800))
+    stale_ttl = float(config.get("CACHE_STALE_TTL", 86400))
+    if config.get("REDIS_URL"):
+        import redis
+
+        return RedisCache(
+            redis.Redis.from_url(config["REDIS_URL"]), ttl=ttl, stale_ttl=stale_ttl
+        )
+
+    return DiskCache(
+        directory=config.get("CACHE_DIR", ".cache/results"),
+        max_bytes=int(config.get("CACHE_MAX_MB", 1024)) * 1024**2,
+        ttl=ttl,
+        stale_ttl=stale_ttl,
+    )
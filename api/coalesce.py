@@ -0,0 +1,164 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into a single execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait for it and receive the same result, or the same exception.
+    """
+
+    def __init__(self, coalesce: bool = True):
+        """
+        Args:
+            coalesce (bool): Whether to coalesce calls. When False every call
+                runs `fn` itself, e.g. to benchmark concurrent identical queries.
+        """
+        self.coalesce = coalesce
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.stats = {"executions": 0, "coalesced": 0}
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently executing."""
+        with self._lock:
+            return len(self._calls)
+
+    def is_running(self, key: str) -> bool:
+        """Whether a call with the given key is in flight."""
+        with self._lock:
+            return key in self._calls
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        copy: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """
+        Run `fn`, or wait for the in-flight call with the same key.
+
+        Args:
+            key (str): Identifies identical calls
+            fn (callable): The function to run
+            copy (callable, optional): Applied to the result handed to waiters,
+                for results that callers may mutate
+
+        Returns:
+            The result of `fn`
+        """
+        if not self.coalesce:
+            with self._lock:
+                self.stats["executions"] += 1
+            return fn()
+
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.stats["executions"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            result = future.result()
+            return copy(result) if copy is not None else result
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """
+    Coalesce concurrent coroutines with the same key into a single execution.
+
+    Same as `SingleFlight` for coroutines on an event loop. In-flight calls are
+    tracked per event loop, since a future cannot be awaited from another loop.
+    """
+
+    def __init__(self, coalesce: bool = True):
+        """
+        Args:
+            coalesce (bool): Whether to coalesce calls. When False every call
+                runs `fn` itself, e.g. to benchmark concurrent identical queries.
+        """
+        self.coalesce = coalesce
+        self._calls = weakref.WeakKeyDictionary()
+        self.stats = {"executions": 0, "coalesced": 0}
+
+    def _loop_calls(self) -> Dict[str, asyncio.Future]:
+        """Return the in-flight calls of the running event loop."""
+        return self._calls.setdefault(asyncio.get_running_loop(), {})
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently executing on the running event loop."""
+        return len(self._loop_calls())
+
+    def is_running(self, key: str) -> bool:
+        """Whether a call with the given key is in flight on the running event loop."""
+        return key in self._loop_calls()
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        copy: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """
+        Await `fn()`, or wait for the in-flight call with the same key.
+
+        Waiters are shielded from each other: cancelling a waiter does not
+        cancel the shared call.
+
+        Args:
+            key (str): Identifies identical calls
+            fn (callable): Returns the coroutine to run
+            copy (callable, optional): Applied to the result handed to waiters,
+                for results that callers may mutate
+
+        Returns:
+            The result of `fn()`
+        """
+        if not self.coalesce:
+            self.stats["executions"] += 1
+            return await fn()
+
+        calls = self._loop_calls()
+        future = calls.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            result = await asyncio.shield(future)
+            return copy(result) if copy is not None else result
+
+        future = asyncio.get_running_loop().create_future()
+        calls[key] = future
+        self.stats["executions"] += 1
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # the leader re-raises, so waiters are not required to retrieve it
+            future.exception()
+            raise
+        finally:
+            del calls[key]
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# parquet metadata key holding the earliest timestamp the stored rows cover
+COVERED_FROM_KEY = b"synthetix:covered_from"
+
+
+def to_timestamp(value: Union[date, datetime, str], tz=None) -> pd.Timestamp:
+    """Convert a date or datetime bound to a timestamp comparable with the `ts` column."""
+    ts = pd.Timestamp(value)
+    if tz is not None:
+        ts = ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+    elif ts.tzinfo is not None:
+        ts = ts.tz_convert(None)
+    return ts
+
+
+def filter_range(
+    df: pd.DataFrame,
+    start_date: Union[date, datetime],
+    end_date: Union[date, datetime],
+    ts_col: str = "ts",
+) -> pd.DataFrame:
+    """
+    Select the rows of a frame within a date range.
+
+    Dates include the whole end day, matching the half-open day ranges of the
+    API queries.
+    """
+    if df.empty:
+        return df
+    tz = df[ts_col].dt.tz
+    start = to_timestamp(start_date, tz)
+    if isinstance(end_date, datetime):
+        mask = df[ts_col] <= to_timestamp(end_date, tz)
+    else:
+        mask = df[ts_col] < to_timestamp(end_date, tz) + timedelta(days=1)
+    return df[(df[ts_col] >= start) & mask].reset_index(drop=True)
+
+
+class IncrementalStore:
+    """
+    Local store of rows already fetched from append-only fact tables.
+
+    Rows are kept per key, typically (method, chain, resolution), together with
+    the earliest timestamp they cover. When a directory is given, every key is
+    also persisted as a Parquet file so the store survives restarts.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Args:
+            directory (str, optional): Directory to persist the store in
+        """
+        self.directory = directory
+        self._frames: Dict[Tuple, Tuple[pd.DataFrame, pd.Timestamp]] = {}
+        self._locks: Dict[Tuple, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def lock(self, key: Tuple) -> threading.Lock:
+        """Return the lock serializing updates to a key."""
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _path(self, key: Tuple) -> str:
+        name = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{name}.parquet")
+
+    def get(self, key: Tuple) -> Optional[Tuple[pd.DataFrame, pd.Timestamp]]:
+        """Return the stored rows and the timestamp they cover from, if any."""
+        if key not in self._frames and self.directory is not None:
+            path = self._path(key)
+            if os.path.exists(path):
+                table = pq.read_table(path)
+                covered_from = pd.Timestamp(
+                    table.schema.metadata[COVERED_FROM_KEY].decode()
+                )
+                self._frames[key] = (table.to_pandas(), covered_from)
+        return self._frames.get(key)
+
+    def put(self, key: Tuple, df: pd.DataFrame, covered_from: pd.Timestamp):
+        """Replace the stored rows for a key."""
+        self._frames[key] = (df, covered_from)
+        if self.directory is not None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[COVERED_FROM_KEY] = str(covered_from).encode()
+            pq.write_table(table.replace_schema_metadata(metadata), self._path(key))
+
+    def merge(self, key: Tuple, delta: pd.DataFrame, ts_col: str = "ts"):
+        """
+        Append newly fetched rows for a key.
+
+        Stored rows at or after the first timestamp of the delta are replaced,
+        so late-arriving rows in the overlap window overwrite stale ones.
+        """
+        df, covered_from = self._frames[key]
+        if not delta.empty:
+            df = pd.concat(
+                [df[df[ts_col] < delta[ts_col].min()], delta], ignore_index=True
+            )
+        self.put(key, df, covered_from)
+
+    def clear(self):
+        """Remove all stored rows."""
+        self._frames.clear()
+        if self.directory is not None:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".parquet"):
+                    os.remove(entry.path)
@@ -0,0 +1,136 @@
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+
+from api.cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+RECORD_COLUMNS = [
+    "ts",
+    "query",
+    "backend",
+    "source",
+    "wall_seconds",
+    "pool_wait_seconds",
+    "connect_seconds",
+    "rows",
+    "memory_bytes",
+    "error",
+    "plan_seconds",
+    "shared_hit_blocks",
+    "shared_read_blocks",
+    "plan",
+]
+
+
+def result_size(result: Union[pd.DataFrame, pl.DataFrame, pa.Table]) -> Dict[str, int]:
+    """Return the number of rows and the in-memory size in bytes of a result."""
+    if isinstance(result, pd.DataFrame):
+        return {
+            "rows": len(result),
+            "memory_bytes": int(result.memory_usage(index=False, deep=True).sum()),
+        }
+    elif isinstance(result, pl.DataFrame):
+        return {"rows": result.height, "memory_bytes": int(result.estimated_size())}
+    return {"rows": result.num_rows, "memory_bytes": int(result.nbytes)}
+
+
+def summarize_plan(plan: List[dict]) -> Dict[str, Any]:
+    """Extract the execution time and buffer usage from an EXPLAIN (FORMAT JSON) plan."""
+    root = plan[0]
+    return {
+        "plan_seconds": root.get("Execution Time", 0) / 1000,
+        "shared_hit_blocks": root["Plan"].get("Shared Hit Blocks"),
+        "shared_read_blocks": root["Plan"].get("Shared Read Blocks"),
+        "plan": json.dumps(plan),
+    }
+
+
+class QueryRecorder:
+    """
+    Record timings and sizes of the queries run by a SynthetixAPI.
+
+    Every query served from the database or the cache adds a record, which is
+    also emitted as a JSON log line on the `api.instrumentation` logger. Queries
+    slower than `explain_threshold` are re-run with EXPLAIN (ANALYZE, BUFFERS)
+    in the background and their plan is attached to the record.
+    """
+
+    def __init__(
+        self, max_records: int = 1000, explain_threshold: Optional[float] = None
+    ):
+        """
+        Args:
+            max_records (int): Number of most recent records to keep
+            explain_threshold (float, optional): Seconds after which a query's
+                plan is captured. None disables plan capture.
+        """
+        self.explain_threshold = explain_threshold
+        self.records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, query: str, backend: str, source: str, **fields) -> dict:
+        """
+        Add a record for a query.
+
+        Args:
+            query (str): The SQL of the query
+            backend (str): The result backend
+            source (str): Where the result came from ('db', 'cache' or 'stale')
+            fields: Measurements, such as wall_seconds, pool_wait_seconds,
+                connect_seconds, rows, memory_bytes or error
+
+        Returns:
+            dict: The record, which is updated in place when a plan is attached
+        """
+        record = {column: None for column in RECORD_COLUMNS}
+        record.update(
+            ts=datetime.now(timezone.utc),
+            query=normalize_query(query),
+            backend=backend,
+            source=source,
+            **fields,
+        )
+        with self._lock:
+            self.records.append(record)
+        self._log(record)
+        return record
+
+    def should_explain(self, record: dict) -> bool:
+        """Whether the plan of a recorded query should be captured."""
+        return (
+            self.explain_threshold is not None
+            and record["source"] == "db"
+            and record["error"] is None
+            and record["wall_seconds"] >= self.explain_threshold
+        )
+
+    def attach_plan(self, record: dict, plan: Union[str, List[dict]]):
+        """Attach an EXPLAIN (FORMAT JSON) plan to a record."""
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        with self._lock:
+            record.update(summarize_plan(plan))
+        self._log(record)
+
+    def _log(self, record: dict):
+        logger.info(json.dumps(record, default=str))
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return the records as a DataFrame, oldest first."""
+        with self._lock:
+            records = list(self.records)
+        return pd.DataFrame(records, columns=RECORD_COLUMNS)
+
+    def clear(self):
+        """Remove all records."""
+        with self._lock:
+            self.records.clear()
@@ -1,12 +1,47 @@
+import logging
 import os
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta
 import streamlit as st
 import sqlalchemy
 import pandas as pd
+import polars as pl
+import pyarrow as pa
+import adbc_driver_postgresql.dbapi as adbc_postgresql
 from sqlalchemy.orm import sessionmaker
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Generator
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from dotenv import load_dotenv
+from api.cache import DEFAULT_TTL, ResultCache, make_key
+from api.coalesce import SingleFlight
+from api.incremental import IncrementalStore, filter_range, to_timestamp
+from api.instrumentation import QueryRecorder, result_size
+from api.pool import ConnectionPool
+from api.queries import Query, as_query, identifier
+from api.streaming import write_chunks
+from api.windows import (
+    OPEN_WINDOW_TTL,
+    align_window,
+    day_range,
+    floor_datetime,
+    split_window,
+)
+
+SUPPORTED_BACKENDS = ("pandas", "arrow", "polars", "pyarrow")
+
+logger = logging.getLogger(__name__)
 
 
 def get_db_config(streamlit=True):
@@ -37,12 +72,97 @@ def get_db_config(streamlit=True):
 
 
 def _get_connection(db_config):
-    connection_string = f"postgresql://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['dbname']}"
+    connection_string = f"postgresql+psycopg://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['dbname']}"
     engine = sqlalchemy.create_engine(connection_string)
     conn = engine.connect()
     return conn
 
 
+def _cast_numeric_columns(table: pa.Table) -> pa.Table:
+    """Cast postgres NUMERIC columns, which ADBC returns as strings, to float64."""
+    for i, field in enumerate(table.schema):
+        typname = (field.metadata or {}).get(b"ADBC:postgresql:typname")
+        if typname == b"numeric":
+            table = table.set_column(
+                i, field.name, table.column(i).cast(pa.float64())
+            )
+    return table
+
+
+def _from_arrow(
+    table: pa.Table, backend: str
+) -> Union[pd.DataFrame, pl.DataFrame, pa.Table]:
+    """Convert an Arrow table to the requested result backend."""
+    if backend == "pandas":
+        return table.to_pandas()
+    elif backend == "arrow":
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    elif backend == "polars":
+        return pl.from_arrow(table)
+    elif backend == "pyarrow":
+        return table
+    else:
+        raise ValueError(f"Invalid backend: {backend}")
+
+
+def _rechunk(
+    batches: Iterator[pa.RecordBatch], schema: pa.Schema, chunk_rows: int
+) -> Iterator[pa.Table]:
+    """
+    Regroup a stream of record batches into tables of `chunk_rows` rows.
+
+    An empty stream yields one empty table, so consumers still see the schema.
+    """
+    pending = []
+    pending_rows = 0
+    emitted = False
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= chunk_rows:
+            table = pa.Table.from_batches(pending, schema=schema)
+            yield table.slice(0, chunk_rows)
+            pending = table.slice(chunk_rows).to_batches()
+            pending_rows -= chunk_rows
+            emitted = True
+    if pending_rows > 0 or not emitted:
+        yield pa.Table.from_batches(pending, schema=schema)
+
+
+def _concat_results(
+    results: List[Union[pd.DataFrame, pl.DataFrame, pa.Table]], backend: str
+) -> Union[pd.DataFrame, pl.DataFrame, pa.Table]:
+    """Concatenate results of the same query from any backend."""
+    if len(results) == 1:
+        return results[0]
+    elif backend == "polars":
+        return pl.concat(results)
+    elif backend == "pyarrow":
+        return pa.concat_tables(results)
+    else:
+        return pd.concat(results, ignore_index=True)
+
+
+def _incremental_bounds(
+    start_date: datetime, end_date: datetime
+) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """Return the timestamps an incremental range covers, including the whole end day of dates."""
+    start = to_timestamp(start_date)
+    end = to_timestamp(end_date)
+    if not isinstance(end_date, datetime):
+        end += timedelta(days=1)
+    return start, end
+
+
+def _to_arrow(result: Union[pd.DataFrame, pl.DataFrame, pa.Table]) -> pa.Table:
+    """Convert a result from any backend to an Arrow table."""
+    if isinstance(result, pd.DataFrame):
+        return pa.Table.from_pandas(result, preserve_index=False)
+    elif isinstance(result, pl.DataFrame):
+        return result.to_arrow()
+    return result
+
+
 class SynthetixAPI:
     SUPPORTED_CHAINS = {
         "arbitrum_mainnet": "Arbitrum",
@@ -50,15 +170,33 @@ class SynthetixAPI:
         "optimism_mainnet": "Optimism (V2)",
         "eth_mainnet": "Ethereum",
     }
+    POOL_SIZE = 5
+    MAX_OVERFLOW = 10
+    # re-fetch window for rows that arrive late in incremental mode
+    INCREMENTAL_OVERLAP = timedelta(hours=2)
+    REFRESH_WORKERS = 2
+    # executions of the same statement on a connection before it is prepared
+    PREPARE_THRESHOLD = 2
 
     def __init__(
-        self, db_config: dict, environment: str = "prod", streamlit: bool = True
+        self,
+        db_config: dict,
+        environment: str = "prod",
+        streamlit: bool = True,
+        cache: Optional[ResultCache] = None,
+        incremental_store: Optional[IncrementalStore] = None,
+        recorder: Optional[QueryRecorder] = None,
     ):
         """
         Initialize the SynthetixAPI.
 
         Args:
             environment (str): The environment to query data for ('prod' or 'dev')
+            cache (ResultCache, optional): Shared cache for query results
+            incremental_store (IncrementalStore, optional): Local store for
+                incremental queries. Defaults to an in-memory store.
+            recorder (QueryRecorder, optional): Records timings and plans of
+                every query
         """
         self.db_config = get_db_config(streamlit)
 
@@ -67,43 +205,570 @@ class SynthetixAPI:
         else:
             self.environment = environment
 
+        self.cache = cache
+        self.recorder = recorder
+        # per-thread time spent waiting for the last connection
+        self._local = threading.local()
+        self.single_flight = SingleFlight()
+        # background refreshes of stale cache entries and query plan captures
+        self.refresh_executor = ThreadPoolExecutor(
+            max_workers=self.REFRESH_WORKERS, thread_name_prefix="cache-refresh"
+        )
+        self.incremental_store = incremental_store or IncrementalStore()
         self.engine = self._create_engine()
         self.Session = sessionmaker(bind=self.engine)
+        # ADBC has no pool of its own, so Arrow queries reuse these connections
+        self.arrow_pool = ConnectionPool(
+            lambda: adbc_postgresql.connect(self._connection_string()),
+            size=self.POOL_SIZE,
+            max_overflow=self.MAX_OVERFLOW,
+        )
+
+    def _connection_string(self) -> str:
+        """Return the postgres connection string for the configured database."""
+        return f"postgresql://{self.db_config['user']}:{self.db_config['password']}@{self.db_config['host']}:{self.db_config['port']}/{self.db_config['dbname']}"
 
     def _create_engine(self):
-        """Create and return a database engine with connection pooling."""
-        connection_string = f"postgresql://{self.db_config['user']}:{self.db_config['password']}@{self.db_config['host']}:{self.db_config['port']}/{self.db_config['dbname']}"
-        return sqlalchemy.create_engine(connection_string, pool_size=5, max_overflow=10)
+        """
+        Create and return a database engine with connection pooling.
+
+        Uses psycopg 3, which sends bound parameters separately from the SQL and
+        prepares statements executed PREPARE_THRESHOLD times on a connection, so
+        repeated queries reuse their plan.
+        """
+        connection_string = self._connection_string().replace(
+            "postgresql://", "postgresql+psycopg://", 1
+        )
+        return sqlalchemy.create_engine(
+            connection_string,
+            pool_size=self.POOL_SIZE,
+            max_overflow=self.MAX_OVERFLOW,
+            connect_args={"prepare_threshold": self.PREPARE_THRESHOLD},
+        )
+
+    def table(self, chain: str, *name: str, layer: Optional[str] = None) -> str:
+        """
+        Return the validated, schema-qualified name of a chain table.
+
+        Args:
+            chain (str): Chain the table belongs to, a key of SUPPORTED_CHAINS
+            name (str): Parts of the table name without the chain suffix,
+                e.g. ('fct_perp_stats', 'daily')
+            layer (str, optional): Schema layer, e.g. 'raw'
+
+        Returns:
+            str: The table name, e.g. 'prod_base_mainnet.fct_perp_stats_daily_base_mainnet'
+        """
+        if chain not in self.SUPPORTED_CHAINS:
+            raise ValueError(f"Invalid chain: {chain}")
+        schema = [self.environment, layer, chain] if layer else [self.environment, chain]
+        return f"{identifier(*schema)}.{identifier(*name, chain)}"
+
+    def tokens_table(self, chain: str) -> str:
+        """Return the validated name of the token seed table for a chain."""
+        if chain not in self.SUPPORTED_CHAINS:
+            raise ValueError(f"Invalid chain: {chain}")
+        return f"{identifier(self.environment, 'seeds')}.{identifier(chain, 'tokens')}"
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self.refresh_executor.shutdown(wait=False)
         self.engine.dispose()
+        self.arrow_pool.dispose()
 
     @contextmanager
     def _get_connection(
         self,
     ) -> Generator[sqlalchemy.engine.base.Connection, None, None]:
         """Context manager for database connections."""
+        start = time.perf_counter()
         connection = self.engine.connect()
+        self._local.pool_wait = time.perf_counter() - start
         try:
             yield connection
         finally:
             connection.close()
 
-    def _run_query(self, query: str) -> pd.DataFrame:
+    @contextmanager
+    def _get_arrow_connection(
+        self,
+    ) -> Generator[adbc_postgresql.Connection, None, None]:
+        """
+        Context manager for pooled ADBC connections, which return results as Arrow.
+
+        The time spent waiting for a free connection and the time spent opening
+        a new one are kept apart for the query recorder.
+        """
+        start = time.perf_counter()
+        connection, connect = self.arrow_pool.acquire()
+        self._local.connect = connect
+        self._local.pool_wait = time.perf_counter() - start - (connect or 0)
+        try:
+            yield connection
+        finally:
+            self.arrow_pool.release(connection)
+
+    def _fetch_arrow(
+        self,
+        query: Query,
+        on_connect: Optional[Callable[[adbc_postgresql.Connection], None]] = None,
+    ) -> pa.Table:
+        """
+        Run a SQL query and stream the results into an Arrow table.
+
+        The ADBC driver reads the binary COPY stream from postgres directly into
+        Arrow record batches, skipping the per-row Python decoding of psycopg.
+
+        Args:
+            query (Query): The SQL query to run and its parameters.
+            on_connect (callable, optional): Called with the ADBC connection
+                before the query runs, e.g. to cancel it from another thread.
+
+        Returns:
+            pyarrow.Table: The query results.
+        """
+        sql, params = query.numeric()
+        with self._get_arrow_connection() as conn:
+            if on_connect is not None:
+                on_connect(conn)
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params or None)
+                table = cursor.fetch_record_batch().read_all()
+        return _cast_numeric_columns(table)
+
+    def _get_cached(
+        self, query: Query, backend: str
+    ) -> Optional[Union[pd.DataFrame, pl.DataFrame, pa.Table]]:
+        """Return the cached result of a query, or None if it is not cached."""
+        if self.cache is None:
+            return None
+        table = self.cache.get(make_key(*query))
+        return _from_arrow(table, backend) if table is not None else None
+
+    def _lookup_cached(
+        self, query: Query, backend: str
+    ) -> Tuple[Optional[Union[pd.DataFrame, pl.DataFrame, pa.Table]], bool]:
+        """Return the cached result of a query, including stale results, and whether it is stale."""
+        if self.cache is None:
+            return None, False
+        table, stale = self.cache.lookup(make_key(*query))
+        return (_from_arrow(table, backend) if table is not None else None), stale
+
+    def _set_cached(
+        self,
+        query: Query,
+        result: Union[pd.DataFrame, pl.DataFrame, pa.Table],
+        ttl: Optional[float] = DEFAULT_TTL,
+    ):
+        """Store the result of a query in the cache, if one is configured."""
+        if self.cache is not None:
+            self.cache.set(make_key(*query), _to_arrow(result), ttl)
+
+    def _execute(
+        self, query: Query, backend: str = "pandas"
+    ) -> Union[pd.DataFrame, pl.DataFrame, pa.Table]:
+        """Run a SQL query against the database, bypassing the cache."""
+        start = time.perf_counter()
+        self._local.pool_wait = None
+        self._local.connect = None
+        try:
+            if backend == "pandas":
+                with self._get_connection() as conn:
+                    result = pd.read_sql_query(query.text(), conn, params=query.params)
+            else:
+                result = _from_arrow(self._fetch_arrow(query), backend)
+        except Exception as e:
+            self._record(
+                query,
+                backend,
+                "db",
+                start,
+                error=str(e),
+                pool_wait=self._local.pool_wait,
+                connect=self._local.connect,
+            )
+            raise
+
+        self._record(
+            query,
+            backend,
+            "db",
+            start,
+            result=result,
+            pool_wait=self._local.pool_wait,
+            connect=self._local.connect,
+        )
+        return result
+
+    def _record(
+        self,
+        query: Query,
+        backend: str,
+        source: str,
+        start: float,
+        result: Optional[Union[pd.DataFrame, pl.DataFrame, pa.Table]] = None,
+        error: Optional[str] = None,
+        pool_wait: Optional[float] = None,
+        connect: Optional[float] = None,
+    ):
+        """
+        Record a query with the recorder, if one is configured.
+
+        Args:
+            query (Query): The query that ran
+            backend (str): The result backend
+            source (str): Where the result came from ('db', 'cache' or 'stale')
+            start (float): `time.perf_counter()` when the query started
+            result (optional): The query results
+            error (str, optional): The error the query failed with
+            pool_wait (float, optional): Seconds spent waiting for a pooled connection
+            connect (float, optional): Seconds spent opening a new connection
+        """
+        if self.recorder is None:
+            return
+        record = self.recorder.record(
+            query.sql,
+            backend,
+            source,
+            wall_seconds=time.perf_counter() - start,
+            pool_wait_seconds=pool_wait,
+            connect_seconds=connect,
+            error=error,
+            **(result_size(result) if result is not None else {}),
+        )
+        if self.recorder.should_explain(record):
+            self._schedule_explain(query, record)
+
+    def _schedule_explain(self, query: Query, record: dict):
+        """Capture the plan of a slow query in the background."""
+        self.refresh_executor.submit(self._explain, query, record)
+
+    def _explain(self, query: Query, record: dict):
+        """Capture the plan of a slow query with EXPLAIN (ANALYZE, BUFFERS)."""
+        try:
+            with self._get_connection() as conn:
+                plan = conn.execute(
+                    sqlalchemy.text(
+                        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query.sql}"
+                    ),
+                    query.params,
+                ).scalar()
+            self.recorder.attach_plan(record, plan)
+        except Exception as e:
+            logger.warning(f"Failed to capture query plan: {e}")
+
+    def _run_query(
+        self,
+        query: Union[str, Query],
+        backend: str = "pandas",
+        ttl: Optional[float] = DEFAULT_TTL,
+        params: Optional[dict] = None,
+    ) -> Union[pd.DataFrame, pl.DataFrame, pa.Table]:
         """
         Run a SQL query and return the results as a DataFrame.
 
         Args:
-            query (str): The SQL query to run.
+            query (str | Query): The SQL query to run, with `:name` bind parameters.
+            backend (str): How to fetch and return the results:
+                'pandas': pandas DataFrame read through SQLAlchemy (default)
+                'arrow': pandas DataFrame with Arrow-backed dtypes, read through ADBC
+                'polars': polars DataFrame, read through ADBC
+                'pyarrow': pyarrow Table, read through ADBC
+            ttl (float, optional): Seconds to cache the results for. Defaults to
+                the cache ttl, None caches them until they are evicted.
+            params (dict, optional): Values of the bind parameters.
+
+        Expired results still within the stale ttl of the cache are returned
+        immediately, and refreshed in the background.
+
+        Returns:
+            pandas.DataFrame | polars.DataFrame | pyarrow.Table: The query results.
+        """
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(f"Invalid backend: {backend}")
+
+        start = time.perf_counter()
+        query = as_query(query, params)
+
+        def execute():
+            result = self._execute(query, backend)
+            self._set_cached(query, result, ttl)
+            return result
+
+        key = f"{backend}:{make_key(*query)}"
+        cached, stale = self._lookup_cached(query, backend)
+        if cached is not None:
+            if stale:
+                self._refresh(key, execute)
+            self._record(
+                query, backend, "stale" if stale else "cache", start, result=cached
+            )
+            return cached
+
+        # concurrent identical queries share one execution
+        return self.single_flight.do(
+            key,
+            execute,
+            copy=lambda df: df.copy() if isinstance(df, pd.DataFrame) else df,
+        )
+
+    def _refresh(self, key: str, execute: Callable[[], object]):
+        """Re-run a query in the background, unless it is already running."""
+        if self.single_flight.is_running(key):
+            return
+        self.refresh_executor.submit(self.single_flight.do, key, execute)
+
+    def _run_windowed(
+        self,
+        query: Callable[[datetime, datetime], Query],
+        start_date: datetime,
+        end_date: datetime,
+        resolution: str = "daily",
+        backend: str = "pandas",
+    ) -> Union[pd.DataFrame, pl.DataFrame, pa.Table]:
+        """
+        Run a date range query with its window aligned to bucket boundaries.
+
+        When a cache is configured the window is split into closed calendar
+        months and the open bucket, see `split_window`. Whole months are cached
+        for CLOSED_WINDOW_TTL and shared by every window covering them, and
+        only the open bucket is refreshed after OPEN_WINDOW_TTL seconds.
+
+        Args:
+            query (callable): Builds the Query for a (start_date, end_date) range,
+                with an inclusive end day
+            start_date (datetime): Start date for the query
+            end_date (datetime): End date for the query
+            resolution (str): Bucket resolution ('daily', 'hourly' or 'monthly')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
 
         Returns:
-            pandas.DataFrame: The query results.
+            pandas.DataFrame | polars.DataFrame | pyarrow.Table: The query results.
         """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        start_date, end_date = align_window(start_date, end_date, resolution)
+        if self.cache is None:
+            return self._run_query(query(start_date, end_date), backend=backend)
+
+        results = [
+            self._run_query(
+                query(window_start, window_end),
+                backend=backend,
+                ttl=ttl,
+            )
+            for window_start, window_end, ttl in split_window(
+                start_date, end_date, resolution
+            )
+        ]
+        if not results:
+            return self._run_query(query(start_date, end_date), backend=backend)
+        return _concat_results(results, backend)
+
+    def _delta_start(
+        self,
+        df: pd.DataFrame,
+        covered_from: pd.Timestamp,
+        ts_col: str = "ts",
+        resolution: str = "daily",
+    ) -> pd.Timestamp:
+        """
+        Return where the next incremental fetch of stored rows should start.
+
+        The start is INCREMENTAL_OVERLAP before the latest stored timestamp,
+        floored to the bucket it falls in, so queries that aggregate rows into
+        buckets never return a partial value for the first one.
+        """
+        if df.empty:
+            return covered_from
+        return floor_datetime(
+            to_timestamp(df[ts_col].max()) - self.INCREMENTAL_OVERLAP, resolution
+        )
+
+    def _run_incremental(
+        self,
+        key: tuple,
+        query: Callable[[datetime, datetime], Query],
+        start_date: datetime,
+        end_date: datetime,
+        backend: str = "pandas",
+        ts_col: str = "ts",
+        resolution: str = "daily",
+    ) -> Union[pd.DataFrame, pl.DataFrame, pa.Table]:
+        """
+        Run a time-series query incrementally against the local store.
+
+        The first call for a key fetches the full range. Later calls only fetch
+        rows after the latest stored timestamp, minus INCREMENTAL_OVERLAP to pick
+        up late-arriving rows, and serve the requested range from the store.
+        The delta starts at the beginning of a bucket, see `_delta_start`, and
+        goes through `_run_query` with OPEN_WINDOW_TTL, so concurrent and
+        repeated refreshes of the same delta share one execution.
+
+        Args:
+            key (tuple): Store key, usually (method, chain, resolution)
+            query (callable): Builds the Query for a (start_date, end_date) range
+            start_date (datetime): Start date for the query
+            end_date (datetime): End date for the query
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            ts_col (str): The timestamp column of the query
+            resolution (str): Bucket resolution of the query ('daily', 'hourly'
+                or 'monthly')
+
+        Returns:
+            pandas.DataFrame | polars.DataFrame | pyarrow.Table: The query results.
+        """
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(f"Invalid backend: {backend}")
+
+        key = (self.environment, *key)
+        start, end = _incremental_bounds(start_date, end_date)
+
+        with self.incremental_store.lock(key):
+            stored = self.incremental_store.get(key)
+            if stored is None or start < stored[1]:
+                df = self._execute(query(start_date, end_date))
+                self.incremental_store.put(key, df, start)
+            else:
+                since = self._delta_start(*stored, ts_col, resolution)
+                if end > since:
+                    delta = self._run_query(
+                        query(since.to_pydatetime(), end_date), ttl=OPEN_WINDOW_TTL
+                    )
+                    self.incremental_store.merge(key, delta, ts_col)
+            df, _ = self.incremental_store.get(key)
+
+        result = filter_range(df, start_date, end_date, ts_col)
+        return result if backend == "pandas" else _from_arrow(_to_arrow(result), backend)
+
+    def iter_query(
+        self,
+        query: Union[str, Query],
+        chunk_rows: int = 100_000,
+        backend: str = "pandas",
+        params: Optional[dict] = None,
+    ) -> Iterator[Union[pd.DataFrame, pl.DataFrame, pa.Table]]:
+        """
+        Stream the results of a SQL query in chunks of at most `chunk_rows` rows.
+
+        The 'pandas' backend uses a named server-side cursor, the Arrow backends
+        read the ADBC COPY stream batch by batch. Either way only one chunk is
+        held in client memory at a time, so use the helpers in `api.streaming`
+        to reduce the chunks as they arrive.
+
+        Args:
+            query (str | Query): The SQL query to run, with `:name` bind parameters.
+            chunk_rows (int): Maximum number of rows per chunk.
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            params (dict, optional): Values of the bind parameters.
+
+        Yields:
+            pandas.DataFrame | polars.DataFrame | pyarrow.Table: The query results.
+        """
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(f"Invalid backend: {backend}")
+
+        query = as_query(query, params)
+        if backend == "pandas":
+            with self._get_connection() as conn:
+                conn = conn.execution_options(
+                    stream_results=True, max_row_buffer=chunk_rows
+                )
+                yield from pd.read_sql_query(
+                    query.text(), conn, params=query.params, chunksize=chunk_rows
+                )
+            return
+
+        yield from self._iter_arrow(query, chunk_rows, backend)
+
+    def _iter_arrow(
+        self, query: Query, chunk_rows: int, backend: str
+    ) -> Iterator[Union[pd.DataFrame, pl.DataFrame, pa.Table]]:
+        """Stream the results of a SQL query from the ADBC COPY stream in chunks."""
+        sql, params = query.numeric()
+        with self._get_arrow_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params or None)
+                reader = cursor.fetch_record_batch()
+                for table in _rechunk(reader, reader.schema, chunk_rows):
+                    yield _from_arrow(_cast_numeric_columns(table), backend)
+
+    def export_query(
+        self,
+        query: Union[str, Query],
+        sink: Union[str, BinaryIO],
+        file_format: str = "csv",
+        chunk_rows: int = 100_000,
+        params: Optional[dict] = None,
+    ) -> int:
+        """
+        Stream the results of a SQL query to a CSV or Parquet file.
+
+        Rows are read from the ADBC COPY stream and written chunk by chunk,
+        without going through a DataFrame, so the export itself holds about
+        `chunk_rows` rows at a time. The sink holds everything written to it:
+        pass a path or an on-disk file for full-history exports, as an
+        in-memory buffer grows to the size of the whole file.
+
+        Args:
+            query (str | Query): The SQL query to run, with `:name` bind parameters.
+            sink (str | file): Path or binary file object to write to.
+            file_format (str): 'csv' or 'parquet'
+            chunk_rows (int): Maximum number of rows per chunk.
+            params (dict, optional): Values of the bind parameters.
+
+        Returns:
+            int: The number of rows written
+        """
+        chunks = self._iter_arrow(as_query(query, params), chunk_rows, "pyarrow")
+        return write_chunks(chunks, sink, file_format)
+
+    def fetch_many(
+        self, specs: Dict[str, List[dict]], max_workers: Optional[int] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Run many independent get_* queries concurrently over the connection pool.
+
+        Every spec is a dict with a 'method' key naming a get_* method, and the
+        keyword arguments to call it with. All specs are submitted at once, so a
+        cold page costs roughly the slowest query instead of the sum of all of them.
+
+        Args:
+            specs (dict): Mapping of result name to a list of specs. The results
+                of each list are concatenated into a single DataFrame.
+            max_workers (int, optional): Maximum number of concurrent queries.
+                Defaults to the size of the connection pool including overflow.
+
+        Returns:
+            dict: Mapping of result name to the concatenated DataFrame
+        """
+        for spec in [spec for name_specs in specs.values() for spec in name_specs]:
+            if not spec.get("method", "").startswith("get_"):
+                raise ValueError(f"Invalid method: {spec.get('method')}")
+
+        max_workers = max_workers or self.POOL_SIZE + self.MAX_OVERFLOW
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                name: [
+                    executor.submit(
+                        getattr(self, spec["method"]),
+                        **{k: v for k, v in spec.items() if k != "method"},
+                    )
+                    for spec in name_specs
+                ]
+                for name, name_specs in specs.items()
+            }
+            results = {
+                name: [future.result() for future in name_futures]
+                for name, name_futures in futures.items()
+            }
+
+        return {
+            name: (
+                pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+            )
+            for name, frames in results.items()
+        }
 
     # queries
     def get_volume(
@@ -112,6 +777,8 @@ class SynthetixAPI:
         end_date: datetime,
         chain: str = "arbitrum_mainnet",
         resolution: str = "daily",
+        backend: str = "pandas",
+        incremental: bool = False,
     ) -> pd.DataFrame:
         """
         Get trading volume data for a specified chain.
@@ -121,27 +788,46 @@ class SynthetixAPI:
             start_date (datetime): Start date for the query
             end_date (datetime): End date for the query
             resolution (str): Data resolution ('daily' or 'hourly')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            incremental (bool): Serve the range from the local store, fetching only new rows
 
         Returns:
             pandas.DataFrame: Volume data with columns 'ts', 'volume', 'cumulative_volume'
         """
-        query = f"""
-        SELECT
-            ts,
-            volume,
-            cumulative_volume
-        FROM {self.environment}_{chain}.fct_perp_stats_{resolution}_{chain}
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
-        ORDER BY ts
-        """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        def query(start_date, end_date):
+            return Query(
+                f"""
+                SELECT
+                    ts,
+                    volume,
+                    cumulative_volume
+                FROM {self.table(chain, "fct_perp_stats", resolution)}
+                WHERE ts >= :start_date and ts < :end_date
+                ORDER BY ts
+                """,
+                day_range(start_date, end_date),
+            )
+
+        if incremental:
+            return self._run_incremental(
+                ("get_volume", chain, resolution),
+                query,
+                start_date,
+                end_date,
+                backend,
+                resolution=resolution,
+            )
+        return self._run_windowed(
+            query, start_date, end_date, resolution=resolution, backend=backend
+        )
 
     def get_core_stats(
         self,
         start_date: datetime,
         end_date: datetime,
         chain: str = "arbitrum_mainnet",
+        backend: str = "pandas",
+        incremental: bool = False,
     ) -> pd.DataFrame:
         """
         Get core stats by chain.
@@ -150,24 +836,34 @@ class SynthetixAPI:
             start_date (datetime): Start date for the query
             end_date (datetime): End date for the query
             chain (str): Chain to query (e.g. 'arbitrum_mainnet')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            incremental (bool): Serve the range from the local store, fetching only new rows
 
         Returns:
             pandas.DataFrame: Core stats with columns 'ts', 'chain', 'collateral_value'
         """
         chain_label = self.SUPPORTED_CHAINS[chain]
-        query = f"""
-        SELECT
-            ts,
-            '{chain_label}' AS chain,
-            SUM(collateral_value) AS collateral_value
-        FROM {self.environment}_{chain}.fct_core_apr_{chain}
-        WHERE 
-            DATE(ts) >= '{start_date}' and DATE(ts) <= '{end_date}'
-        GROUP BY ts, chain
-        ORDER BY ts
-        """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        def query(start_date, end_date):
+            return Query(
+                f"""
+                SELECT
+                    ts,
+                    '{chain_label}' AS chain,
+                    SUM(collateral_value) AS collateral_value
+                FROM {self.table(chain, "fct_core_apr")}
+                WHERE 
+                    ts >= :start_date and ts < :end_date
+                GROUP BY ts, chain
+                ORDER BY ts
+                """,
+                day_range(start_date, end_date),
+            )
+
+        if incremental:
+            return self._run_incremental(
+                ("get_core_stats", chain), query, start_date, end_date, backend
+            )
+        return self._run_windowed(query, start_date, end_date, backend=backend)
 
     def get_core_stats_by_collateral(
         self,
@@ -175,6 +871,8 @@ class SynthetixAPI:
         end_date: datetime,
         chain: str = "arbitrum_mainnet",
         resolution: str = "7d",
+        backend: str = "pandas",
+        incremental: bool = False,
     ) -> pd.DataFrame:
         """
         Get core stats by collateral.
@@ -184,6 +882,8 @@ class SynthetixAPI:
             end_date (datetime): End date for the query
             chain (str): Chain to query (e.g. 'arbitrum_mainnet')
             resolution (str): Data resolution ('24h', '1d', '28d')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            incremental (bool): Serve the range from the local store, fetching only new rows
 
         Returns:
             pandas.DataFrame: TVL data with columns:
@@ -196,28 +896,36 @@ class SynthetixAPI:
                 ' + apr_' + resolution + '_underlying as apr_' + resolution
                 if chain in ['arbitrum_mainnet', 'base_mainnet']
                 else ' as apr_' + resolution}"
-        query = f"""
-        SELECT 
-            ts,
-            '{chain_label}' AS chain,
-            CONCAT(
-                COALESCE(tokens.token_symbol, stats.collateral_type),
-                ' (', '{chain_label}', ')'
-            ) AS label,
-            collateral_value,
-            hourly_pnl,
-            rewards_usd,
-            {apr_str},
-            apr_{resolution}_rewards
-        FROM {self.environment}_{chain}.fct_core_apr_{chain} AS stats
-        LEFT JOIN {self.environment}_seeds.{chain}_tokens AS tokens
-            ON lower(stats.collateral_type) = lower(tokens.token_address)
-        WHERE 
-            DATE(ts) >= '{start_date}' and DATE(ts) <= '{end_date}'
-        ORDER BY ts
-        """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        def query(start_date, end_date):
+            return Query(
+                f"""
+                SELECT 
+                    ts,
+                    '{chain_label}' AS chain,
+                    CONCAT(
+                        COALESCE(tokens.token_symbol, stats.collateral_type),
+                        ' (', '{chain_label}', ')'
+                    ) AS label,
+                    collateral_value,
+                    hourly_pnl,
+                    rewards_usd,
+                    {apr_str},
+                    apr_{resolution}_rewards
+                FROM {self.table(chain, "fct_core_apr")} AS stats
+                LEFT JOIN {self.tokens_table(chain)} AS tokens
+                    ON lower(stats.collateral_type) = lower(tokens.token_address)
+                WHERE 
+                    ts >= :start_date and ts < :end_date
+                ORDER BY ts
+                """,
+                day_range(start_date, end_date),
+            )
+
+        if incremental:
+            return self._run_incremental(
+                ("get_core_stats_by_collateral", chain, resolution), query, start_date, end_date, backend
+            )
+        return self._run_windowed(query, start_date, end_date, backend=backend)
 
     def get_core_account_activity(
         self,
@@ -225,6 +933,7 @@ class SynthetixAPI:
         end_date: datetime,
         chain: str = "arbitrum_mainnet",
         resolution: str = "daily",
+        backend: str = "pandas",
     ) -> pd.DataFrame:
         """
         Get core account activity by action (Delegate, Withdraw, Claim).
@@ -234,6 +943,7 @@ class SynthetixAPI:
             end_date (datetime): End date for the query
             chain (str): Chain to query (e.g., 'arbitrum_mainnet')
             resolution (str): Data resolution ('daily' or 'monthly')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
 
         Returns:
             pandas.DataFrame: Account activity with columns:
@@ -241,25 +951,32 @@ class SynthetixAPI:
         """
         chain_label = self.SUPPORTED_CHAINS[chain]
         trunc_resolution = "day" if resolution == "daily" else "month"
-        query = f"""
-        SELECT
-            DATE_TRUNC('{trunc_resolution}', block_timestamp) AS date,
-            '{chain_label}' AS chain,
-            account_action as action,
-            COUNT(DISTINCT account_id) AS nof_accounts
-        FROM {self.environment}_{chain}.fct_core_account_activity_{chain}
-        WHERE DATE(block_timestamp) >= '{start_date}' and DATE(block_timestamp) <= '{end_date}'
-        GROUP BY 1, 2, 3
-        ORDER BY 1
-        """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        def query(start_date, end_date):
+            return Query(
+                f"""
+                SELECT
+                    DATE_TRUNC('{trunc_resolution}', block_timestamp) AS date,
+                    '{chain_label}' AS chain,
+                    account_action as action,
+                    COUNT(DISTINCT account_id) AS nof_accounts
+                FROM {self.table(chain, "fct_core_account_activity")}
+                WHERE block_timestamp >= :start_date and block_timestamp < :end_date
+                GROUP BY 1, 2, 3
+                ORDER BY 1
+                """,
+                day_range(start_date, end_date),
+            )
+
+        return self._run_windowed(
+            query, start_date, end_date, resolution=trunc_resolution, backend=backend
+        )
 
     def get_core_nof_stakers(
         self,
         start_date: datetime,
         end_date: datetime,
         chain: str = "arbitrum_mainnet",
+        backend: str = "pandas",
     ) -> pd.DataFrame:
         """
         Get core number of stakers.
@@ -268,23 +985,28 @@ class SynthetixAPI:
             start_date (datetime): Start date for the query
             end_date (datetime): End date for the query
             chain (str): Chain to query (e.g., 'arbitrum_mainnet')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
 
         Returns:
             pandas.DataFrame: NoF Stakers with columns:
                 'date', 'chain', 'nof_stakers_daily'
         """
         chain_label = self.SUPPORTED_CHAINS[chain]
-        query = f"""
-        SELECT
-            date,
-            '{chain_label}' AS chain,
-            nof_stakers_daily
-        FROM {self.environment}_{chain}.fct_core_active_stakers_{chain}
-        WHERE date >= '{start_date}' and date <= '{end_date}'
-        ORDER BY date
-        """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        def query(start_date, end_date):
+            return Query(
+                f"""
+                SELECT
+                    date,
+                    '{chain_label}' AS chain,
+                    nof_stakers_daily
+                FROM {self.table(chain, "fct_core_active_stakers")}
+                WHERE date >= :start_date and date < :end_date
+                ORDER BY date
+                """,
+                day_range(start_date, end_date),
+            )
+
+        return self._run_windowed(query, start_date, end_date, backend=backend)
 
     def get_perps_stats(
         self,
@@ -292,6 +1014,8 @@ class SynthetixAPI:
         end_date: datetime,
         chain: str = "arbitrum_mainnet",
         resolution: str = "daily",
+        backend: str = "pandas",
+        incremental: bool = False,
     ) -> pd.DataFrame:
         """
         Get perps stats by chain.
@@ -300,25 +1024,42 @@ class SynthetixAPI:
             start_date (datetime): Start date for the query
             end_date (datetime): End date for the query
             chain (str): Chain to query (e.g., 'arbitrum_mainnet')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            incremental (bool): Serve the range from the local store, fetching only new rows
 
         Returns:
             pandas.DataFrame: Perps stats with columns:
                 'ts', 'chain', 'volume', 'exchange_fees'
         """
         chain_label = self.SUPPORTED_CHAINS[chain]
-        query = f"""
-        SELECT
-            ts,
-            '{chain_label}' AS chain,
-            volume,
-            exchange_fees
-        FROM {self.environment}_{chain}.fct_perp_stats_{resolution}_{chain}
-        WHERE
-            DATE(ts) >= '{start_date}' and DATE(ts) <= '{end_date}'
-        ORDER BY ts
-        """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        def query(start_date, end_date):
+            return Query(
+                f"""
+                SELECT
+                    ts,
+                    '{chain_label}' AS chain,
+                    volume,
+                    exchange_fees
+                FROM {self.table(chain, "fct_perp_stats", resolution)}
+                WHERE
+                    ts >= :start_date and ts < :end_date
+                ORDER BY ts
+                """,
+                day_range(start_date, end_date),
+            )
+
+        if incremental:
+            return self._run_incremental(
+                ("get_perps_stats", chain, resolution),
+                query,
+                start_date,
+                end_date,
+                backend,
+                resolution=resolution,
+            )
+        return self._run_windowed(
+            query, start_date, end_date, resolution=resolution, backend=backend
+        )
 
     def get_perps_open_interest(
         self,
@@ -326,6 +1067,8 @@ class SynthetixAPI:
         end_date: datetime,
         chain: str = "arbitrum_mainnet",
         resolution: str = "daily",
+        backend: str = "pandas",
+        incremental: bool = False,
     ) -> pd.DataFrame:
         """
         Get perps stats by chain.
@@ -334,6 +1077,8 @@ class SynthetixAPI:
             start_date (datetime): Start date for the query
             end_date (datetime): End date for the query
             chain (str): Chain to query (e.g., 'arbitrum_mainnet')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            incremental (bool): Serve the range from the local store, fetching only new rows
 
         Returns:
             pandas.DataFrame: Perps stats with columns:
@@ -341,25 +1086,42 @@ class SynthetixAPI:
         """
         chain_label = self.SUPPORTED_CHAINS[chain]
         trunc_resolution = "day" if resolution == "daily" else "hour"
-        query = f"""
-        SELECT
-            DATE_TRUNC('{trunc_resolution}', ts) AS ts,
-            '{chain_label}' AS chain,
-            MAX(total_oi_usd) as total_oi_usd
-        FROM {self.environment}_{chain}.fct_perp_market_history_{chain}
-        WHERE
-            DATE(ts) >= '{start_date}' and DATE(ts) <= '{end_date}'
-        GROUP BY 1, 2
-        ORDER BY 2, 1
-        """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        def query(start_date, end_date):
+            return Query(
+                f"""
+                SELECT
+                    DATE_TRUNC('{trunc_resolution}', ts) AS ts,
+                    '{chain_label}' AS chain,
+                    MAX(total_oi_usd) as total_oi_usd
+                FROM {self.table(chain, "fct_perp_market_history")}
+                WHERE
+                    ts >= :start_date and ts < :end_date
+                GROUP BY 1, 2
+                ORDER BY 2, 1
+                """,
+                day_range(start_date, end_date),
+            )
+
+        if incremental:
+            return self._run_incremental(
+                ("get_perps_open_interest", chain, resolution),
+                query,
+                start_date,
+                end_date,
+                backend,
+                resolution=resolution,
+            )
+        return self._run_windowed(
+            query, start_date, end_date, resolution=resolution, backend=backend
+        )
 
     def get_perps_markets_history(
         self,
         start_date: datetime,
         end_date: datetime,
         chain: str = "arbitrum_mainnet",
+        backend: str = "pandas",
+        incremental: bool = False,
     ) -> pd.DataFrame:
         """
         Get perps markets history.
@@ -368,33 +1130,44 @@ class SynthetixAPI:
             start_date (datetime): Start date for the query
             end_date (datetime): End date for the query
             chain (str): Chain to query (e.g., 'arbitrum_mainnet')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            incremental (bool): Serve the range from the local store, fetching only new rows
 
         Returns:
             pandas.DataFrame: Perps markets history with columns:
                 'ts', 'chain', 'market_symbol', 'total_oi_usd', 'long_oi_pct', 'short_oi_pct'
         """
         chain_label = self.SUPPORTED_CHAINS[chain]
-        query = f"""
-        SELECT
-            ts,
-            '{chain_label}' AS chain,
-            CONCAT(market_symbol, ' (', '{chain_label}', ')') as market_symbol,
-            total_oi_usd,
-            long_oi_pct,
-            short_oi_pct
-        FROM {self.environment}_{chain}.fct_perp_market_history_{chain}
-        WHERE
-            DATE(ts) >= '{start_date}' and DATE(ts) <= '{end_date}'
-        ORDER BY ts
-        """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        def query(start_date, end_date):
+            return Query(
+                f"""
+                SELECT
+                    ts,
+                    '{chain_label}' AS chain,
+                    CONCAT(market_symbol, ' (', '{chain_label}', ')') as market_symbol,
+                    total_oi_usd,
+                    long_oi_pct,
+                    short_oi_pct
+                FROM {self.table(chain, "fct_perp_market_history")}
+                WHERE
+                    ts >= :start_date and ts < :end_date
+                ORDER BY ts
+                """,
+                day_range(start_date, end_date),
+            )
+
+        if incremental:
+            return self._run_incremental(
+                ("get_perps_markets_history", chain), query, start_date, end_date, backend
+            )
+        return self._run_windowed(query, start_date, end_date, backend=backend)
 
     def get_perps_account_activity(
         self,
         start_date: datetime,
         end_date: datetime,
         chain: str = "arbitrum_mainnet",
+        backend: str = "pandas",
     ) -> pd.DataFrame:
         """
         Get perps account activity. Active accounts are those that have
@@ -404,29 +1177,35 @@ class SynthetixAPI:
             start_date (datetime): Start date for the query
             end_date (datetime): End date for the query
             chain (str): Chain to query (e.g., 'arbitrum_mainnet')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
 
         Returns:
             pandas.DataFrame: Perps account activity with columns:
                 'date', 'chain', 'nof_accounts'
         """
         chain_label = self.SUPPORTED_CHAINS[chain]
-        query = f"""
-        SELECT
-            ts as date,
-            '{chain_label}' AS chain,
-            dau,
-            mau
-        FROM {self.environment}_{chain}.fct_perp_account_activity_{chain}
-        WHERE DATE(ts) >= DATE('{start_date}') AND DATE(ts) <= DATE('{end_date}')
-        """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        def query(start_date, end_date):
+            return Query(
+                f"""
+                SELECT
+                    ts as date,
+                    '{chain_label}' AS chain,
+                    dau,
+                    mau
+                FROM {self.table(chain, "fct_perp_account_activity")}
+                WHERE ts >= :start_date AND ts < :end_date
+                """,
+                day_range(start_date, end_date),
+            )
+
+        return self._run_windowed(query, start_date, end_date, backend=backend)
 
     def get_snx_token_buyback(
         self,
         start_date: datetime,
         end_date: datetime,
         chain: str = "base_mainnet",
+        backend: str = "pandas",
     ) -> pd.DataFrame:
         """
         Get SNX token buyback data.
@@ -435,25 +1214,30 @@ class SynthetixAPI:
             start_date (datetime): Start date for the query
             end_date (datetime): End date for the query
             chain (str): Chain to query (e.g., 'base_mainnet')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
 
         Returns:
             pandas.DataFrame: SNX token buyback data with columns:
                 'ts', 'snx_amount', 'usd_amount'
         """
         chain_label = self.SUPPORTED_CHAINS[chain]
-        query = f"""
-        SELECT
-            ts,
-            '{chain_label}' AS chain,
-            snx_amount,
-            usd_amount
-        FROM {self.environment}_{chain}.fct_buyback_daily_{chain}
-        WHERE
-            DATE(ts) >= '{start_date}' AND DATE(ts) <= '{end_date}'
-        ORDER BY ts
-        """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        def query(start_date, end_date):
+            return Query(
+                f"""
+                SELECT
+                    ts,
+                    '{chain_label}' AS chain,
+                    snx_amount,
+                    usd_amount
+                FROM {self.table(chain, "fct_buyback_daily")}
+                WHERE
+                    ts >= :start_date AND ts < :end_date
+                ORDER BY ts
+                """,
+                day_range(start_date, end_date),
+            )
+
+        return self._run_windowed(query, start_date, end_date, backend=backend)
 
     # V2 queries
     def get_perps_v2_stats(
@@ -462,6 +1246,8 @@ class SynthetixAPI:
         end_date: datetime,
         chain: str = "optimism_mainnet",
         resolution: str = "daily",
+        backend: str = "pandas",
+        incremental: bool = False,
     ) -> pd.DataFrame:
         """
         Get perps V2 stats.
@@ -470,25 +1256,42 @@ class SynthetixAPI:
             start_date (datetime): Start date for the query
             end_date (datetime): End date for the query
             chain (str): Chain to query (e.g., 'arbitrum_mainnet')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            incremental (bool): Serve the range from the local store, fetching only new rows
 
         Returns:
             pandas.DataFrame: Perps stats with columns:
                 'ts', 'chain', 'volume', 'exchange_fees'
         """
         chain_label = self.SUPPORTED_CHAINS[chain]
-        query = f"""
-        SELECT
-            ts,
-            '{chain_label}' AS chain,
-            volume,
-            exchange_fees + liquidation_fees as exchange_fees
-        FROM {self.environment}_{chain}.fct_v2_stats_{resolution}_{chain}
-        WHERE
-            DATE(ts) >= '{start_date}' AND DATE(ts) <= '{end_date}'
-        ORDER BY ts
-        """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        def query(start_date, end_date):
+            return Query(
+                f"""
+                SELECT
+                    ts,
+                    '{chain_label}' AS chain,
+                    volume,
+                    exchange_fees + liquidation_fees as exchange_fees
+                FROM {self.table(chain, "fct_v2_stats", resolution)}
+                WHERE
+                    ts >= :start_date AND ts < :end_date
+                ORDER BY ts
+                """,
+                day_range(start_date, end_date),
+            )
+
+        if incremental:
+            return self._run_incremental(
+                ("get_perps_v2_stats", chain, resolution),
+                query,
+                start_date,
+                end_date,
+                backend,
+                resolution=resolution,
+            )
+        return self._run_windowed(
+            query, start_date, end_date, resolution=resolution, backend=backend
+        )
 
     def get_perps_v2_open_interest(
         self,
@@ -496,6 +1299,8 @@ class SynthetixAPI:
         end_date: datetime,
         chain: str = "optimism_mainnet",
         resolution: str = "daily",
+        backend: str = "pandas",
+        incremental: bool = False,
     ) -> pd.DataFrame:
         """
         Get perps V2 open interest.
@@ -504,21 +1309,38 @@ class SynthetixAPI:
             start_date (datetime): Start date for the query
             end_date (datetime): End date for the query
             chain (str): Chain to query (e.g., 'optimism_mainnet')
+            backend (str): Result backend ('pandas', 'arrow', 'polars' or 'pyarrow')
+            incremental (bool): Serve the range from the local store, fetching only new rows
 
         Returns:
             pandas.DataFrame: Open interest data with columns:
                 'ts', 'chain', 'total_oi_usd'
         """
         chain_label = self.SUPPORTED_CHAINS[chain]
-        query = f"""
-        SELECT
-            ts,
-            '{chain_label}' AS chain,
-            total_oi_usd
-        FROM {self.environment}_{chain}.fct_v2_stats_{resolution}_{chain}
-        WHERE
-            DATE(ts) >= '{start_date}' AND DATE(ts) <= '{end_date}'
-        ORDER BY ts
-        """
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn)
+        def query(start_date, end_date):
+            return Query(
+                f"""
+                SELECT
+                    ts,
+                    '{chain_label}' AS chain,
+                    total_oi_usd
+                FROM {self.table(chain, "fct_v2_stats", resolution)}
+                WHERE
+                    ts >= :start_date AND ts < :end_date
+                ORDER BY ts
+                """,
+                day_range(start_date, end_date),
+            )
+
+        if incremental:
+            return self._run_incremental(
+                ("get_perps_v2_open_interest", chain, resolution),
+                query,
+                start_date,
+                end_date,
+                backend,
+                resolution=resolution,
+            )
+        return self._run_windowed(
+            query, start_date, end_date, resolution=resolution, backend=backend
+        )
@@ -0,0 +1,104 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    Bounded pool of DB-API connections, for drivers without their own pool.
+
+    At most `size + max_overflow` connections are open at once, and callers
+    beyond that wait up to `timeout` seconds for one to be released. Up to
+    `size` idle connections are kept for reuse, and overflow connections are
+    closed when they are released, like SQLAlchemy's QueuePool.
+
+    Released connections are rolled back, so a pooled connection never sits
+    idle in a transaction. Connections that fail to roll back are discarded.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        size: int = 5,
+        max_overflow: int = 10,
+        timeout: float = 30,
+    ):
+        """
+        Args:
+            connect (callable): Opens a new connection
+            size (int): Number of idle connections to keep
+            max_overflow (int): Connections allowed above `size` under load
+            timeout (float): Seconds to wait for a connection before failing
+        """
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(size + max_overflow)
+        # most recently used first, so surplus connections age out
+        self._idle = queue.LifoQueue()
+        self._disposed = False
+        self.stats = {"connects": 0, "reuses": 0, "discards": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, stat: str):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def acquire(self) -> Tuple[Any, Optional[float]]:
+        """
+        Take a connection from the pool, opening one if none is idle.
+
+        Returns:
+            tuple: The connection, and the seconds spent opening it, or None
+                if an idle connection was reused
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No connection available within {self.timeout} seconds")
+        try:
+            connection = self._idle.get_nowait()
+            self._count("reuses")
+            return connection, None
+        except queue.Empty:
+            pass
+
+        start = time.perf_counter()
+        try:
+            connection = self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+        self._count("connects")
+        return connection, time.perf_counter() - start
+
+    def release(self, connection: Any):
+        """Return a connection to the pool, closing it if it is broken or surplus."""
+        try:
+            connection.rollback()
+            if not self._disposed and self._idle.qsize() < self.size:
+                self._idle.put(connection)
+                return
+        except Exception as e:
+            logger.warning(f"Discarding pooled connection: {e}")
+            self._count("discards")
+        finally:
+            self._slots.release()
+        self._close(connection)
+
+    def _close(self, connection: Any):
+        try:
+            connection.close()
+        except Exception as e:
+            logger.warning(f"Failed to close pooled connection: {e}")
+
+    def dispose(self):
+        """Close every idle connection. Connections in use are closed on release."""
+        self._disposed = True
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
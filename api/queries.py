@@ -0,0 +1,63 @@
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import sqlalchemy
+
+# identifiers interpolated into SQL must be plain lowercase names
+IDENTIFIER_RE = re.compile(r"^[a-z0-9_]+$")
+
+# named bind parameters, matching the syntax of `sqlalchemy.text`
+BIND_PARAM_RE = re.compile(r"(?<![:\w\\]):(\w+)(?!:)")
+
+
+class Query(NamedTuple):
+    """A SQL statement with `:name` bind parameters and their values."""
+
+    sql: str
+    params: Dict[str, Any] = {}
+
+    def text(self) -> sqlalchemy.TextClause:
+        """Return the statement as a SQLAlchemy text clause."""
+        return sqlalchemy.text(self.sql)
+
+    def numeric(self) -> Tuple[str, List[Any]]:
+        """
+        Compile the statement to postgres `$n` placeholders for ADBC.
+
+        Returns:
+            tuple: The SQL and the list of positional parameter values
+        """
+        names: List[str] = []
+
+        def replace(match):
+            name = match.group(1)
+            if name not in names:
+                names.append(name)
+            return f"${names.index(name) + 1}"
+
+        sql = BIND_PARAM_RE.sub(replace, self.sql)
+        return sql, [self.params[name] for name in names]
+
+
+def as_query(query: Union[str, Query], params: Optional[Dict[str, Any]] = None) -> Query:
+    """Return a Query from a SQL string and its parameters, or an existing Query."""
+    if isinstance(query, Query):
+        return Query(query.sql, {**query.params, **(params or {})})
+    return Query(query, params or {})
+
+
+def identifier(*parts: str) -> str:
+    """
+    Join parts with underscores into a SQL identifier.
+
+    Schema and table names cannot be bound as parameters, so every name built
+    from input is validated before it is interpolated into a query.
+
+    Raises:
+        ValueError: If the identifier contains anything but lowercase letters,
+            digits and underscores
+    """
+    name = "_".join(str(part) for part in parts)
+    if not IDENTIFIER_RE.match(name):
+        raise ValueError(f"Invalid identifier: {name}")
+    return name
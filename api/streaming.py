@@ -0,0 +1,167 @@
+from typing import BinaryIO, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+Chunk = Union[pd.DataFrame, pl.DataFrame, pa.Table]
+
+# aggregations that can be computed per chunk and then combined
+COMBINE_AGGS = {
+    "sum": "sum",
+    "count": "sum",
+    "min": "min",
+    "max": "max",
+    "first": "first",
+    "last": "last",
+}
+
+
+# formats of `write_chunks`
+EXPORT_FORMATS = ("csv", "parquet")
+
+
+def _to_pandas(chunk: Chunk) -> pd.DataFrame:
+    """Convert a chunk from any result backend to a pandas DataFrame."""
+    if isinstance(chunk, pd.DataFrame):
+        return chunk
+    return chunk.to_pandas()
+
+
+def _to_arrow(chunk: Chunk) -> pa.Table:
+    """Convert a chunk from any result backend to an Arrow table."""
+    if isinstance(chunk, pd.DataFrame):
+        return pa.Table.from_pandas(chunk, preserve_index=False)
+    elif isinstance(chunk, pl.DataFrame):
+        return chunk.to_arrow()
+    return chunk
+
+
+def aggregate_chunks(
+    chunks: Iterable[Chunk], by: Union[str, List[str]], aggs: Dict[str, str]
+) -> pd.DataFrame:
+    """
+    Group and aggregate a stream of chunks without holding them all in memory.
+
+    Each chunk is reduced to partial aggregates as it arrives, and the partials
+    are combined at the end. Means are computed from running sums and counts.
+
+    Args:
+        chunks (Iterable): Chunks as yielded by `SynthetixAPI.iter_query`
+        by (str | list): Column(s) to group by
+        aggs (dict): Mapping of column to aggregation
+            ('sum', 'count', 'min', 'max', 'mean', 'first' or 'last')
+
+    Returns:
+        pandas.DataFrame: Aggregated data with the `by` columns and one column per aggregation
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    partial_aggs = {}
+    for col, agg in aggs.items():
+        if agg == "mean":
+            partial_aggs[f"{col}__sum"] = (col, "sum")
+            partial_aggs[f"{col}__count"] = (col, "count")
+        elif agg in COMBINE_AGGS:
+            partial_aggs[f"{col}__{agg}"] = (col, agg)
+        else:
+            raise ValueError(f"Invalid aggregation: {agg}")
+
+    partials = []
+    for chunk in chunks:
+        df = _to_pandas(chunk)
+        if len(df) > 0:
+            partials.append(df.groupby(by, sort=False).agg(**partial_aggs))
+
+    if not partials:
+        return pd.DataFrame(columns=[*by, *aggs.keys()])
+
+    combined = pd.concat(partials).groupby(level=by, sort=True).agg(
+        {
+            name: "sum" if name.endswith("__count") else COMBINE_AGGS.get(agg, agg)
+            for name, (_, agg) in partial_aggs.items()
+        }
+    )
+
+    result = pd.DataFrame(index=combined.index)
+    for col, agg in aggs.items():
+        if agg == "mean":
+            result[col] = combined[f"{col}__sum"] / combined[f"{col}__count"]
+        else:
+            result[col] = combined[f"{col}__{agg}"]
+    return result.reset_index()
+
+
+def tail_chunks(
+    chunks: Iterable[Chunk], n: int, by: Optional[Union[str, List[str]]] = None
+) -> pd.DataFrame:
+    """
+    Keep the last `n` rows of a stream of chunks, optionally per group.
+
+    Args:
+        chunks (Iterable): Chunks as yielded by `SynthetixAPI.iter_query`
+        n (int): Number of rows to keep
+        by (str | list, optional): Column(s) to group by before taking the tail
+
+    Returns:
+        pandas.DataFrame: The last rows of the stream
+    """
+    tail = None
+    for chunk in chunks:
+        df = _to_pandas(chunk)
+        df = df if tail is None else pd.concat([tail, df], ignore_index=True)
+        tail = df.tail(n) if by is None else df.groupby(by, sort=False).tail(n)
+    return tail.reset_index(drop=True) if tail is not None else pd.DataFrame()
+
+
+def write_chunks(
+    chunks: Iterable[Chunk],
+    sink: Union[str, BinaryIO],
+    file_format: str = "csv",
+    schema: Optional[pa.Schema] = None,
+) -> int:
+    """
+    Write a stream of chunks to a CSV or Parquet file, one chunk at a time.
+
+    The writer is opened with the schema of the first chunk and later chunks
+    are cast to it, so memory is bounded by the chunk size whatever the
+    number of rows. Parquet files get one row group per chunk. A stream
+    without chunks still writes a file, with the header of `schema`.
+
+    Args:
+        chunks (Iterable): Chunks as yielded by `SynthetixAPI.iter_query`
+        sink (str | file): Path or binary file object to write to
+        file_format (str): 'csv' or 'parquet'
+        schema (pyarrow.Schema, optional): Schema of the file when the stream
+            has no chunks. Defaults to an empty schema.
+
+    Returns:
+        int: The number of rows written
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid export format: {file_format}")
+
+    def open_writer(schema: pa.Schema):
+        return (
+            pa_csv.CSVWriter(sink, schema)
+            if file_format == "csv"
+            else pq.ParquetWriter(sink, schema)
+        )
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            table = _to_arrow(chunk)
+            if writer is None:
+                schema = table.schema.remove_metadata()
+                writer = open_writer(schema)
+            writer.write_table(table.cast(schema))
+            rows += table.num_rows
+        if writer is None:
+            writer = open_writer(schema if schema is not None else pa.schema([]))
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
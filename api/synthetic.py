@@ -0,0 +1,928 @@
+import argparse
+import io
+import itertools
+import logging
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from api.queries import identifier
+
+logger = logging.getLogger(__name__)
+
+# approximate production volumes, multiplied by the scale factor
+PRODUCTION_SCALE = {
+    "accounts": 20000,
+    "markets": 40,
+    "hours": 24 * 365,
+    "trades_per_hour": 250,
+}
+
+CORE_CHAINS = ["arbitrum_mainnet", "base_mainnet", "eth_mainnet"]
+PERP_CHAINS = ["arbitrum_mainnet", "base_mainnet"]
+V2_CHAINS = ["optimism_mainnet"]
+
+RESOLUTIONS = {"hourly": "h", "daily": "D"}
+APR_WINDOWS = {"24h": 24, "7d": 24 * 7, "28d": 24 * 28}
+
+MARKET_SYMBOLS = ["ETH", "BTC", "SOL", "OP", "ARB", "SNX", "LINK", "DOGE", "AVAX", "PEPE"]
+COLLATERALS = {
+    "arbitrum_mainnet": ["WETH", "ARB", "USDC", "tBTC", "USDe"],
+    "base_mainnet": ["sUSDC", "sStataUSDC"],
+    "eth_mainnet": ["SNX"],
+}
+REWARD_TOKENS = ["SNX", "ARB", "USDC"]
+SYNTH_SYMBOLS = ["sUSD", "sETH", "sBTC", "sUSDe"]
+TRACKING_CODES = ["", "KWENTA", "POLYNOMIAL", "INFINEX", "DHEDGE", "LYRA", "TLX", "LEVERAGED"]
+KEEPERS = 5
+ACCOUNT_ACTIONS = ["Delegated", "Withdrawn", "Claimed"]
+
+PG_TYPES = {
+    "i": "bigint",
+    "u": "bigint",
+    "f": "double precision",
+    "b": "boolean",
+    "M": "timestamptz",
+    "O": "text",
+}
+INDEX_COLUMNS = ["ts", "block_timestamp", "date", "account_id"]
+
+Data = Union[pd.DataFrame, Iterable[pd.DataFrame]]
+
+
+def hex_strings(rng: np.random.Generator, n: int, nbytes: int = 32) -> np.ndarray:
+    """Return n random 0x-prefixed hex strings, such as hashes or addresses."""
+    raw = rng.bytes(n * nbytes)
+    return np.array(
+        ["0x" + raw[i : i + nbytes].hex() for i in range(0, n * nbytes, nbytes)],
+        dtype=object,
+    )
+
+
+def random_walk(
+    rng: np.random.Generator, shape: Tuple[int, ...], start, volatility: float
+) -> np.ndarray:
+    """Return a positive geometric random walk along the first axis."""
+    steps = rng.normal(0, volatility, shape)
+    return start * np.exp(np.cumsum(steps, axis=0))
+
+
+def with_cumulative(
+    df: pd.DataFrame, columns: List[str], by: Optional[str] = None
+) -> pd.DataFrame:
+    """Add `cumulative_<column>` running totals, optionally per group."""
+    totals = df.groupby(by)[columns].cumsum() if by else df[columns].cumsum()
+    return df.assign(**{f"cumulative_{col}": totals[col] for col in columns})
+
+
+def with_shares(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Add `<column>_share` columns, the fraction of each timestamp's total."""
+    totals = df.groupby("ts")[columns].transform("sum")
+    return df.assign(
+        **{f"{col}_share": (df[col] / totals[col]).fillna(0) for col in columns}
+    )
+
+
+def rollup(
+    df: pd.DataFrame, freq: str, sums: List[str], lasts: Sequence[str] = (), by=()
+) -> pd.DataFrame:
+    """
+    Aggregate an hourly table to a coarser resolution.
+
+    Args:
+        df (pandas.DataFrame): Hourly data with a 'ts' column
+        freq (str): Pandas frequency of the result, e.g. 'D'
+        sums (list): Columns summed over each period
+        lasts (list): Columns taking their last value in each period
+        by (list): Columns identifying the series, e.g. ['market_symbol']
+
+    Returns:
+        pandas.DataFrame: The aggregated data, sorted by ts
+    """
+    keys = [df["ts"].dt.floor(freq).rename("ts"), *[df[col] for col in by]]
+    aggs = {**{col: "sum" for col in sums}, **{col: "last" for col in lasts}}
+    return df.groupby(keys, sort=True).agg(aggs).reset_index()
+
+
+def split_totals(
+    rng: np.random.Generator,
+    totals: pd.DataFrame,
+    column: str,
+    labels: Sequence[str],
+    values: List[str],
+) -> pd.DataFrame:
+    """
+    Split the per-timestamp totals of a table across labels.
+
+    Each label gets a stable share of every total with some noise, as keepers,
+    integrators or markets do in the production tables.
+
+    Args:
+        rng (numpy.random.Generator): Random generator
+        totals (pandas.DataFrame): Data with a 'ts' column and the value columns
+        column (str): Name of the label column
+        labels (list): Labels to split the totals across
+        values (list): Columns to split
+
+    Returns:
+        pandas.DataFrame: One row per timestamp and label
+    """
+    n_ts, n_labels = len(totals), len(labels)
+    weights = rng.dirichlet(np.ones(n_labels) * 0.7)
+    weights = weights * rng.lognormal(0, 0.3, (n_ts, n_labels))
+    weights = weights / weights.sum(axis=1, keepdims=True)
+    df = pd.DataFrame(
+        {
+            "ts": np.repeat(totals["ts"].to_numpy(), n_labels),
+            column: np.tile(np.asarray(labels, dtype=object), n_ts),
+        }
+    )
+    for col in values:
+        split = totals[col].to_numpy()[:, None] * weights
+        if np.issubdtype(totals[col].dtype, np.integer):
+            split = np.round(split).astype("int64")
+        df[col] = split.ravel()
+    return df
+
+
+class SyntheticData:
+    """
+    Generate synthetic data for the tables queried by the API and dashboards.
+
+    Tables have the columns the queries select and volumes proportional to the
+    number of accounts, markets, hours of history and trades per hour. Event
+    tables are generated one day at a time, so they can be loaded at sizes
+    that do not fit in memory. Every table is seeded from the chain and the
+    table name, so the same settings always produce the same data.
+    """
+
+    def __init__(
+        self,
+        accounts: int = PRODUCTION_SCALE["accounts"],
+        markets: int = PRODUCTION_SCALE["markets"],
+        hours: int = PRODUCTION_SCALE["hours"],
+        trades_per_hour: float = PRODUCTION_SCALE["trades_per_hour"],
+        end: Optional[datetime] = None,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            accounts (int): Number of perps accounts per chain
+            markets (int): Number of perps markets per chain
+            hours (int): Hours of history, ending at `end`
+            trades_per_hour (float): Average number of perps trades per hour
+            end (datetime, optional): Last hour of data. Defaults to the
+                current hour.
+            seed (int): Seed of the random generators
+        """
+        end = pd.Timestamp(end or datetime.now(timezone.utc))
+        end = end.tz_localize("UTC") if end.tzinfo is None else end.tz_convert("UTC")
+        self.accounts = accounts
+        self.markets = markets
+        self.hours = hours
+        self.trades_per_hour = trades_per_hour
+        self.seed = seed
+        self.ts = pd.date_range(end=end.floor("h"), periods=hours, freq="h")
+        self.days = self.ts.floor("D").unique()
+
+    @classmethod
+    def at_scale(cls, scale: float, **overrides) -> "SyntheticData":
+        """
+        Create a generator at a multiple of production volumes.
+
+        Accounts and trades grow with the scale, while markets and history keep
+        their production size unless overridden.
+        """
+        settings = {
+            **PRODUCTION_SCALE,
+            "accounts": int(PRODUCTION_SCALE["accounts"] * scale),
+            "trades_per_hour": PRODUCTION_SCALE["trades_per_hour"] * scale,
+        }
+        settings.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**settings)
+
+    def _rng(self, chain: str, *name) -> np.random.Generator:
+        keys = [zlib.crc32(str(part).encode()) for part in (chain, *name)]
+        return np.random.default_rng([self.seed, *keys])
+
+    def tables(self, chain: str, environment: str = "prod") -> Iterator[Tuple[str, Data]]:
+        """
+        Yield the tables of a chain.
+
+        Args:
+            chain (str): Chain to generate, e.g. 'base_mainnet'
+            environment (str): Environment prefix of the schemas
+
+        Returns:
+            Iterator: Pairs of qualified table name and a DataFrame or an
+                iterator of DataFrame chunks
+        """
+        schema = identifier(environment, chain)
+        generators = []
+        if chain in CORE_CHAINS:
+            seeds = identifier(environment, "seeds")
+            yield f"{seeds}.{identifier(chain, 'tokens')}", self.tokens(chain)
+            generators.append(self.core_tables)
+        if chain in PERP_CHAINS:
+            raw = identifier(environment, "raw", chain)
+            yield (
+                f"{raw}.{identifier('perp_account_created', chain)}",
+                self.accounts_created(chain),
+            )
+            generators += [self.perp_tables, self.spot_tables]
+        if chain in V2_CHAINS:
+            generators.append(self.v2_tables)
+        for generator in generators:
+            for name, data in generator(chain):
+                yield f"{schema}.{identifier(name, chain)}", data
+
+    # shared dimensions
+    def tokens(self, chain: str) -> pd.DataFrame:
+        """Token symbols and addresses of the collaterals of a chain."""
+        symbols = COLLATERALS[chain]
+        return pd.DataFrame(
+            {
+                "token_address": hex_strings(self._rng(chain, "tokens"), len(symbols), 20),
+                "token_symbol": symbols,
+            }
+        )
+
+    def market_symbols(self, n: Optional[int] = None) -> List[str]:
+        n = n or self.markets
+        extra = [f"MKT{i}" for i in range(len(MARKET_SYMBOLS), n)]
+        return (MARKET_SYMBOLS + extra)[:n]
+
+    def account_ids(self, chain: str) -> np.ndarray:
+        rng = self._rng(chain, "accounts")
+        return rng.choice(2**62, self.accounts, replace=False) + 1
+
+    def accounts_created(self, chain: str) -> pd.DataFrame:
+        """Account ids, owners and creation times, biased towards recent hours."""
+        rng = self._rng(chain, "perp_account_created")
+        offsets = (rng.power(2, self.accounts) * (self.hours - 1)).astype(int)
+        return pd.DataFrame(
+            {
+                "block_timestamp": self.ts[np.sort(offsets)],
+                "account_id": self.account_ids(chain),
+                "owner": hex_strings(rng, self.accounts, 20),
+            }
+        )
+
+    def market_grid(self, chain: str, symbols: List[str]) -> pd.DataFrame:
+        """
+        Hourly state and activity of every market.
+
+        Prices and open interest follow random walks, and trades are split
+        across markets with a skewed distribution, as volume concentrates in a
+        few markets in production.
+        """
+        rng = self._rng(chain, "markets", len(symbols))
+        n_h, n_m = len(self.ts), len(symbols)
+        weights = rng.dirichlet(np.ones(n_m) * 0.5)
+
+        price = random_walk(rng, (n_h, n_m), rng.lognormal(3, 2, n_m), 0.01)
+        trades = rng.poisson(self.trades_per_hour * weights, (n_h, n_m))
+        volume = trades * rng.lognormal(8, 1, (n_h, n_m))
+        oi = random_walk(rng, (n_h, n_m), weights * self.accounts * 500, 0.02)
+        long_pct = np.clip(0.5 + np.cumsum(rng.normal(0, 0.01, (n_h, n_m)), 0), 0.05, 0.95)
+        liquidations = rng.poisson(trades * 0.01)
+        funding_rate = (long_pct - 0.5) * 0.002 + rng.normal(0, 1e-4, (n_h, n_m))
+        interest_rate = np.abs(rng.normal(0.05, 0.01, (n_h, n_m)))
+
+        df = pd.DataFrame(
+            {
+                "ts": np.repeat(self.ts, n_m),
+                "market_id": np.tile(np.arange(100, 100 + n_m), n_h),
+                "market_symbol": np.tile(np.asarray(symbols, dtype=object), n_h),
+                "price": price.ravel(),
+                "volume": volume.ravel(),
+                "trades": trades.ravel(),
+                "exchange_fees": (volume * 0.0005).ravel(),
+                "liquidations": liquidations.ravel(),
+                "amount_liquidated": (liquidations * rng.lognormal(7, 1, (n_h, n_m))).ravel(),
+                "market_oi_usd": oi.ravel(),
+                "long_oi_pct": long_pct.ravel(),
+                "short_oi_pct": 1 - long_pct.ravel(),
+                "funding_rate": funding_rate.ravel(),
+                "interest_rate": interest_rate.ravel(),
+            }
+        )
+        df["long_oi_usd"] = df["market_oi_usd"] * df["long_oi_pct"]
+        df["short_oi_usd"] = df["market_oi_usd"] * df["short_oi_pct"]
+        df["skew"] = (df["long_oi_usd"] - df["short_oi_usd"]) / df["price"]
+        df["total_oi_usd"] = df.groupby("ts")["market_oi_usd"].transform("sum")
+        return df
+
+    def events(self, chain: str, name: str, per_hour: float) -> Iterator[Tuple]:
+        """
+        Yield the random generator, timestamps and account ids of a day of events.
+
+        Accounts are drawn with a heavy-tailed activity distribution, so a few
+        accounts produce most of the events as in production.
+        """
+        accounts = self.account_ids(chain)
+        activity = self._rng(chain, "activity").pareto(1.2, self.accounts) + 1e-3
+        activity = activity / activity.sum()
+        for day in self.days:
+            rng = self._rng(chain, name, day.value)
+            hours = self.ts[(self.ts >= day) & (self.ts < day + pd.Timedelta(days=1))]
+            n = rng.poisson(per_hour * len(hours))
+            ts = hours[0] + pd.to_timedelta(
+                np.sort(rng.uniform(0, len(hours) * 3600, n)), unit="s"
+            )
+            yield rng, ts, accounts[rng.choice(self.accounts, n, p=activity)]
+
+    # perps v3
+    def trades(self, chain: str) -> Iterator[pd.DataFrame]:
+        """Perps trades, one chunk per day."""
+        symbols = self.market_symbols()
+        grid = self.market_grid(chain, symbols)
+        prices = grid["price"].to_numpy().reshape(len(self.ts), len(symbols))
+        market_weights = grid.groupby("market_symbol", sort=False)["trades"].sum()
+        market_weights = (market_weights / market_weights.sum()).to_numpy()
+        for rng, ts, account_id in self.events(chain, "trades", self.trades_per_hour):
+            n = len(ts)
+            market = rng.choice(len(symbols), n, p=market_weights)
+            hour = self.ts.get_indexer(ts.floor("h"))
+            fill_price = prices[hour, market] * (1 + rng.normal(0, 5e-4, n))
+            trade_size = rng.choice([-1, 1], n) * rng.lognormal(8, 1, n) / fill_price
+            position_size = trade_size + rng.normal(0, 1, n) * np.abs(trade_size)
+            yield pd.DataFrame(
+                {
+                    "ts": ts,
+                    "account_id": account_id,
+                    "market_id": market + 100,
+                    "market_symbol": np.asarray(symbols, dtype=object)[market],
+                    "position_size": position_size,
+                    "notional_position_size": position_size * fill_price,
+                    "trade_size": trade_size,
+                    "notional_trade_size": trade_size * fill_price,
+                    "fill_price": fill_price,
+                    "total_fees": np.abs(trade_size * fill_price) * 0.0005,
+                    "accrued_funding": rng.normal(0, 5, n),
+                    "tracking_code": rng.choice(TRACKING_CODES, n),
+                    "transaction_hash": hex_strings(rng, n),
+                }
+            )
+
+    def orders(self, chain: str) -> Iterator[pd.DataFrame]:
+        """Committed orders, one per trade, with the account owner as sender."""
+        created = self.accounts_created(chain)
+        owners = pd.Series(created["owner"].to_numpy(), index=created["account_id"])
+        for trades in self.trades(chain):
+            yield pd.DataFrame(
+                {
+                    "ts": trades["ts"],
+                    "account_id": trades["account_id"].astype(str),
+                    "market_id": trades["market_id"],
+                    "sender": owners.loc[trades["account_id"]].to_numpy(),
+                }
+            )
+
+    def account_stats_hourly(self, chain: str) -> Iterator[pd.DataFrame]:
+        """Cumulative volume and fees of every account in the hours it traded."""
+        totals = pd.DataFrame(columns=["volume", "fees"], dtype=float)
+        for trades in self.trades(chain):
+            hourly = (
+                trades.assign(
+                    ts=trades["ts"].dt.floor("h"),
+                    volume=trades["notional_trade_size"].abs(),
+                    fees=trades["total_fees"],
+                )
+                .groupby(["account_id", "ts"])[["volume", "fees"]]
+                .sum()
+                .reset_index()
+            )
+            cumulative = hourly.groupby("account_id")[["volume", "fees"]].cumsum()
+            offset = totals.reindex(hourly["account_id"]).fillna(0).to_numpy()
+            hourly[["cumulative_volume", "cumulative_fees"]] = cumulative.to_numpy() + offset
+            totals = (
+                hourly.groupby("account_id")[["cumulative_volume", "cumulative_fees"]]
+                .last()
+                .set_axis(["volume", "fees"], axis=1)
+                .combine_first(totals)
+            )
+            yield hourly.sort_values("ts")[
+                ["ts", "account_id", "cumulative_volume", "cumulative_fees"]
+            ]
+
+    def collateral_balances(self, chain: str) -> Iterator[pd.DataFrame]:
+        """Collateral deposits and withdrawals with account and total balances."""
+        per_hour = self.trades_per_hour / 10
+        total = np.zeros(len(SYNTH_SYMBOLS))
+        for rng, ts, account_id in self.events(chain, "collateral", per_hour):
+            n = len(ts)
+            synth = rng.choice(len(SYNTH_SYMBOLS), n, p=[0.7, 0.15, 0.1, 0.05])
+            deposit = rng.random(n) < 0.6
+            amount = np.where(deposit, 1, -1) * rng.lognormal(7, 1.5, n)
+            balance = np.abs(amount) * rng.uniform(1, 5, n)
+            running = np.zeros(n)
+            for i in range(len(SYNTH_SYMBOLS)):
+                mask = synth == i
+                running[mask] = total[i] + np.cumsum(amount[mask])
+                total[i] = running[mask][-1] if mask.any() else total[i]
+            price = np.where(synth == 0, 1.0, rng.lognormal(7, 0.1, n))
+            yield pd.DataFrame(
+                {
+                    "ts": ts,
+                    "account_id": account_id,
+                    "synth_symbol": np.asarray(SYNTH_SYMBOLS, dtype=object)[synth],
+                    "event_type": np.where(deposit, "deposit", "withdrawal"),
+                    "amount_delta": amount,
+                    "account_balance": balance,
+                    "account_balance_usd": balance * price,
+                    "total_balance": running,
+                    "total_balance_usd": running * price,
+                    "transaction_hash": hex_strings(rng, n),
+                }
+            )
+
+    def collateral_modified(self, chain: str) -> Iterator[pd.DataFrame]:
+        for df in self.collateral_balances(chain):
+            yield df[["ts", "account_id", "synth_symbol", "amount_delta"]].rename(
+                columns={"ts": "block_timestamp"}
+            )
+
+    def orders_expired(self, chain: str) -> Iterator[pd.DataFrame]:
+        for rng, ts, account_id in self.events(chain, "expired", self.trades_per_hour * 0.02):
+            n = len(ts)
+            yield pd.DataFrame(
+                {
+                    "block_number": (ts.asi8 // 2_000_000_000).astype("int64"),
+                    "block_timestamp": ts,
+                    "account_id": account_id,
+                    "market_id": rng.integers(100, 100 + self.markets, n),
+                    "acceptable_price": rng.lognormal(3, 2, n),
+                    "commitment_time": ts.asi8 // 1_000_000_000 - rng.integers(5, 60, n),
+                    "tracking_code": rng.choice(TRACKING_CODES, n),
+                }
+            )
+
+    def interest_charged(self, chain: str) -> Iterator[pd.DataFrame]:
+        for rng, ts, account_id in self.events(chain, "interest", self.trades_per_hour / 5):
+            n = len(ts)
+            yield pd.DataFrame(
+                {
+                    "block_timestamp": ts,
+                    "transaction_hash": hex_strings(rng, n),
+                    "account_id": account_id,
+                    "interest": rng.lognormal(0, 1.5, n),
+                }
+            )
+
+    def liquidations(self, chain: str) -> Iterator[pd.DataFrame]:
+        for rng, ts, account_id in self.events(chain, "liquidations", self.trades_per_hour / 100):
+            yield pd.DataFrame(
+                {
+                    "ts": ts,
+                    "account_id": account_id,
+                    "total_reward": rng.lognormal(3, 1, len(ts)),
+                }
+            )
+
+    def account_activity(self, chain: str) -> pd.DataFrame:
+        """Daily and monthly active and new accounts."""
+        rng = self._rng(chain, "account_activity")
+        n = len(self.days)
+        dau = rng.poisson(self.accounts * 0.03, n)
+        mau = rng.poisson(self.accounts * 0.3, n)
+        return pd.DataFrame(
+            {
+                "ts": self.days,
+                "dau": dau,
+                "mau": mau,
+                "new_accounts_daily": rng.binomial(dau, 0.1),
+                "new_accounts_monthly": rng.binomial(mau, 0.2),
+            }
+        )
+
+    def perp_tables(self, chain: str) -> Iterator[Tuple[str, Data]]:
+        """Perps v3 tables, named without the chain suffix."""
+        rng = self._rng(chain, "perp_tables")
+        grid = self.market_grid(chain, self.market_symbols())
+
+        yield "fct_perp_market_history", grid[
+            [
+                "ts",
+                "market_id",
+                "market_symbol",
+                "funding_rate",
+                "interest_rate",
+                "price",
+                "skew",
+                "market_oi_usd",
+                "total_oi_usd",
+                "long_oi_pct",
+                "short_oi_pct",
+            ]
+        ].assign(
+            funding_rate_apr=grid["funding_rate"] * 365,
+            long_rate_apr=grid["funding_rate"] * 365 + grid["interest_rate"],
+            short_rate_apr=-grid["funding_rate"] * 365 + grid["interest_rate"],
+        )
+
+        hourly = grid.assign(
+            liquidated_accounts=grid["liquidations"],
+            liquidation_rewards=grid["amount_liquidated"] * 0.005,
+        )
+        market_columns = ["volume", "trades", "exchange_fees", "liquidations"]
+        stats_columns = ["volume", "trades", "exchange_fees", "liquidated_accounts", "liquidation_rewards"]
+        for resolution, freq in RESOLUTIONS.items():
+            market_stats = rollup(hourly, freq, market_columns, by=["market_symbol"])
+            yield f"fct_perp_market_stats_{resolution}", market_stats
+
+            stats = rollup(hourly, freq, stats_columns)
+            yield f"fct_perp_stats_{resolution}", with_cumulative(
+                stats, ["volume", "exchange_fees"]
+            )
+
+            keepers = split_totals(
+                rng,
+                stats.assign(
+                    amount_settled=stats["volume"],
+                    settlement_rewards=stats["trades"] * 0.5,
+                ),
+                "keeper",
+                list(hex_strings(rng, KEEPERS, 20)),
+                ["trades", "amount_settled", "settlement_rewards"],
+            )
+            keepers = with_shares(keepers, ["trades", "amount_settled", "settlement_rewards"])
+            yield f"fct_perp_keeper_stats_{resolution}", keepers.rename(
+                columns=lambda col: col.replace("_share", "_pct")
+            )
+
+            tracking = split_totals(
+                rng,
+                stats.assign(
+                    accounts=rng.poisson(self.accounts * 0.01, len(stats)),
+                    referral_fees=stats["exchange_fees"] * 0.1,
+                ),
+                "tracking_code",
+                TRACKING_CODES,
+                ["accounts", "volume", "trades", "exchange_fees", "referral_fees"],
+            )
+            yield f"fct_perp_tracking_stats_{resolution}", with_shares(
+                tracking, ["volume", "trades", "exchange_fees", "referral_fees"]
+            )
+
+        yield "fct_perp_account_activity", self.account_activity(chain)
+        yield "fct_perp_trades", self.trades(chain)
+        yield "fct_perp_orders", self.orders(chain)
+        yield "fct_perp_account_stats_hourly", self.account_stats_hourly(chain)
+        yield "fct_perp_collateral_balances", self.collateral_balances(chain)
+        yield "fct_perp_collateral_modified", self.collateral_modified(chain)
+        yield "fct_perp_previous_order_expired", self.orders_expired(chain)
+        yield "fct_perp_interest_charged", self.interest_charged(chain)
+        yield "fct_perp_liq_account", self.liquidations(chain)
+
+        buyback = pd.DataFrame(
+            {
+                "ts": self.ts,
+                "snx_amount": rng.lognormal(3, 1, self.hours),
+                "usd_amount": rng.lognormal(4, 1, self.hours),
+            }
+        )
+        for resolution, freq in RESOLUTIONS.items():
+            yield f"fct_buyback_{resolution}", with_cumulative(
+                rollup(buyback, freq, ["snx_amount", "usd_amount"]),
+                ["snx_amount", "usd_amount"],
+            )
+
+    # spot
+    def spot_tables(self, chain: str) -> Iterator[Tuple[str, Data]]:
+        """Spot market tables, named without the chain suffix."""
+        per_hour = self.trades_per_hour / 20
+        synth_market_ids = np.arange(1, len(SYNTH_SYMBOLS) + 1)
+
+        def spot_events(name, columns):
+            for rng, ts, _ in self.events(chain, name, per_hour):
+                n = len(ts)
+                df = pd.DataFrame(
+                    {
+                        "ts": ts,
+                        "block_number": (ts.asi8 // 2_000_000_000).astype("int64"),
+                        "tx_hash": hex_strings(rng, n),
+                        "synth_market_id": rng.choice(synth_market_ids, n),
+                    }
+                )
+                yield df.assign(**{col: fn(rng, n) for col, fn in columns.items()})
+
+        yield "fct_spot_wrapper", spot_events(
+            "wrapper",
+            {"amount_wrapped": lambda rng, n: rng.choice([-1, 1], n) * rng.lognormal(7, 1.5, n)},
+        )
+        yield "fct_spot_atomics", spot_events(
+            "atomics",
+            {
+                "amount": lambda rng, n: rng.lognormal(7, 1.5, n),
+                "price": lambda rng, n: rng.lognormal(0, 0.01, n),
+            },
+        )
+
+        rng = self._rng(chain, "synth_supply")
+        supply = random_walk(
+            rng, (self.hours, len(synth_market_ids)), self.accounts * 1000, 0.01
+        )
+        yield "fct_synth_supply", pd.DataFrame(
+            {
+                "ts": np.repeat(self.ts, len(synth_market_ids)),
+                "synth_market_id": np.tile(synth_market_ids, self.hours),
+                "supply": supply.ravel(),
+            }
+        )
+
+    # core
+    def core_apr(self, chain: str) -> pd.DataFrame:
+        """Hourly performance and trailing APRs of every collateral in pool 1."""
+        rng = self._rng(chain, "core_apr")
+        tokens = self.tokens(chain)
+        n_c = len(tokens)
+        collateral_value = random_walk(
+            rng, (self.hours, n_c), rng.lognormal(15, 1, n_c), 0.005
+        )
+        df = pd.DataFrame(
+            {
+                "ts": np.repeat(self.ts, n_c),
+                "pool_id": 1,
+                "collateral_type": np.tile(tokens["token_address"].to_numpy(), self.hours),
+                "collateral_value": collateral_value.ravel(),
+            }
+        )
+        n = len(df)
+        df["debt"] = df["collateral_value"] * rng.uniform(-0.1, 0.3, n)
+        df["hourly_pnl"] = df["collateral_value"] * rng.normal(2e-6, 1e-5, n)
+        df["rewards_usd"] = df["collateral_value"] * rng.exponential(5e-6, n)
+        df["liquidation_rewards_usd"] = df["collateral_value"] * rng.exponential(1e-7, n)
+        df["hourly_issuance"] = rng.normal(0, 1000, n)
+        df["underlying"] = rng.normal(0.03, 0.005, n)
+        series = df.groupby("collateral_type")
+        for col, source in {
+            "cumulative_issuance": "hourly_issuance",
+            "cumulative_pnl": "hourly_pnl",
+            "cumulative_rewards": "rewards_usd",
+            "cumulative_liquidation_rewards": "liquidation_rewards_usd",
+        }.items():
+            df[col] = series[source].cumsum()
+        for window, hours in APR_WINDOWS.items():
+            rolling = series[["hourly_pnl", "rewards_usd", "collateral_value"]].rolling(
+                hours, min_periods=1
+            )
+            sums = rolling.sum().reset_index(level=0, drop=True).sort_index()
+            annualize = 24 * 365 / hours
+            df[f"apr_{window}_pnl"] = sums["hourly_pnl"] * annualize / df["collateral_value"]
+            df[f"apr_{window}_rewards"] = sums["rewards_usd"] * annualize / df["collateral_value"]
+            df[f"apr_{window}_underlying"] = df["underlying"]
+            df[f"apr_{window}"] = df[f"apr_{window}_pnl"] + df[f"apr_{window}_rewards"]
+        return df.drop(columns="underlying")
+
+    def core_tables(self, chain: str) -> Iterator[Tuple[str, Data]]:
+        """Core tables, named without the chain suffix."""
+        rng = self._rng(chain, "core_tables")
+        apr = self.core_apr(chain)
+        yield "fct_core_apr", apr
+
+        # split each collateral's rewards across the reward tokens
+        rewards = []
+        for token, weight in zip(REWARD_TOKENS, rng.dirichlet(np.ones(len(REWARD_TOKENS)))):
+            rewards.append(
+                apr[["ts", "pool_id", "collateral_type", "collateral_value"]].assign(
+                    reward_token=token,
+                    rewards_usd=apr["rewards_usd"] * weight,
+                    **{
+                        f"apr_{window}_rewards": apr[f"apr_{window}_rewards"] * weight
+                        for window in APR_WINDOWS
+                    },
+                )
+            )
+        yield "fct_core_apr_rewards", pd.concat(rewards, ignore_index=True)
+
+        def account_activity():
+            per_hour = self.trades_per_hour / 10
+            for day_rng, ts, account_id in self.events(chain, "core_activity", per_hour):
+                yield pd.DataFrame(
+                    {
+                        "block_timestamp": ts,
+                        "account_id": account_id,
+                        "account_action": day_rng.choice(ACCOUNT_ACTIONS, len(ts)),
+                    }
+                )
+
+        yield "fct_core_account_activity", account_activity()
+        yield "fct_core_active_stakers", pd.DataFrame(
+            {
+                "date": self.days,
+                "nof_stakers_daily": rng.poisson(self.accounts * 0.05, len(self.days)),
+            }
+        )
+
+        n = max(self.accounts // 4, 1)
+        tokens = self.tokens(chain)["token_address"].to_numpy()
+        yield "fct_core_account_delegation", pd.DataFrame(
+            {
+                "ts": self.ts[rng.integers(0, self.hours, n)],
+                "pool_id": 1,
+                "collateral_type": rng.choice(tokens, n),
+                "account_id": rng.choice(self.account_ids(chain), n, replace=False),
+                "amount_delegated": rng.lognormal(8, 2, n),
+            }
+        ).sort_values("ts")
+
+    # perps v2
+    def v2_tables(self, chain: str) -> Iterator[Tuple[str, Data]]:
+        """Perps v2 tables, named without the chain suffix."""
+        rng = self._rng(chain, "v2_tables")
+        grid = self.market_grid(chain, self.market_symbols()).rename(
+            columns={"market_symbol": "market"}
+        )
+        grid["liquidation_fees"] = grid["amount_liquidated"] * 0.0035
+
+        yield "fct_v2_market_stats", grid[
+            ["ts", "market", "skew", "funding_rate", "long_oi_pct", "short_oi_pct"]
+        ]
+
+        sums = ["volume", "trades", "exchange_fees", "liquidation_fees", "liquidations", "amount_liquidated"]
+        oi = ["long_oi_usd", "short_oi_usd", "total_oi_usd"]
+        cumulative = ["volume", "exchange_fees", "liquidation_fees", "amount_liquidated"]
+        grid["total_oi_usd"] = grid["market_oi_usd"]
+        grid["eth_btc_oi_usd"] = grid["market_oi_usd"].where(grid["market"].isin(["ETH", "BTC"]), 0)
+        grid["alt_oi_usd"] = grid["market_oi_usd"] - grid["eth_btc_oi_usd"]
+        for resolution, freq in RESOLUTIONS.items():
+            market = rollup(grid, freq, sums, lasts=oi, by=["market"])
+            yield f"fct_v2_market_{resolution}", with_cumulative(market, cumulative, by="market")
+
+            totals = rollup(grid, "h", sums + oi + ["eth_btc_oi_usd", "alt_oi_usd"])
+            stats = rollup(totals, freq, sums, lasts=oi + ["eth_btc_oi_usd", "alt_oi_usd"])
+            yield f"fct_v2_stats_{resolution}", with_cumulative(stats, cumulative)
+
+            integrators = split_totals(
+                rng,
+                stats.assign(traders=rng.poisson(self.accounts * 0.01, len(stats))),
+                "tracking_code",
+                TRACKING_CODES,
+                ["exchange_fees", "volume", "trades", "traders"],
+            )
+            integrators = with_shares(integrators, ["exchange_fees", "volume", "trades"])
+            yield f"fct_v2_integrator_{resolution}", with_cumulative(
+                integrators, ["exchange_fees", "volume", "trades"], by="tracking_code"
+            )
+
+
+def create_table_sql(table: str, df: pd.DataFrame) -> str:
+    """Return a CREATE TABLE statement for the columns of a DataFrame."""
+    columns = ",\n    ".join(
+        f"{identifier(col)} {PG_TYPES.get(df[col].dtype.kind, 'text')}" for col in df.columns
+    )
+    return f"CREATE TABLE {table} (\n    {columns}\n)"
+
+
+def copy_frame(cursor, table: str, df: pd.DataFrame, chunk_rows: int = 100000) -> int:
+    """
+    Bulk-load a DataFrame into a table with COPY.
+
+    Rows are sent as CSV in chunks, so large frames are not serialized at once.
+    Missing values are written as empty fields, which COPY reads as NULL.
+
+    Returns:
+        int: The number of rows loaded
+    """
+    columns = ", ".join(identifier(col) for col in df.columns)
+    with cursor.copy(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)") as copy:
+        for start in range(0, len(df), chunk_rows):
+            buffer = io.StringIO()
+            df.iloc[start : start + chunk_rows].to_csv(buffer, header=False, index=False)
+            copy.write(buffer.getvalue())
+    return len(df)
+
+
+def load_table(connection, table: str, data: Data, chunk_rows: int = 100000) -> int:
+    """
+    Replace a table with synthetic data.
+
+    The table is created from the columns of the first chunk, loaded with COPY,
+    then indexed on its time and account columns and analyzed, so query plans
+    match those of the production tables.
+
+    Args:
+        connection (psycopg.Connection): Database connection
+        table (str): Schema-qualified table name
+        data (pandas.DataFrame | Iterable): The rows, or chunks of rows
+        chunk_rows (int): Rows per COPY write
+
+    Returns:
+        int: The number of rows loaded
+    """
+    chunks = iter([data] if isinstance(data, pd.DataFrame) else data)
+    first = next(chunks, None)
+    if first is None:
+        return 0
+
+    schema, name = table.split(".")
+    rows = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(create_table_sql(table, first))
+        for chunk in itertools.chain([first], chunks):
+            rows += copy_frame(cursor, table, chunk, chunk_rows)
+        for col in INDEX_COLUMNS:
+            if col in first.columns:
+                cursor.execute(f"CREATE INDEX ON {table} ({identifier(col)})")
+        cursor.execute(f"ANALYZE {table}")
+    connection.commit()
+    return rows
+
+
+def load(
+    connection,
+    data: SyntheticData,
+    chains: Sequence[str] = (*CORE_CHAINS, *V2_CHAINS),
+    environment: str = "prod",
+    chunk_rows: int = 100000,
+) -> pd.DataFrame:
+    """
+    Create and load every synthetic table of the given chains.
+
+    Args:
+        connection (psycopg.Connection): Database connection
+        data (SyntheticData): The generator
+        chains (list): Chains to load
+        environment (str): Environment prefix of the schemas, matching the
+            `environment` of the SynthetixAPI that will query them
+        chunk_rows (int): Rows per COPY write
+
+    Returns:
+        pandas.DataFrame: Rows loaded and seconds taken per table
+    """
+    results = []
+    for chain in chains:
+        for table, rows in data.tables(chain, environment):
+            start = time.perf_counter()
+            rows = load_table(connection, table, rows, chunk_rows)
+            seconds = time.perf_counter() - start
+            logger.info(f"Loaded {rows} rows into {table} in {seconds:.1f}s")
+            results.append({"table": table, "rows": rows, "seconds": seconds})
+    return pd.DataFrame(results)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Seed a database with synthetic data from the command line.
+
+    The database is configured with the DB_* environment variables. Point them
+    at a local postgres, then run the benchmarks or dashboards against it:
+
+        python -m api.synthetic --scale 10
+    """
+    import psycopg
+
+    from api.internal_api import get_db_config
+
+    parser = argparse.ArgumentParser(description="Load synthetic data into postgres")
+    parser.add_argument(
+        "--scale", type=float, default=1, help="multiple of production volumes"
+    )
+    parser.add_argument("--accounts", type=int, help="accounts per chain")
+    parser.add_argument("--markets", type=int, help="perps markets per chain")
+    parser.add_argument("--hours", type=int, help="hours of history")
+    parser.add_argument("--trades-per-hour", type=float, help="perps trades per hour")
+    parser.add_argument(
+        "--chains",
+        nargs="+",
+        choices=[*CORE_CHAINS, *V2_CHAINS],
+        default=[*CORE_CHAINS, *V2_CHAINS],
+    )
+    parser.add_argument("--environment", default="prod", help="schema prefix")
+    parser.add_argument("--chunk-rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    data = SyntheticData.at_scale(
+        args.scale,
+        accounts=args.accounts,
+        markets=args.markets,
+        hours=args.hours,
+        trades_per_hour=args.trades_per_hour,
+        seed=args.seed,
+    )
+    db_config = get_db_config(streamlit=False)
+    with psycopg.connect(
+        dbname=db_config["dbname"],
+        user=db_config["user"],
+        password=db_config["password"],
+        host=db_config["host"],
+        port=db_config["port"],
+    ) as connection:
+        results = load(connection, data, args.chains, args.environment, args.chunk_rows)
+
+    print(results.to_string(index=False))
+    print(f"Total: {results['rows'].sum()} rows in {results['seconds'].sum():.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
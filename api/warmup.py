@@ -0,0 +1,85 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupScheduler:
+    """
+    Periodically re-run registered data fetches to keep caches warm.
+
+    Each job is a function and a callable returning its keyword arguments,
+    evaluated at run time so rolling date ranges stay current. Jobs run once
+    when the scheduler starts and then every `interval` seconds, in a daemon
+    thread, so the first visitor after a restart or expiry finds hot caches.
+    """
+
+    def __init__(self, interval: float = 1500):
+        """
+        Args:
+            interval (float): Seconds between warmup runs. Should be shorter
+                than the cache ttl so entries are refreshed before they expire.
+        """
+        self.interval = interval
+        self.jobs: List[Dict] = []
+        self.stats = {"runs": 0, "jobs": 0, "errors": 0, "last_run_seconds": None}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(
+        self,
+        fn: Callable,
+        params: Optional[Callable[[], Dict]] = None,
+        name: Optional[str] = None,
+    ):
+        """
+        Register a function to warm.
+
+        Args:
+            fn (callable): The function to call, such as a dashboard `fetch_data`
+            params (callable, optional): Returns the keyword arguments for `fn`
+            name (str, optional): Name of the job. Defaults to the function name.
+        """
+        self.jobs.append(
+            {
+                "name": name or f"{fn.__module__}.{fn.__qualname__}",
+                "fn": fn,
+                "params": params or dict,
+            }
+        )
+
+    def run_once(self):
+        """Run every registered job once. Errors are counted and do not stop the run."""
+        start = time.perf_counter()
+        for job in self.jobs:
+            if self._stop.is_set():
+                break
+            try:
+                job["fn"](**job["params"]())
+                self.stats["jobs"] += 1
+            except Exception:
+                self.stats["errors"] += 1
+                logger.warning(f"Warmup of {job['name']} failed", exc_info=True)
+        self.stats["runs"] += 1
+        self.stats["last_run_seconds"] = time.perf_counter() - start
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start warming in a background thread, if it is not already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread after the current job."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
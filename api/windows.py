@@ -0,0 +1,136 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple, Union
+
+# seconds to cache the open (current) bucket of a window
+OPEN_WINDOW_TTL = 300
+
+# seconds to cache a closed calendar month, whose key every later window reuses
+CLOSED_WINDOW_TTL = 30 * 24 * 3600
+
+# seconds to cache a closed window covering part of a month, whose key changes
+# as the window start or the open bucket moves
+PARTIAL_WINDOW_TTL = 24 * 3600
+
+# time after a bucket ends before it is considered closed, for late-arriving rows
+WINDOW_GRACE = timedelta(hours=2)
+
+MONTHLY_RESOLUTIONS = ["monthly", "month"]
+HOURLY_RESOLUTIONS = ["hourly", "hour"]
+
+
+def to_date(value: Union[date, datetime, str]) -> date:
+    """Convert a date, datetime or ISO string to a date."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.date() if isinstance(value, datetime) else value
+
+
+def day_range(
+    start_date: Union[date, datetime, str], end_date: Union[date, datetime, str]
+) -> Dict[str, datetime]:
+    """
+    Return half-open [start_date, end_date) bounds covering whole days.
+
+    Filtering the raw timestamp with `ts >= :start_date AND ts < :end_date`
+    selects the same rows as `DATE(ts) BETWEEN` the two days, but lets postgres
+    use an index on `ts`. Datetime starts are kept as they are, so incremental
+    fetches can start mid-day.
+
+    Returns:
+        dict: Bind values for 'start_date' and 'end_date'
+    """
+    if isinstance(start_date, str):
+        start_date = datetime.fromisoformat(start_date)
+    if not isinstance(start_date, datetime):
+        start_date = datetime.combine(start_date, datetime.min.time())
+    end = datetime.combine(to_date(end_date) + timedelta(days=1), datetime.min.time())
+    return {"start_date": start_date, "end_date": end}
+
+
+def floor_datetime(value: datetime, resolution: str = "daily") -> datetime:
+    """Floor a datetime to the start of its hour, day or month bucket."""
+    if resolution in HOURLY_RESOLUTIONS:
+        return value.replace(minute=0, second=0, microsecond=0)
+    elif resolution in MONTHLY_RESOLUTIONS:
+        return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    else:
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def bucket_start(value: date, resolution: str = "daily") -> date:
+    """
+    Return the first day of the bucket containing a date.
+
+    Queries filter on whole days, so hourly and daily resolutions both bucket by day.
+    """
+    return value.replace(day=1) if resolution in MONTHLY_RESOLUTIONS else value
+
+
+def align_window(
+    start_date: Union[date, datetime, str],
+    end_date: Union[date, datetime, str],
+    resolution: str = "daily",
+    now: Optional[datetime] = None,
+) -> Tuple[date, date]:
+    """
+    Align a window to bucket boundaries, so equivalent windows produce the same query.
+
+    End days in the future hold no rows yet, so they are clamped to the
+    current day and windows ending tomorrow share the keys of those ending today.
+
+    Returns:
+        tuple: The first day of the start bucket and the (inclusive) end day
+    """
+    today = (now or datetime.now(timezone.utc)).date()
+    return (
+        bucket_start(to_date(start_date), resolution),
+        min(to_date(end_date), today),
+    )
+
+
+def next_month(value: date) -> date:
+    """Return the first day of the month after a date."""
+    return (value.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def split_window(
+    start_date: date,
+    end_date: date,
+    resolution: str = "daily",
+    now: Optional[datetime] = None,
+) -> List[Tuple[date, date, float]]:
+    """
+    Split an aligned window into closed calendar months and its open bucket.
+
+    Closed buckets ended at least WINDOW_GRACE ago and will not change. They
+    are grouped by calendar month, so the keys of whole months are the same
+    for every window covering them and are cached for CLOSED_WINDOW_TTL.
+    Closed parts of a month, at the start of the window or before the open
+    bucket, are cached for PARTIAL_WINDOW_TTL. The open bucket still receives
+    rows and is only cached for OPEN_WINDOW_TTL.
+
+    Returns:
+        list: (start_date, end_date, ttl) tuples with inclusive end days
+    """
+    now = now or datetime.now(timezone.utc)
+    open_start = bucket_start((now - WINDOW_GRACE).date(), resolution)
+    closed_end = min(end_date, open_start - timedelta(days=1))
+
+    windows = []
+    month = start_date.replace(day=1)
+    while month <= closed_end:
+        month_end = next_month(month) - timedelta(days=1)
+        window_start = max(start_date, month)
+        window_end = min(closed_end, month_end)
+        whole = window_start == month and window_end == month_end
+        windows.append(
+            (
+                window_start,
+                window_end,
+                CLOSED_WINDOW_TTL if whole else PARTIAL_WINDOW_TTL,
+            )
+        )
+        month = next_month(month)
+    if end_date >= open_start:
+        windows.append((max(start_date, open_start), end_date, OPEN_WINDOW_TTL))
+    return windows
@@ -1,6 +1,9 @@
 import streamlit as st
 from dashboards.utils.display import sidebar_logo, sidebar_icon
 from api.internal_api import SynthetixAPI, get_db_config
+from api.cache import get_result_cache
+from dashboards.utils.warmup import set_api
+from dashboards.all_metrics.warmup import get_scheduler
 
 st.set_page_config(
     page_title="Synthetix Stats - All",
@@ -22,10 +25,25 @@ st.markdown(hide_footer, unsafe_allow_html=True)
 @st.cache_resource
 def load_api():
     DB_ENV = st.secrets.database.DB_ENV
-    return SynthetixAPI(db_config=get_db_config(streamlit=True), environment=DB_ENV)
+    api = SynthetixAPI(
+        db_config=get_db_config(streamlit=True),
+        environment=DB_ENV,
+        cache=get_result_cache(),
+    )
+    set_api(api)
+    return api
+
+
+# keep the default view of every page warm, once per process
+@st.cache_resource
+def start_warmup():
+    scheduler = get_scheduler()
+    scheduler.start()
+    return scheduler
 
 
 st.session_state.api = load_api()
+start_warmup()
 
 # pages
 all_chains = st.Page("views/all_chains.py", title="Synthetix V3")
@@ -4,6 +4,8 @@ import streamlit as st
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_lines, chart_many_bars
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
 
 
 @st.cache_data(ttl="30m")
@@ -19,7 +21,7 @@ def fetch_data(start_date, end_date, resolution):
     Returns:
         dict: A dictionary containing fetched dataframes.
     """
-    api = st.session_state.api
+    api = get_api()
 
     df_integrator_stats_agg = api._run_query(
         f"""
@@ -36,10 +38,11 @@ def fetch_data(start_date, end_date, resolution):
             cumulative_exchange_fees,
             cumulative_volume,
             cumulative_trades
-        FROM {api.environment}_optimism_mainnet.fct_v2_integrator_{resolution}_optimism_mainnet
-        WHERE ts >= '{start_date}' AND ts <= '{end_date}'
+        FROM {api.table("optimism_mainnet", "fct_v2_integrator", resolution)}
+        WHERE ts >= :start_date AND ts <= :end_date
         ORDER BY ts
-        """
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     return {
@@ -47,7 +50,7 @@ def fetch_data(start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data):
     """
     Creates charts based on the fetched data.
@@ -197,18 +200,18 @@ def main():
     col1, col2 = st.columns(2)
 
     with col1:
-        st.plotly_chart(charts["volume"], use_container_width=True)
-        st.plotly_chart(charts["exchange_fees"], use_container_width=True)
-        st.plotly_chart(charts["trades"], use_container_width=True)
-        st.plotly_chart(charts["traders"], use_container_width=True)
-        st.plotly_chart(charts["cumulative_volume"], use_container_width=True)
+        plotly_chart(charts["volume"], use_container_width=True)
+        plotly_chart(charts["exchange_fees"], use_container_width=True)
+        plotly_chart(charts["trades"], use_container_width=True)
+        plotly_chart(charts["traders"], use_container_width=True)
+        plotly_chart(charts["cumulative_volume"], use_container_width=True)
 
     with col2:
-        st.plotly_chart(charts["volume_pct"], use_container_width=True)
-        st.plotly_chart(charts["exchange_fees_pct"], use_container_width=True)
-        st.plotly_chart(charts["trades_pct"], use_container_width=True)
-        st.plotly_chart(charts["cumulative_exchange_fees"], use_container_width=True)
-        st.plotly_chart(charts["cumulative_trades"], use_container_width=True)
+        plotly_chart(charts["volume_pct"], use_container_width=True)
+        plotly_chart(charts["exchange_fees_pct"], use_container_width=True)
+        plotly_chart(charts["trades_pct"], use_container_width=True)
+        plotly_chart(charts["cumulative_exchange_fees"], use_container_width=True)
+        plotly_chart(charts["cumulative_trades"], use_container_width=True)
 
     # Export data section
     exports = [{"title": export, "df": data[export]} for export in data.keys()]
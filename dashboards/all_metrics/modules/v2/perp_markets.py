@@ -4,6 +4,8 @@ import streamlit as st
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_bars, chart_lines, chart_oi
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
 
 
 @st.cache_data(ttl="30m")
@@ -21,7 +23,7 @@ def fetch_data(chain, market, start_date, end_date, resolution):
     Returns:
         dict: A dictionary containing fetched dataframes.
     """
-    api = st.session_state.api
+    api = get_api()
 
     # Query for market stats aggregated data
     df_market_stats_agg = api._run_query(
@@ -40,12 +42,13 @@ def fetch_data(chain, market, start_date, end_date, resolution):
             long_oi_usd,
             short_oi_usd,
             total_oi_usd            
-        FROM {api.environment}_{chain}.fct_v2_market_{resolution}_{chain}
+        FROM {api.table(chain, "fct_v2_market", resolution)}
         WHERE
-            ts >= '{start_date}'
-            AND ts <= '{end_date}'
+            ts >= :start_date
+            AND ts <= :end_date
         ORDER BY ts
-        """
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     # Query for market stats data
@@ -58,12 +61,13 @@ def fetch_data(chain, market, start_date, end_date, resolution):
             funding_rate,
             long_oi_pct,
             short_oi_pct
-        FROM {api.environment}_{chain}.fct_v2_market_stats_{chain}
+        FROM {api.table(chain, "fct_v2_market_stats")}
         WHERE
-            ts >= '{start_date}'
-            AND ts <= '{end_date}'
+            ts >= :start_date
+            AND ts <= :end_date
         ORDER BY ts
-        """
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     return {
@@ -72,7 +76,7 @@ def fetch_data(chain, market, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data, market):
     """
     Creates charts based on the fetched data.
@@ -223,18 +227,18 @@ def main():
     col1, col2 = st.columns(2)
 
     with col1:
-        st.plotly_chart(charts["daily_volume"], use_container_width=True)
-        st.plotly_chart(charts["oi_usd"], use_container_width=True)
-        st.plotly_chart(charts["skew"], use_container_width=True)
-        st.plotly_chart(charts["daily_liquidation"], use_container_width=True)
-        st.plotly_chart(charts["cumulative_volume"], use_container_width=True)
+        plotly_chart(charts["daily_volume"], use_container_width=True)
+        plotly_chart(charts["oi_usd"], use_container_width=True)
+        plotly_chart(charts["skew"], use_container_width=True)
+        plotly_chart(charts["daily_liquidation"], use_container_width=True)
+        plotly_chart(charts["cumulative_volume"], use_container_width=True)
 
     with col2:
-        st.plotly_chart(charts["daily_fees"], use_container_width=True)
-        st.plotly_chart(charts["funding_rate"], use_container_width=True)
-        st.plotly_chart(charts["oi_pct"], use_container_width=True)
-        st.plotly_chart(charts["cumulative_liquidation"], use_container_width=True)
-        st.plotly_chart(charts["cumulative_fees"], use_container_width=True)
+        plotly_chart(charts["daily_fees"], use_container_width=True)
+        plotly_chart(charts["funding_rate"], use_container_width=True)
+        plotly_chart(charts["oi_pct"], use_container_width=True)
+        plotly_chart(charts["cumulative_liquidation"], use_container_width=True)
+        plotly_chart(charts["cumulative_fees"], use_container_width=True)
 
     # Export data section
     exports = [{"title": export, "df": data[export]} for export in data.keys()]
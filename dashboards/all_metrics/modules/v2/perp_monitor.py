@@ -4,6 +4,8 @@ import streamlit as st
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_many_bars
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
 
 
 @st.cache_data(ttl="30m")
@@ -20,7 +22,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     Returns:
         dict: A dictionary containing fetched dataframes.
     """
-    api = st.session_state.api
+    api = get_api()
 
     df_market_stats_agg = api._run_query(
         f"""
@@ -40,11 +42,12 @@ def fetch_data(chain, start_date, end_date, resolution):
             long_oi_usd,
             short_oi_usd,
             total_oi_usd
-        FROM {api.environment}_{chain}.fct_v2_market_{resolution}_{chain}
-        WHERE ts >= '{start_date}'
-            AND ts <= '{end_date}'
+        FROM {api.table(chain, "fct_v2_market", resolution)}
+        WHERE ts >= :start_date
+            AND ts <= :end_date
         ORDER BY ts
-        """
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     return {
@@ -52,7 +55,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data):
     """
     Creates charts based on the fetched data.
@@ -167,14 +170,14 @@ def main():
     col1, col2 = st.columns(2)
 
     with col1:
-        st.plotly_chart(charts["volume"], use_container_width=True)
-        st.plotly_chart(charts["exchange_fees"], use_container_width=True)
-        st.plotly_chart(charts["trades"], use_container_width=True)
+        plotly_chart(charts["volume"], use_container_width=True)
+        plotly_chart(charts["exchange_fees"], use_container_width=True)
+        plotly_chart(charts["trades"], use_container_width=True)
 
     with col2:
-        st.plotly_chart(charts["amount_liquidated"], use_container_width=True)
-        st.plotly_chart(charts["liquidation_fees"], use_container_width=True)
-        st.plotly_chart(charts["liquidations"], use_container_width=True)
+        plotly_chart(charts["amount_liquidated"], use_container_width=True)
+        plotly_chart(charts["liquidation_fees"], use_container_width=True)
+        plotly_chart(charts["liquidations"], use_container_width=True)
 
     # Export data section
     exports = [{"title": export, "df": data[export]} for export in data.keys()]
@@ -4,6 +4,8 @@ import streamlit as st
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_bars, chart_lines
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
 
 
 @st.cache_data(ttl="30m")
@@ -20,7 +22,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     Returns:
         dict: A dictionary containing fetched dataframes.
     """
-    api = st.session_state.api
+    api = get_api()
 
     df_market_stats_agg = api._run_query(
         f"""
@@ -41,10 +43,11 @@ def fetch_data(chain, start_date, end_date, resolution):
             total_oi_usd,
             eth_btc_oi_usd,
             alt_oi_usd
-        FROM {api.environment}_{chain}.fct_v2_stats_{resolution}_{chain}
-        WHERE ts >= '{start_date}' AND ts <= '{end_date}'
+        FROM {api.table(chain, "fct_v2_stats", resolution)}
+        WHERE ts >= :start_date AND ts <= :end_date
         ORDER BY ts
-        """
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     return {
@@ -52,7 +55,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data, resolution):
     """
     Creates charts based on the fetched data.
@@ -174,15 +177,15 @@ def main():
     col1, col2 = st.columns(2)
 
     with col1:
-        st.plotly_chart(charts["daily_volume"], use_container_width=True)
-        st.plotly_chart(charts["oi_usd"], use_container_width=True)
-        st.plotly_chart(charts["cumulative_volume"], use_container_width=True)
-        st.plotly_chart(charts["cumulative_liquidation"], use_container_width=True)
+        plotly_chart(charts["daily_volume"], use_container_width=True)
+        plotly_chart(charts["oi_usd"], use_container_width=True)
+        plotly_chart(charts["cumulative_volume"], use_container_width=True)
+        plotly_chart(charts["cumulative_liquidation"], use_container_width=True)
 
     with col2:
-        st.plotly_chart(charts["daily_fees"], use_container_width=True)
-        st.plotly_chart(charts["daily_liquidation"], use_container_width=True)
-        st.plotly_chart(charts["cumulative_fees"], use_container_width=True)
+        plotly_chart(charts["daily_fees"], use_container_width=True)
+        plotly_chart(charts["daily_liquidation"], use_container_width=True)
+        plotly_chart(charts["cumulative_fees"], use_container_width=True)
 
     # Export data section
     exports = [{"title": export, "df": data[export]} for export in data.keys()]
@@ -4,11 +4,13 @@ import streamlit as st
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_area, chart_lines
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
 
 
 @st.cache_data(ttl="30m")
 def fetch_data(start_date, end_date, resolution):
-    api = st.session_state.api
+    api = get_api()
 
     df_collateral = api._run_query(
         f"""
@@ -26,9 +28,9 @@ def fetch_data(start_date, end_date, resolution):
             apr_{resolution} + apr_{resolution}_underlying as apr,
             apr_{resolution}_pnl as apr_pnl,
             apr_{resolution}_rewards as apr_rewards
-        FROM {api.environment}_arbitrum_mainnet.fct_core_apr_arbitrum_mainnet apr
-        LEFT JOIN {api.environment}_seeds.arbitrum_mainnet_tokens tk on lower(apr.collateral_type) = lower(tk.token_address)
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
+        FROM {api.table("arbitrum_mainnet", "fct_core_apr")} apr
+        LEFT JOIN {api.tokens_table("arbitrum_mainnet")} tk on lower(apr.collateral_type) = lower(tk.token_address)
+        WHERE ts >= :start_date and ts <= :end_date
             and tk.token_symbol is not null
         
         UNION ALL
@@ -47,9 +49,9 @@ def fetch_data(start_date, end_date, resolution):
             apr_{resolution} + apr_{resolution}_underlying as apr,
             apr_{resolution}_pnl as apr_pnl,
             apr_{resolution}_rewards as apr_rewards
-        FROM {api.environment}_base_mainnet.fct_core_apr_base_mainnet apr
-        LEFT JOIN {api.environment}_seeds.base_mainnet_tokens tk on lower(apr.collateral_type) = lower(tk.token_address)
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
+        FROM {api.table("base_mainnet", "fct_core_apr")} apr
+        LEFT JOIN {api.tokens_table("base_mainnet")} tk on lower(apr.collateral_type) = lower(tk.token_address)
+        WHERE ts >= :start_date and ts <= :end_date
 
         UNION ALL
         
@@ -67,12 +69,13 @@ def fetch_data(start_date, end_date, resolution):
             apr_{resolution} + apr_{resolution}_underlying as apr,
             apr_{resolution}_pnl as apr_pnl,
             apr_{resolution}_rewards as apr_rewards
-        FROM {api.environment}_eth_mainnet.fct_core_apr_eth_mainnet apr
-        LEFT JOIN {api.environment}_seeds.eth_mainnet_tokens tk on lower(apr.collateral_type) = lower(tk.token_address)
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
+        FROM {api.table("eth_mainnet", "fct_core_apr")} apr
+        LEFT JOIN {api.tokens_table("eth_mainnet")} tk on lower(apr.collateral_type) = lower(tk.token_address)
+        WHERE ts >= :start_date and ts <= :end_date
         
         ORDER BY ts
-    """
+    """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     df_chain = api._run_query(
@@ -90,9 +93,9 @@ def fetch_data(start_date, end_date, resolution):
                 collateral_value,
                 cumulative_pnl,
                 cumulative_rewards
-            FROM {api.environment}_arbitrum_mainnet.fct_core_apr_arbitrum_mainnet apr
-            LEFT JOIN {api.environment}_seeds.arbitrum_mainnet_tokens tk on lower(apr.collateral_type) = lower(tk.token_address)
-            WHERE ts >= '{start_date}' and ts <= '{end_date}'
+            FROM {api.table("arbitrum_mainnet", "fct_core_apr")} apr
+            LEFT JOIN {api.tokens_table("arbitrum_mainnet")} tk on lower(apr.collateral_type) = lower(tk.token_address)
+            WHERE ts >= :start_date and ts <= :end_date
         ) as a
         group by ts, label
         ),
@@ -109,9 +112,9 @@ def fetch_data(start_date, end_date, resolution):
                 collateral_value,
                 cumulative_pnl,
                 cumulative_rewards
-            FROM {api.environment}_base_mainnet.fct_core_apr_base_mainnet apr
-            LEFT JOIN {api.environment}_seeds.base_mainnet_tokens tk on lower(apr.collateral_type) = lower(tk.token_address)
-            WHERE ts >= '{start_date}' and ts <= '{end_date}'
+            FROM {api.table("base_mainnet", "fct_core_apr")} apr
+            LEFT JOIN {api.tokens_table("base_mainnet")} tk on lower(apr.collateral_type) = lower(tk.token_address)
+            WHERE ts >= :start_date and ts <= :end_date
         ) as b
         group by ts, label
         ),
@@ -128,9 +131,9 @@ def fetch_data(start_date, end_date, resolution):
                 collateral_value,
                 cumulative_pnl,
                 cumulative_rewards
-            FROM {api.environment}_eth_mainnet.fct_core_apr_eth_mainnet apr
-            LEFT JOIN {api.environment}_seeds.eth_mainnet_tokens tk on lower(apr.collateral_type) = lower(tk.token_address)
-            WHERE ts >= '{start_date}' and ts <= '{end_date}'
+            FROM {api.table("eth_mainnet", "fct_core_apr")} apr
+            LEFT JOIN {api.tokens_table("eth_mainnet")} tk on lower(apr.collateral_type) = lower(tk.token_address)
+            WHERE ts >= :start_date and ts <= :end_date
         ) as b
         group by ts, label
         )
@@ -141,7 +144,8 @@ def fetch_data(start_date, end_date, resolution):
         union all
         select * from base
         ORDER BY ts
-    """
+    """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     return {
@@ -150,7 +154,7 @@ def fetch_data(start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data):
     return {
         "tvl_collateral": chart_area(
@@ -221,7 +225,7 @@ def main():
             )
 
         with filt_col2:
-            end_date = datetime.today().date() + timedelta(days=1)
+            end_date = datetime.today().date()
             st.date_input(
                 "End",
                 key="end_date",
@@ -239,16 +243,16 @@ def main():
     charts = make_charts(data)
 
     ## display
-    st.plotly_chart(charts["apr"], use_container_width=True)
+    plotly_chart(charts["apr"], use_container_width=True)
 
     col1, col2 = st.columns(2)
     with col1:
-        st.plotly_chart(charts["tvl_chain"], use_container_width=True)
-        st.plotly_chart(charts["tvl_collateral"], use_container_width=True)
+        plotly_chart(charts["tvl_chain"], use_container_width=True)
+        plotly_chart(charts["tvl_collateral"], use_container_width=True)
 
     with col2:
-        st.plotly_chart(charts["pnl_chain"], use_container_width=True)
-        st.plotly_chart(charts["pnl_collateral"], use_container_width=True)
+        plotly_chart(charts["pnl_chain"], use_container_width=True)
+        plotly_chart(charts["pnl_collateral"], use_container_width=True)
 
     ## export
     exports = [{"title": export, "df": data[export]} for export in data.keys()]
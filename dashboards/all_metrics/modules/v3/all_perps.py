@@ -4,11 +4,13 @@ import streamlit as st
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_bars
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
 
 
 @st.cache_data(ttl="30m")
 def fetch_data(start_date, end_date, resolution):
-    api = st.session_state.api
+    api = get_api()
 
     df_stats = api._run_query(
         f"""
@@ -20,8 +22,8 @@ def fetch_data(start_date, end_date, resolution):
                 trades,
                 exchange_fees AS fees,
                 liquidated_accounts AS liquidations
-            FROM {api.environment}_base_mainnet.fct_perp_stats_{resolution}_base_mainnet
-            WHERE ts >= '{start_date}' AND ts <= '{end_date}'
+            FROM {api.table("base_mainnet", "fct_perp_stats", resolution)}
+            WHERE ts >= :start_date AND ts <= :end_date
         ),
         optimism AS (
             SELECT
@@ -31,8 +33,8 @@ def fetch_data(start_date, end_date, resolution):
                 trades,
                 exchange_fees + liquidation_fees AS fees,
                 liquidations
-            FROM {api.environment}_optimism_mainnet.fct_v2_stats_{resolution}_optimism_mainnet
-            WHERE ts >= '{start_date}' AND ts <= '{end_date}'
+            FROM {api.table("optimism_mainnet", "fct_v2_stats", resolution)}
+            WHERE ts >= :start_date AND ts <= :end_date
         ),
         arbitrum AS (
             SELECT
@@ -42,8 +44,8 @@ def fetch_data(start_date, end_date, resolution):
                 trades,
                 exchange_fees AS fees,
                 liquidated_accounts AS liquidations
-            FROM {api.environment}_arbitrum_mainnet.fct_perp_stats_{resolution}_arbitrum_mainnet
-            WHERE ts >= '{start_date}' AND ts <= '{end_date}'
+            FROM {api.table("arbitrum_mainnet", "fct_perp_stats", resolution)}
+            WHERE ts >= :start_date AND ts <= :end_date
         )
         SELECT * FROM base
         UNION ALL
@@ -51,7 +53,8 @@ def fetch_data(start_date, end_date, resolution):
         UNION ALL
         SELECT * FROM arbitrum
         ORDER BY ts
-        """
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     return {
@@ -59,7 +62,7 @@ def fetch_data(start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data):
     return {
         "volume": chart_bars(
@@ -119,7 +122,7 @@ def main():
             )
 
         with filt_col2:
-            end_date_default = datetime.today().date() + timedelta(days=1)
+            end_date_default = datetime.today().date()
             st.date_input(
                 "End",
                 key="end_date",
@@ -140,12 +143,12 @@ def main():
     col1, col2 = st.columns(2)
 
     with col1:
-        st.plotly_chart(charts["volume"], use_container_width=True)
-        st.plotly_chart(charts["trades"], use_container_width=True)
+        plotly_chart(charts["volume"], use_container_width=True)
+        plotly_chart(charts["trades"], use_container_width=True)
 
     with col2:
-        st.plotly_chart(charts["fees"], use_container_width=True)
-        st.plotly_chart(charts["liquidations"], use_container_width=True)
+        plotly_chart(charts["fees"], use_container_width=True)
+        plotly_chart(charts["liquidations"], use_container_width=True)
 
     ## Export
     exports = [{"title": key, "df": data[key]} for key in data]
@@ -4,6 +4,8 @@ import streamlit as st
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_bars, chart_lines
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
 
 
 @st.cache_data(ttl="30m")
@@ -19,16 +21,17 @@ def fetch_data(chain, start_date, end_date, resolution):
     Returns:
         dict: A dictionary containing fetched dataframes.
     """
-    api = st.session_state.api
+    api = get_api()
 
     # Query for account delegation data
     df_account_delegation = api._run_query(
         f"""
         SELECT 
             *
-        FROM {api.environment}_{chain}.fct_core_account_delegation_{chain}
-        WHERE ts >= '{start_date}' AND ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_core_account_delegation")}
+        WHERE ts >= :start_date AND ts <= :end_date
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     # Query for APR data
@@ -53,14 +56,15 @@ def fetch_data(chain, start_date, end_date, resolution):
             apr_{resolution}_underlying as apr_underlying,
             apr_{resolution}_pnl AS apr_pnl,
             apr_{resolution}_rewards AS apr_rewards
-        FROM {api.environment}_{chain}.fct_core_apr_{chain} apr
-        LEFT JOIN {api.environment}_seeds.{chain}_tokens tk 
+        FROM {api.table(chain, "fct_core_apr")} apr
+        LEFT JOIN {api.tokens_table(chain)} tk 
             ON LOWER(apr.collateral_type) = LOWER(tk.token_address)
-        WHERE ts >= '{start_date}' AND ts <= '{end_date}'
+        WHERE ts >= :start_date AND ts <= :end_date
             AND pool_id = 1
             and tk.token_symbol is not null
         ORDER BY ts
-        """
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     # Query for APR token data
@@ -74,14 +78,15 @@ def fetch_data(chain, start_date, end_date, resolution):
             collateral_value,
             rewards_usd,
             apr_{resolution}_rewards AS apr_rewards
-        FROM {api.environment}_{chain}.fct_core_apr_rewards_{chain} apr
-        LEFT JOIN {api.environment}_seeds.{chain}_tokens tk 
+        FROM {api.table(chain, "fct_core_apr_rewards")} apr
+        LEFT JOIN {api.tokens_table(chain)} tk 
             ON LOWER(apr.collateral_type) = LOWER(tk.token_address)
-        WHERE ts >= '{start_date}' AND ts <= '{end_date}'
+        WHERE ts >= :start_date AND ts <= :end_date
             AND pool_id = 1
             AND apr.reward_token IS NOT NULL
         ORDER BY ts
-        """
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
     return {
         "account_delegation": df_account_delegation,
@@ -90,7 +95,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data, resolution):
     """
     Creates charts based on the fetched data.
@@ -226,7 +231,7 @@ def main():
     if "start_date" not in st.session_state:
         st.session_state.start_date = datetime.today().date() - timedelta(days=14)
     if "end_date" not in st.session_state:
-        st.session_state.end_date = datetime.today().date() + timedelta(days=1)
+        st.session_state.end_date = datetime.today().date()
 
     # Filters section
     with st.expander("Filters"):
@@ -273,28 +278,28 @@ def main():
     )
 
     # Display the APR chart
-    st.plotly_chart(charts["apr"], use_container_width=True)
+    plotly_chart(charts["apr"], use_container_width=True)
 
     # Create two columns for displaying multiple charts
     col1, col2 = st.columns(2)
 
     with col1:
-        st.plotly_chart(charts["tvl"], use_container_width=True)
-        st.plotly_chart(charts["hourly_pnl"], use_container_width=True)
-        st.plotly_chart(charts["hourly_performance"], use_container_width=True)
-        st.plotly_chart(charts["hourly_issuance"], use_container_width=True)
+        plotly_chart(charts["tvl"], use_container_width=True)
+        plotly_chart(charts["hourly_pnl"], use_container_width=True)
+        plotly_chart(charts["hourly_performance"], use_container_width=True)
+        plotly_chart(charts["hourly_issuance"], use_container_width=True)
 
     with col2:
-        st.plotly_chart(charts["debt"], use_container_width=True)
-        st.plotly_chart(charts["pnl"], use_container_width=True)
-        st.plotly_chart(charts["performance"], use_container_width=True)
-        st.plotly_chart(charts["issuance"], use_container_width=True)
+        plotly_chart(charts["debt"], use_container_width=True)
+        plotly_chart(charts["pnl"], use_container_width=True)
+        plotly_chart(charts["performance"], use_container_width=True)
+        plotly_chart(charts["issuance"], use_container_width=True)
 
     # make these charts full width
-    st.plotly_chart(charts["hourly_rewards"], use_container_width=True)
-    st.plotly_chart(charts["apr_token"], use_container_width=True)
-    st.plotly_chart(charts["hourly_rewards_token"], use_container_width=True)
-    st.plotly_chart(charts["apr_underlying"], use_container_width=True)
+    plotly_chart(charts["hourly_rewards"], use_container_width=True)
+    plotly_chart(charts["apr_token"], use_container_width=True)
+    plotly_chart(charts["hourly_rewards_token"], use_container_width=True)
+    plotly_chart(charts["apr_underlying"], use_container_width=True)
 
     # Display Top Delegators table
     st.markdown("## Top Delegators")
@@ -5,6 +5,9 @@ import pandas as pd
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_lines
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
+from api.windows import day_range
 
 
 @st.cache_data(ttl="30m")
@@ -21,14 +24,16 @@ def fetch_data(chain, account_id, start_date, end_date):
     Returns:
         dict: A dictionary containing fetched dataframes.
     """
-    api = st.session_state.api
+    api = get_api()
+    # bound as text, which postgres casts to the type of the account_id column
+    account_id = str(account_id) if account_id is not None else None
 
     # Query for accounts
     df_accounts = api._run_query(
         f"""
-        SELECT DISTINCT account_id, sender as owner FROM {api.environment}_{chain}.fct_perp_orders_{chain}
+        SELECT DISTINCT account_id, sender as owner FROM {api.table(chain, "fct_perp_orders")}
         UNION ALL
-        SELECT DISTINCT CAST(account_id as TEXT) as account_id, owner from {api.environment}_raw_{chain}.perp_account_created_{chain}
+        SELECT DISTINCT CAST(account_id as TEXT) as account_id, owner from {api.table(chain, "perp_account_created", layer="raw")}
         """
     )
 
@@ -41,10 +46,11 @@ def fetch_data(chain, account_id, start_date, end_date):
             market_id,
             acceptable_price,
             commitment_time
-        FROM {api.environment}_{chain}.fct_perp_previous_order_expired_{chain}
-        WHERE account_id = {account_id if account_id else 'NULL'}
-            AND DATE(block_timestamp) >= '{start_date}' AND DATE(block_timestamp) <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_perp_previous_order_expired")}
+        WHERE account_id = :account_id
+            AND block_timestamp >= :start_date AND block_timestamp < :end_date
+        """,
+        params={**day_range(start_date, end_date), "account_id": account_id},
     )
 
     # Query for trades
@@ -64,10 +70,15 @@ def fetch_data(chain, account_id, start_date, end_date):
             accrued_funding,
             tracking_code,
             transaction_hash
-        FROM {api.environment}_{chain}.fct_perp_trades_{chain}
-        WHERE account_id = '{account_id}'
-            AND ts >= '{start_date}' AND ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_perp_trades")}
+        WHERE account_id = :account_id
+            AND ts >= :start_date AND ts <= :end_date
+        """,
+        params={
+            "account_id": account_id,
+            "start_date": start_date,
+            "end_date": end_date,
+        },
     )
 
     # Query for transfers
@@ -78,10 +89,11 @@ def fetch_data(chain, account_id, start_date, end_date):
             CAST(account_id AS TEXT) AS account_id,
             synth_symbol,
             amount_delta
-        FROM {api.environment}_{chain}.fct_perp_collateral_modified_{chain}
-        WHERE account_id = {account_id if account_id else 'NULL'}
-            AND DATE(block_timestamp) >= '{start_date}' AND DATE(block_timestamp) <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_perp_collateral_modified")}
+        WHERE account_id = :account_id
+            AND block_timestamp >= :start_date AND block_timestamp < :end_date
+        """,
+        params={**day_range(start_date, end_date), "account_id": account_id},
     )
 
     # Query for interest
@@ -92,10 +104,11 @@ def fetch_data(chain, account_id, start_date, end_date):
             transaction_hash,
             CAST(account_id AS TEXT) AS account_id,
             interest
-        FROM {api.environment}_{chain}.fct_perp_interest_charged_{chain}
-        WHERE account_id = {account_id if account_id else 'NULL'}
-            AND DATE(block_timestamp) >= '{start_date}' AND DATE(block_timestamp) <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_perp_interest_charged")}
+        WHERE account_id = :account_id
+            AND block_timestamp >= :start_date AND block_timestamp < :end_date
+        """,
+        params={**day_range(start_date, end_date), "account_id": account_id},
     )
 
     # Query for account liquidations
@@ -105,10 +118,15 @@ def fetch_data(chain, account_id, start_date, end_date):
             ts,
             account_id,
             total_reward
-        FROM {api.environment}_{chain}.fct_perp_liq_account_{chain}
-        WHERE account_id = '{account_id}'
-            AND ts >= '{start_date}' AND ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_perp_liq_account")}
+        WHERE account_id = :account_id
+            AND ts >= :start_date AND ts <= :end_date
+        """,
+        params={
+            "account_id": account_id,
+            "start_date": start_date,
+            "end_date": end_date,
+        },
     )
 
     # Query for hourly data
@@ -118,11 +136,16 @@ def fetch_data(chain, account_id, start_date, end_date):
             ts,
             cumulative_volume,
             cumulative_fees
-        FROM {api.environment}_{chain}.fct_perp_account_stats_hourly_{chain}
-        WHERE account_id = '{account_id}'
-            AND ts >= '{start_date}' AND ts <= '{end_date}'
+        FROM {api.table(chain, "fct_perp_account_stats_hourly")}
+        WHERE account_id = :account_id
+            AND ts >= :start_date AND ts <= :end_date
         ORDER BY ts
-        """
+        """,
+        params={
+            "account_id": account_id,
+            "start_date": start_date,
+            "end_date": end_date,
+        },
     )
 
     # Query for collateral balances
@@ -137,13 +160,18 @@ def fetch_data(chain, account_id, start_date, end_date):
             account_balance,
             account_balance_usd,
             transaction_hash
-        FROM {api.environment}_{chain}.fct_perp_collateral_balances_{chain}
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
-            AND account_id = '{account_id}'
+        FROM {api.table(chain, "fct_perp_collateral_balances")}
+        WHERE ts >= :start_date and ts <= :end_date
+            AND account_id = :account_id
         ORDER BY ts
-        """
+        """,
+            params={
+                "start_date": start_date,
+                "end_date": end_date,
+                "account_id": account_id,
+            },
         )
-        if st.session_state.chain.startswith("arbitrum")
+        if chain.startswith("arbitrum")
         else pd.DataFrame()
     )
 
@@ -162,7 +190,7 @@ def fetch_data(chain, account_id, start_date, end_date):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data):
     collateral_chart = (
         None
@@ -203,7 +231,7 @@ def main():
     if "start_date" not in st.session_state:
         st.session_state.start_date = datetime.today().date() - timedelta(days=14)
     if "end_date" not in st.session_state:
-        st.session_state.end_date = datetime.today().date() + timedelta(days=1)
+        st.session_state.end_date = datetime.today().date()
 
     # Date filter
     with st.expander("Date Filter"):
@@ -309,14 +337,14 @@ def main():
     # Display charts
     col1, col2 = st.columns(2)
     with col1:
-        st.plotly_chart(charts["cumulative_volume"], use_container_width=True)
+        plotly_chart(charts["cumulative_volume"], use_container_width=True)
 
     with col2:
-        st.plotly_chart(charts["cumulative_fees"], use_container_width=True)
+        plotly_chart(charts["cumulative_fees"], use_container_width=True)
 
     # display collateral chart if not None
     if charts["collateral"]:
-        st.plotly_chart(charts["collateral"], use_container_width=True)
+        plotly_chart(charts["collateral"], use_container_width=True)
 
     # Display recent trades
     st.markdown("### Recent Trades")
@@ -4,6 +4,8 @@ import streamlit as st
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_bars
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
 
 
 @st.cache_data(ttl="30m")
@@ -20,7 +22,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     Returns:
         dict: A dictionary containing fetched dataframes.
     """
-    api = st.session_state.api
+    api = get_api()
 
     # Query for stats data
     df_stats = api._run_query(
@@ -40,9 +42,10 @@ def fetch_data(chain, start_date, end_date, resolution):
             exchange_fees_share,
             referral_fees,
             referral_fees_share
-        FROM {api.environment}_{chain}.fct_perp_tracking_stats_{resolution}_{chain}
-        WHERE ts >= '{start_date}' AND ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_perp_tracking_stats", resolution)}
+        WHERE ts >= :start_date AND ts <= :end_date
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     return {
@@ -50,7 +53,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data):
     """
     Creates charts based on the fetched data.
@@ -151,7 +154,7 @@ def main():
     if "start_date" not in st.session_state:
         st.session_state.start_date = datetime.today().date() - timedelta(days=14)
     if "end_date" not in st.session_state:
-        st.session_state.end_date = datetime.today().date() + timedelta(days=1)
+        st.session_state.end_date = datetime.today().date()
     if "chain" not in st.session_state:
         st.session_state.chain = (
             "base_mainnet"  # Set a default chain or retrieve dynamically
@@ -205,17 +208,17 @@ def main():
     col1, col2 = st.columns(2)
 
     with col1:
-        st.plotly_chart(charts["volume"], use_container_width=True)
-        st.plotly_chart(charts["trades"], use_container_width=True)
-        st.plotly_chart(charts["exchange_fees"], use_container_width=True)
-        st.plotly_chart(charts["referral_fees"], use_container_width=True)
-        st.plotly_chart(charts["accounts"], use_container_width=True)
+        plotly_chart(charts["volume"], use_container_width=True)
+        plotly_chart(charts["trades"], use_container_width=True)
+        plotly_chart(charts["exchange_fees"], use_container_width=True)
+        plotly_chart(charts["referral_fees"], use_container_width=True)
+        plotly_chart(charts["accounts"], use_container_width=True)
 
     with col2:
-        st.plotly_chart(charts["volume_pct"], use_container_width=True)
-        st.plotly_chart(charts["trades_pct"], use_container_width=True)
-        st.plotly_chart(charts["exchange_fees_pct"], use_container_width=True)
-        st.plotly_chart(charts["referral_fees_pct"], use_container_width=True)
+        plotly_chart(charts["volume_pct"], use_container_width=True)
+        plotly_chart(charts["trades_pct"], use_container_width=True)
+        plotly_chart(charts["exchange_fees_pct"], use_container_width=True)
+        plotly_chart(charts["referral_fees_pct"], use_container_width=True)
 
     # Export data section
     exports = [{"title": export, "df": data[export]} for export in data.keys()]
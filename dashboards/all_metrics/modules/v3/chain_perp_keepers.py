@@ -4,6 +4,8 @@ import streamlit as st
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_bars
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
 
 
 @st.cache_data(ttl="30m")
@@ -20,7 +22,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     Returns:
         dict: A dictionary containing fetched dataframes.
     """
-    api = st.session_state.api
+    api = get_api()
 
     df_keeper = api._run_query(
         f"""
@@ -34,10 +36,11 @@ def fetch_data(chain, start_date, end_date, resolution):
             amount_settled_pct,
             settlement_rewards,
             settlement_rewards_pct
-        FROM {api.environment}_{chain}.fct_perp_keeper_stats_{resolution}_{chain}
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
+        FROM {api.table(chain, "fct_perp_keeper_stats", resolution)}
+        WHERE ts >= :start_date and ts <= :end_date
         ORDER BY ts
-        """
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     return {
@@ -45,7 +48,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data):
     """
     Creates charts based on the fetched data.
@@ -130,7 +133,7 @@ def main():
     if "start_date" not in st.session_state:
         st.session_state.start_date = datetime.today().date() - timedelta(days=14)
     if "end_date" not in st.session_state:
-        st.session_state.end_date = datetime.today().date() + timedelta(days=1)
+        st.session_state.end_date = datetime.today().date()
 
     # Filters section
     with st.expander("Filters"):
@@ -176,14 +179,14 @@ def main():
     # Display charts
     col1, col2 = st.columns(2)
     with col1:
-        st.plotly_chart(charts["trades"], use_container_width=True)
-        st.plotly_chart(charts["amount_settled"], use_container_width=True)
-        st.plotly_chart(charts["settlement_rewards"], use_container_width=True)
+        plotly_chart(charts["trades"], use_container_width=True)
+        plotly_chart(charts["amount_settled"], use_container_width=True)
+        plotly_chart(charts["settlement_rewards"], use_container_width=True)
 
     with col2:
-        st.plotly_chart(charts["trades_pct"], use_container_width=True)
-        st.plotly_chart(charts["amount_settled_pct"], use_container_width=True)
-        st.plotly_chart(charts["settlement_rewards_pct"], use_container_width=True)
+        plotly_chart(charts["trades_pct"], use_container_width=True)
+        plotly_chart(charts["amount_settled_pct"], use_container_width=True)
+        plotly_chart(charts["settlement_rewards_pct"], use_container_width=True)
 
     # Export data section
     exports = [{"title": export, "df": data[export]} for export in data.keys()]
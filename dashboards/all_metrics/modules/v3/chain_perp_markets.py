@@ -4,6 +4,8 @@ import streamlit as st
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_lines, chart_bars, chart_oi
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
 
 
 @st.cache_data(ttl="30m")
@@ -19,7 +21,7 @@ def fetch_data(chain, start_date, end_date):
     Returns:
         dict: A dictionary containing fetched dataframes.
     """
-    api = st.session_state.api
+    api = get_api()
 
     # Query for market history data
     df_market_history = api._run_query(
@@ -38,10 +40,11 @@ def fetch_data(chain, start_date, end_date):
             market_oi_usd,
             short_oi_pct,
             long_oi_pct
-        FROM {api.environment}_{chain}.fct_perp_market_history_{chain}
-        WHERE ts >= '{start_date}' AND ts <= '{end_date}'
+        FROM {api.table(chain, "fct_perp_market_history")}
+        WHERE ts >= :start_date AND ts <= :end_date
         ORDER BY ts
-        """
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     # Query for market stats data
@@ -54,9 +57,10 @@ def fetch_data(chain, start_date, end_date):
             trades,
             exchange_fees,
             liquidations
-        FROM {api.environment}_{chain}.fct_perp_market_stats_daily_{chain}
-        WHERE ts >= '{start_date}' AND ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_perp_market_stats_daily")}
+        WHERE ts >= :start_date AND ts <= :end_date
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     return {
@@ -65,7 +69,7 @@ def fetch_data(chain, start_date, end_date):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data, asset):
     """
     Creates charts based on the fetched data for a specific asset.
@@ -142,7 +146,7 @@ def main():
     if "start_date" not in st.session_state:
         st.session_state.start_date = datetime.today().date() - timedelta(days=14)
     if "end_date" not in st.session_state:
-        st.session_state.end_date = datetime.today().date() + timedelta(days=1)
+        st.session_state.end_date = datetime.today().date()
 
     # Title
     st.markdown("## Perps: Market Overview")
@@ -187,20 +191,20 @@ def main():
     charts = make_charts(data, asset)
 
     # Display the price chart
-    st.plotly_chart(charts["price"], use_container_width=True)
+    plotly_chart(charts["price"], use_container_width=True)
 
     # Create two columns for displaying multiple charts
     col1, col2 = st.columns(2)
 
     with col1:
-        st.plotly_chart(charts["volume"], use_container_width=True)
-        st.plotly_chart(charts["oi"], use_container_width=True)
-        st.plotly_chart(charts["skew"], use_container_width=True)
+        plotly_chart(charts["volume"], use_container_width=True)
+        plotly_chart(charts["oi"], use_container_width=True)
+        plotly_chart(charts["skew"], use_container_width=True)
 
     with col2:
-        st.plotly_chart(charts["exchange_fees"], use_container_width=True)
-        st.plotly_chart(charts["oi_pct"], use_container_width=True)
-        st.plotly_chart(charts["rates"], use_container_width=True)
+        plotly_chart(charts["exchange_fees"], use_container_width=True)
+        plotly_chart(charts["oi_pct"], use_container_width=True)
+        plotly_chart(charts["rates"], use_container_width=True)
 
     # Export data section
     exports = [{"title": export, "df": data[export]} for export in data.keys()]
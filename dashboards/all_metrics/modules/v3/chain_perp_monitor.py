@@ -2,8 +2,15 @@ from datetime import datetime, timedelta
 
 import streamlit as st
 
-from dashboards.utils.data import export_data
+from dashboards.utils.data import export_data, stream_export
 from dashboards.utils.charts import chart_bars, chart_lines, chart_many_bars
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
+from api.streaming import aggregate_chunks, tail_chunks
+from api.windows import day_range
+
+# rows shown in the recent trades table
+RECENT_TRADES = 50
 
 
 @st.cache_data(ttl="30m")
@@ -11,6 +18,10 @@ def fetch_data(chain, start_date, end_date, resolution):
     """
     Fetches data from the database using the API based on the provided filters.
 
+    Trades and market history are streamed and reduced as they arrive, so a
+    long date range never loads every trade or skew update: only the most
+    recent trades and the last skew of every market and period are kept.
+
     Args:
         chain (str): The blockchain network to query.
         start_date (datetime.date): The start date for data retrieval.
@@ -20,7 +31,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     Returns:
         dict: A dictionary containing fetched dataframes.
     """
-    api = st.session_state.api
+    api = get_api()
 
     df_order_expired = api._run_query(
         f"""
@@ -32,30 +43,35 @@ def fetch_data(chain, start_date, end_date, resolution):
             acceptable_price,
             commitment_time,
             tracking_code
-        FROM {api.environment}_{chain}.fct_perp_previous_order_expired_{chain}
-        WHERE date(block_timestamp) >= '{start_date}' and date(block_timestamp) <= '{end_date}'
+        FROM {api.table(chain, "fct_perp_previous_order_expired")}
+        WHERE block_timestamp >= :start_date and block_timestamp < :end_date
         ORDER BY block_timestamp
-        """
+        """,
+        params=day_range(start_date, end_date),
     )
 
-    df_trade = api._run_query(
-        f"""
-        SELECT
-            ts,
-            account_id,
-            market_symbol,
-            position_size,
-            trade_size,
-            notional_trade_size,
-            fill_price,
-            total_fees,
-            accrued_funding,
-            tracking_code,
-            transaction_hash
-        FROM {api.environment}_{chain}.fct_perp_trades_{chain}
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
-        ORDER BY ts
-        """
+    df_trade = tail_chunks(
+        api.iter_query(
+            f"""
+            SELECT
+                ts,
+                account_id,
+                market_symbol,
+                position_size,
+                trade_size,
+                notional_trade_size,
+                fill_price,
+                total_fees,
+                accrued_funding,
+                tracking_code,
+                transaction_hash
+            FROM {api.table(chain, "fct_perp_trades")}
+            WHERE ts >= :start_date and ts <= :end_date
+            ORDER BY ts
+            """,
+            params={"start_date": start_date, "end_date": end_date},
+        ),
+        RECENT_TRADES,
     )
 
     df_account_liq = api._run_query(
@@ -64,23 +80,33 @@ def fetch_data(chain, start_date, end_date, resolution):
             ts,
             account_id,
             total_reward
-        FROM {api.environment}_{chain}.fct_perp_liq_account_{chain}
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
+        FROM {api.table(chain, "fct_perp_liq_account")}
+        WHERE ts >= :start_date and ts <= :end_date
         ORDER BY ts
-        """
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
-    df_skew = api._run_query(
-        f"""
-        SELECT
-            ts,
-            market_symbol,
-            skew,
-            skew * price as skew_usd
-        FROM {api.environment}_{chain}.fct_perp_market_history_{chain}
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
-        ORDER BY ts
-        """
+    df_skew = aggregate_chunks(
+        api.iter_query(
+            f"""
+            SELECT
+                DATE_TRUNC(:trunc, ts) as ts,
+                market_symbol,
+                skew,
+                skew * price as skew_usd
+            FROM {api.table(chain, "fct_perp_market_history")} AS history
+            WHERE ts >= :start_date and ts <= :end_date
+            ORDER BY history.ts
+            """,
+            params={
+                "trunc": "hour" if resolution == "hourly" else "day",
+                "start_date": start_date,
+                "end_date": end_date,
+            },
+        ),
+        by=["ts", "market_symbol"],
+        aggs={"skew": "last", "skew_usd": "last"},
     )
 
     df_market = api._run_query(
@@ -92,9 +118,10 @@ def fetch_data(chain, start_date, end_date, resolution):
             trades,
             exchange_fees,
             liquidations
-        FROM {api.environment}_{chain}.fct_perp_market_stats_{resolution}_{chain}
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_perp_market_stats", resolution)}
+        WHERE ts >= :start_date and ts <= :end_date
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     df_stats = api._run_query(
@@ -103,9 +130,10 @@ def fetch_data(chain, start_date, end_date, resolution):
             ts,
             liquidated_accounts,
             liquidation_rewards
-        FROM {api.environment}_{chain}.fct_perp_stats_{resolution}_{chain}
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_perp_stats", resolution)}
+        WHERE ts >= :start_date and ts <= :end_date
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     current_skew = (
@@ -119,7 +147,7 @@ def fetch_data(chain, start_date, end_date, resolution):
 
     return {
         "order_expired": df_order_expired,
-        "trade": df_trade,
+        "recent_trades": df_trade,
         "account_liq": df_account_liq,
         "market": df_market,
         "stats": df_stats,
@@ -128,7 +156,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data):
     """
     Creates charts based on the fetched data.
@@ -221,7 +249,7 @@ def main():
     if "start_date" not in st.session_state:
         st.session_state.start_date = datetime.today().date() - timedelta(days=14)
     if "end_date" not in st.session_state:
-        st.session_state.end_date = datetime.today().date() + timedelta(days=1)
+        st.session_state.end_date = datetime.today().date()
 
     ## inputs
     with st.expander("Filters"):
@@ -268,22 +296,22 @@ def main():
     col1, col2 = st.columns(2)
 
     with col1:
-        st.plotly_chart(charts["volume"], use_container_width=True)
-        st.plotly_chart(charts["exchange_fees"], use_container_width=True)
-        st.plotly_chart(charts["account_liquidations"], use_container_width=True)
+        plotly_chart(charts["volume"], use_container_width=True)
+        plotly_chart(charts["exchange_fees"], use_container_width=True)
+        plotly_chart(charts["account_liquidations"], use_container_width=True)
 
     with col2:
-        st.plotly_chart(charts["trades"], use_container_width=True)
-        st.plotly_chart(charts["position_liquidations"], use_container_width=True)
-        st.plotly_chart(charts["liquidation_rewards"], use_container_width=True)
+        plotly_chart(charts["trades"], use_container_width=True)
+        plotly_chart(charts["position_liquidations"], use_container_width=True)
+        plotly_chart(charts["liquidation_rewards"], use_container_width=True)
 
-    st.plotly_chart(charts["current_skew"], use_container_width=True)
-    st.plotly_chart(charts["skew"], use_container_width=True)
+    plotly_chart(charts["current_skew"], use_container_width=True)
+    plotly_chart(charts["skew"], use_container_width=True)
 
     # Recent trades
     st.markdown("### Recent Trades")
     st.dataframe(
-        data["trade"].sort_values("ts", ascending=False).head(50),
+        data["recent_trades"].sort_values("ts", ascending=False),
         use_container_width=True,
         hide_index=True,
     )
@@ -309,3 +337,15 @@ def main():
     with st.expander("Exports"):
         for export in exports:
             export_data(title=export["title"], df=export["df"])
+
+        # every trade in the date range, streamed without a preview frame
+        stream_export(
+            title="all_trades",
+            query=f"""
+            SELECT *
+            FROM {get_api().table(st.session_state.chain, "fct_perp_trades")}
+            WHERE ts >= :start_date and ts < :end_date
+            ORDER BY ts
+            """,
+            params=day_range(st.session_state.start_date, st.session_state.end_date),
+        )
@@ -5,11 +5,14 @@ import pandas as pd
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_bars, chart_lines, chart_area
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
+from api.windows import day_range
 
 
 @st.cache_data(ttl="30m")
 def fetch_data(chain, start_date, end_date, resolution):
-    api = st.session_state.api
+    api = get_api()
     print(f"Fetching data for {chain} from {start_date} to {end_date}")
 
     df_stats = api._run_query(
@@ -23,9 +26,10 @@ def fetch_data(chain, start_date, end_date, resolution):
             liquidation_rewards,
             cumulative_exchange_fees,
             cumulative_volume            
-        FROM {api.environment}_{chain}.fct_perp_stats_{resolution}_{chain}
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_perp_stats", resolution)}
+        WHERE ts >= :start_date and ts <= :end_date
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
     print(f"fetched {df_stats.shape[0]} rows")
 
@@ -34,10 +38,11 @@ def fetch_data(chain, start_date, end_date, resolution):
         SELECT
             ts,
             total_oi_usd
-        FROM {api.environment}_{chain}.fct_perp_market_history_{chain}
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
+        FROM {api.table(chain, "fct_perp_market_history")}
+        WHERE ts >= :start_date and ts <= :end_date
         ORDER BY ts
-        """
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
     print(f"fetched {df_oi.shape[0]} rows")
 
@@ -50,11 +55,12 @@ def fetch_data(chain, start_date, end_date, resolution):
             usd_amount,
             cumulative_snx_amount,
             cumulative_usd_amount
-        FROM {api.environment}_{chain}.fct_buyback_{resolution}_{chain}
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_buyback", resolution)}
+        WHERE ts >= :start_date and ts <= :end_date
+        """,
+            params={"start_date": start_date, "end_date": end_date},
         )
-        if st.session_state.chain.startswith("base")
+        if chain.startswith("base")
         else pd.DataFrame()
     )
     print(f"fetched {df_buyback.shape[0]} rows")
@@ -67,11 +73,12 @@ def fetch_data(chain, start_date, end_date, resolution):
             synth_symbol,
             total_balance,
             total_balance_usd
-        FROM {api.environment}_{chain}.fct_perp_collateral_balances_{chain}
-        WHERE ts >= '{start_date}' and ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_perp_collateral_balances")}
+        WHERE ts >= :start_date and ts <= :end_date
+        """,
+            params={"start_date": start_date, "end_date": end_date},
         )
-        if "base" in st.session_state.chain or "arbitrum" in st.session_state.chain
+        if "base" in chain or "arbitrum" in chain
         else pd.DataFrame()
     )
     print(f"fetched {df_collateral.shape[0]} rows")
@@ -86,9 +93,10 @@ def fetch_data(chain, start_date, end_date, resolution):
             mau - new_accounts_monthly as returning_accounts_monthly,
             dau,
             mau
-        FROM {api.environment}_{chain}.fct_perp_account_activity_{chain}
-        WHERE DATE(ts) >= '{start_date}' and DATE(ts) <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_perp_account_activity")}
+        WHERE ts >= :start_date and ts < :end_date
+        """,
+        params=day_range(start_date, end_date),
     )
     print(f"fetched {df_account_activity.shape[0]} rows")
 
@@ -101,7 +109,7 @@ def fetch_data(chain, start_date, end_date, resolution):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data):
     has_usd_balances = (
         not data["collateral"].empty
@@ -231,7 +239,7 @@ def main():
     if "start_date" not in st.session_state:
         st.session_state.start_date = datetime.today().date() - timedelta(days=14)
     if "end_date" not in st.session_state:
-        st.session_state.end_date = datetime.today().date() + timedelta(days=1)
+        st.session_state.end_date = datetime.today().date()
 
     ## inputs
     with st.expander("Filters"):
@@ -278,28 +286,28 @@ def main():
     col1, col2 = st.columns(2)
 
     with col1:
-        st.plotly_chart(charts["volume"], use_container_width=True)
-        st.plotly_chart(charts["oi"], use_container_width=True)
-        st.plotly_chart(charts["account_liquidations"], use_container_width=True)
-        st.plotly_chart(charts["cumulative_volume"], use_container_width=True)
-        st.plotly_chart(charts["account_activity_daily"], use_container_width=True)
+        plotly_chart(charts["volume"], use_container_width=True)
+        plotly_chart(charts["oi"], use_container_width=True)
+        plotly_chart(charts["account_liquidations"], use_container_width=True)
+        plotly_chart(charts["cumulative_volume"], use_container_width=True)
+        plotly_chart(charts["account_activity_daily"], use_container_width=True)
     with col2:
-        st.plotly_chart(charts["fees"], use_container_width=True)
-        st.plotly_chart(charts["trades"], use_container_width=True)
-        st.plotly_chart(charts["liquidation_rewards"], use_container_width=True)
-        st.plotly_chart(charts["cumulative_fees"], use_container_width=True)
-        st.plotly_chart(charts["account_activity_monthly"], use_container_width=True)
+        plotly_chart(charts["fees"], use_container_width=True)
+        plotly_chart(charts["trades"], use_container_width=True)
+        plotly_chart(charts["liquidation_rewards"], use_container_width=True)
+        plotly_chart(charts["cumulative_fees"], use_container_width=True)
+        plotly_chart(charts["account_activity_monthly"], use_container_width=True)
 
     if charts["collateral"] is not None:
-        st.plotly_chart(charts["collateral"], use_container_width=True)
+        plotly_chart(charts["collateral"], use_container_width=True)
 
     if st.session_state.chain.startswith("base"):
         bb_col1, bb_col2 = st.columns(2)
         with bb_col1:
-            st.plotly_chart(charts["cumulative_buyback"], use_container_width=True)
+            plotly_chart(charts["cumulative_buyback"], use_container_width=True)
 
         with bb_col2:
-            st.plotly_chart(charts["buyback"], use_container_width=True)
+            plotly_chart(charts["buyback"], use_container_width=True)
 
     ## export
     exports = [{"title": export, "df": data[export]} for export in data.keys()]
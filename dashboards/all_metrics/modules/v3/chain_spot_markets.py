@@ -4,6 +4,8 @@ import streamlit as st
 
 from dashboards.utils.data import export_data
 from dashboards.utils.charts import chart_lines
+from dashboards.utils.figures import cache_figures, plotly_chart
+from dashboards.utils.warmup import get_api
 
 
 @st.cache_data(ttl="30m")
@@ -19,7 +21,7 @@ def fetch_data(chain, start_date, end_date):
     Returns:
         dict: A dictionary containing fetched dataframes.
     """
-    api = st.session_state.api
+    api = get_api()
 
     df_wrapper = api._run_query(
         f"""
@@ -29,9 +31,10 @@ def fetch_data(chain, start_date, end_date):
             tx_hash,
             synth_market_id,
             amount_wrapped
-        FROM {api.environment}_{chain}.fct_spot_wrapper_{chain}
-        WHERE ts >= '{start_date}' AND ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_spot_wrapper")}
+        WHERE ts >= :start_date AND ts <= :end_date
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     df_atomics = api._run_query(
@@ -43,9 +46,10 @@ def fetch_data(chain, start_date, end_date):
             synth_market_id,
             amount,
             price
-        FROM {api.environment}_{chain}.fct_spot_atomics_{chain}
-        WHERE ts >= '{start_date}' AND ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_spot_atomics")}
+        WHERE ts >= :start_date AND ts <= :end_date
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     df_synth_supply = api._run_query(
@@ -54,9 +58,10 @@ def fetch_data(chain, start_date, end_date):
             ts,
             synth_market_id,
             supply
-        FROM {api.environment}_{chain}.fct_synth_supply_{chain}
-        WHERE ts >= '{start_date}' AND ts <= '{end_date}'
-        """
+        FROM {api.table(chain, "fct_synth_supply")}
+        WHERE ts >= :start_date AND ts <= :end_date
+        """,
+        params={"start_date": start_date, "end_date": end_date},
     )
 
     return {
@@ -66,7 +71,7 @@ def fetch_data(chain, start_date, end_date):
     }
 
 
-@st.cache_data(ttl="30m")
+@cache_figures(ttl="30m")
 def make_charts(data):
     """
     Creates charts based on the fetched data.
@@ -96,7 +101,7 @@ def main():
     if "start_date" not in st.session_state:
         st.session_state.start_date = datetime.today().date() - timedelta(days=14)
     if "end_date" not in st.session_state:
-        st.session_state.end_date = datetime.today().date() + timedelta(days=1)
+        st.session_state.end_date = datetime.today().date()
 
     # Title
     st.markdown("## Spot Markets and Wrappers")
@@ -134,7 +139,7 @@ def main():
     charts = make_charts(data=data)
 
     # Display the Synth Supply chart
-    st.plotly_chart(charts["supply"], use_container_width=True)
+    plotly_chart(charts["supply"], use_container_width=True)
 
     # Wrapper table
     st.markdown("### Wrapper")
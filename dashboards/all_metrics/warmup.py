@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+from api.warmup import WarmupScheduler
+from dashboards.all_metrics.modules.v2 import (
+    perp_integrators,
+    perp_markets,
+    perp_monitor,
+    perp_stats,
+)
+from dashboards.all_metrics.modules.v3 import (
+    all_core,
+    all_perps,
+    chain_core_stats,
+    chain_perp_integrators,
+    chain_perp_keepers,
+    chain_perp_markets,
+    chain_perp_monitor,
+    chain_perp_stats,
+    chain_spot_markets,
+)
+
+V3_CHAINS = ["arbitrum_mainnet", "base_mainnet"]
+
+
+def default_range(days: int, end_offset: int = 1) -> dict:
+    """Return the default date range of a page, matching its filter defaults."""
+    today = datetime.today().date()
+    return {
+        "start_date": today - timedelta(days=days),
+        "end_date": today + timedelta(days=end_offset),
+    }
+
+
+def get_scheduler(interval: float = 1500) -> WarmupScheduler:
+    """
+    Create a scheduler warming the default view of every page.
+
+    Pages call `fetch_data` with the same arguments, so both the result cache
+    and the `st.cache_data` entries are populated before the first visit.
+    """
+    scheduler = WarmupScheduler(interval=interval)
+
+    scheduler.register(
+        all_core.fetch_data, lambda: {**default_range(14), "resolution": "28d"}
+    )
+    scheduler.register(
+        all_perps.fetch_data, lambda: {**default_range(14), "resolution": "daily"}
+    )
+
+    for chain in [*V3_CHAINS, "eth_mainnet"]:
+        scheduler.register(
+            chain_core_stats.fetch_data,
+            lambda chain=chain: {
+                "chain": chain,
+                **default_range(14),
+                "resolution": "28d",
+            },
+        )
+
+    for chain in V3_CHAINS:
+        for module in [
+            chain_perp_stats,
+            chain_perp_monitor,
+            chain_perp_integrators,
+            chain_perp_keepers,
+        ]:
+            scheduler.register(
+                module.fetch_data,
+                lambda chain=chain: {
+                    "chain": chain,
+                    **default_range(14),
+                    "resolution": "daily",
+                },
+            )
+        for module in [chain_perp_markets, chain_spot_markets]:
+            scheduler.register(
+                module.fetch_data,
+                lambda chain=chain: {"chain": chain, **default_range(14)},
+            )
+
+    # perps v2 pages on optimism end their default range today
+    scheduler.register(
+        perp_stats.fetch_data,
+        lambda: {
+            "chain": "optimism_mainnet",
+            **default_range(30, end_offset=0),
+            "resolution": "daily",
+        },
+    )
+    scheduler.register(
+        perp_monitor.fetch_data,
+        lambda: {
+            "chain": "optimism_mainnet",
+            **default_range(3, end_offset=0),
+            "resolution": "hourly",
+        },
+    )
+    scheduler.register(
+        perp_markets.fetch_data,
+        lambda: {
+            "chain": "optimism_mainnet",
+            "market": "ETH",
+            **default_range(30, end_offset=0),
+            "resolution": "daily",
+        },
+    )
+    scheduler.register(
+        perp_integrators.fetch_data,
+        lambda: {**default_range(14, end_offset=0), "resolution": "daily"},
+    )
+    return scheduler
@@ -1,6 +1,7 @@
 import streamlit as st
 from dashboards.utils.display import sidebar_logo, sidebar_icon
 from api.internal_api import SynthetixAPI, get_db_config
+from api.cache import get_result_cache
 
 st.set_page_config(
     page_title="Synthetix Stats",
@@ -21,7 +22,9 @@ st.markdown(hide_footer, unsafe_allow_html=True)
 # set the API
 @st.cache_resource
 def load_api():
-    return SynthetixAPI(db_config=get_db_config(streamlit=True))
+    return SynthetixAPI(
+        db_config=get_db_config(streamlit=True), cache=get_result_cache()
+    )
 
 
 st.session_state.api = load_api()
@@ -1,7 +1,6 @@
 from datetime import datetime
 
 import streamlit as st
-import pandas as pd
 
 from dashboards.utils.charts import chart_bars, chart_lines, chart_area
 from dashboards.utils.date_utils import get_start_date
@@ -28,73 +27,59 @@ def fetch_data(date_range, chain):
 
     chains_to_fetch = [*SUPPORTED_CHAINS_CORE] if chain == "all" else [chain]
 
-    core_account_activity_daily = [
-        st.session_state.api.get_core_account_activity(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-            resolution="day",
-        )
-        for current_chain in chains_to_fetch
-        if current_chain in SUPPORTED_CHAINS_CORE
-    ]
-    core_account_activity_monthly = [
-        st.session_state.api.get_core_account_activity(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-            resolution="month",
-        )
-        for current_chain in chains_to_fetch
-        if current_chain in SUPPORTED_CHAINS_CORE
-    ]
-    core_nof_stakers = [
-        st.session_state.api.get_core_nof_stakers(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-        )
-        for current_chain in chains_to_fetch
-        if current_chain in SUPPORTED_CHAINS_CORE
-    ]
-    perps_account_activity = [
-        st.session_state.api.get_perps_account_activity(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-        )
-        for current_chain in chains_to_fetch
-        if current_chain in SUPPORTED_CHAINS_PERPS
-    ]
-
-    return {
-        "core_account_activity_daily": (
-            pd.concat(core_account_activity_daily, ignore_index=True)
-            .groupby(["date", "action"])
-            .nof_accounts.sum()
-            .reset_index()
-            if core_account_activity_daily
-            else pd.DataFrame()
-        ),
-        "core_account_activity_monthly": (
-            pd.concat(core_account_activity_monthly, ignore_index=True)
-            .groupby(["date", "action"])
-            .nof_accounts.sum()
-            .reset_index()
-            if core_account_activity_monthly
-            else pd.DataFrame()
-        ),
-        "core_nof_stakers": (
-            pd.concat(core_nof_stakers, ignore_index=True)
-            if core_nof_stakers
-            else pd.DataFrame()
-        ),
-        "perps_account_activity": (
-            pd.concat(perps_account_activity, ignore_index=True)
-            if perps_account_activity
-            else pd.DataFrame()
-        ),
-    }
+    data = st.session_state.api.fetch_many(
+        {
+            "core_account_activity_daily": [
+                dict(
+                    method="get_core_account_activity",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                    resolution="day",
+                )
+                for current_chain in chains_to_fetch
+                if current_chain in SUPPORTED_CHAINS_CORE
+            ],
+            "core_account_activity_monthly": [
+                dict(
+                    method="get_core_account_activity",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                    resolution="month",
+                )
+                for current_chain in chains_to_fetch
+                if current_chain in SUPPORTED_CHAINS_CORE
+            ],
+            "core_nof_stakers": [
+                dict(
+                    method="get_core_nof_stakers",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                )
+                for current_chain in chains_to_fetch
+                if current_chain in SUPPORTED_CHAINS_CORE
+            ],
+            "perps_account_activity": [
+                dict(
+                    method="get_perps_account_activity",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                )
+                for current_chain in chains_to_fetch
+                if current_chain in SUPPORTED_CHAINS_PERPS
+            ],
+        }
+    )
+
+    for key in ["core_account_activity_daily", "core_account_activity_monthly"]:
+        if not data[key].empty:
+            data[key] = (
+                data[key].groupby(["date", "action"]).nof_accounts.sum().reset_index()
+            )
+    return data
 
 
 data = fetch_data(st.session_state.date_range, st.session_state.chain)
@@ -1,7 +1,6 @@
 from datetime import datetime
 
 import streamlit as st
-import pandas as pd
 
 from dashboards.utils.charts import chart_area, chart_lines, chart_bars
 from dashboards.utils.date_utils import get_start_date
@@ -31,78 +30,67 @@ def fetch_data(date_range, chain):
 
     chains_to_fetch = [*SUPPORTED_CHAINS_CORE] if chain == "all" else [chain]
 
-    core_stats_by_collateral = [
-        st.session_state.api.get_core_stats_by_collateral(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-            resolution=APR_RESOLUTION,
-        )
-        for current_chain in chains_to_fetch
-        if current_chain in SUPPORTED_CHAINS_CORE
-    ]
-    core_stats = [
-        st.session_state.api.get_core_stats(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-        )
-        for current_chain in chains_to_fetch
-        if current_chain in SUPPORTED_CHAINS_CORE
-    ]
-    perps_stats = [
-        st.session_state.api.get_perps_stats(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-            resolution=PERPS_RESOLUTION,
-        )
-        for current_chain in chains_to_fetch
-        if current_chain in SUPPORTED_CHAINS_PERPS
-    ]
-    open_interest = [
-        st.session_state.api.get_perps_open_interest(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-            resolution=PERPS_RESOLUTION,
-        )
-        for current_chain in chains_to_fetch
-        if current_chain in SUPPORTED_CHAINS_PERPS
-    ]
-    perps_account_activity = [
-        st.session_state.api.get_perps_account_activity(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-        )
-        for current_chain in chains_to_fetch
-        if current_chain in SUPPORTED_CHAINS_PERPS
-    ]
-
-    return {
-        "core_stats_by_collateral": (
-            pd.concat(core_stats_by_collateral, ignore_index=True)
-            if core_stats_by_collateral
-            else pd.DataFrame()
-        ),
-        "core_stats": (
-            pd.concat(core_stats, ignore_index=True) if core_stats else pd.DataFrame()
-        ),
-        "perps_stats": (
-            pd.concat(perps_stats, ignore_index=True) if perps_stats else pd.DataFrame()
-        ),
-        "open_interest": (
-            pd.concat(open_interest, ignore_index=True)
-            if open_interest
-            else pd.DataFrame()
-        ),
-        "perps_account_activity": (
-            pd.concat(perps_account_activity, ignore_index=True)
-            if perps_account_activity
-            else pd.DataFrame()
-        ),
-    }
+    return st.session_state.api.fetch_many(
+        {
+            "core_stats_by_collateral": [
+                dict(
+                    method="get_core_stats_by_collateral",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                    resolution=APR_RESOLUTION,
+                    incremental=True,
+                )
+                for current_chain in chains_to_fetch
+                if current_chain in SUPPORTED_CHAINS_CORE
+            ],
+            "core_stats": [
+                dict(
+                    method="get_core_stats",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                    incremental=True,
+                )
+                for current_chain in chains_to_fetch
+                if current_chain in SUPPORTED_CHAINS_CORE
+            ],
+            "perps_stats": [
+                dict(
+                    method="get_perps_stats",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                    resolution=PERPS_RESOLUTION,
+                    incremental=True,
+                )
+                for current_chain in chains_to_fetch
+                if current_chain in SUPPORTED_CHAINS_PERPS
+            ],
+            "open_interest": [
+                dict(
+                    method="get_perps_open_interest",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                    resolution=PERPS_RESOLUTION,
+                    incremental=True,
+                )
+                for current_chain in chains_to_fetch
+                if current_chain in SUPPORTED_CHAINS_PERPS
+            ],
+            "perps_account_activity": [
+                dict(
+                    method="get_perps_account_activity",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                )
+                for current_chain in chains_to_fetch
+                if current_chain in SUPPORTED_CHAINS_PERPS
+            ],
+        }
+    )
 
 
 data = fetch_data(st.session_state.date_range, st.session_state.chain)
@@ -1,7 +1,6 @@
 from datetime import datetime
 
 import streamlit as st
-import pandas as pd
 
 from dashboards.utils.charts import chart_area, chart_lines
 from dashboards.utils.date_utils import get_start_date
@@ -27,40 +26,40 @@ def fetch_data(date_range, chain):
 
     chains_to_fetch = [*SUPPORTED_CHAINS_CORE] if chain == "all" else [chain]
 
-    core_stats_by_collateral = [
-        st.session_state.api.get_core_stats_by_collateral(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-            resolution=APR_RESOLUTION,
-        )
-        for current_chain in chains_to_fetch
-    ]
-    core_account_activity_daily = [
-        st.session_state.api.get_core_account_activity(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-            resolution="day",
-        )
-        for current_chain in chains_to_fetch
-    ]
-
-    return {
-        "core_stats_by_collateral": (
-            pd.concat(core_stats_by_collateral, ignore_index=True)
-            if core_stats_by_collateral
-            else pd.DataFrame()
-        ),
-        "core_account_activity_daily": (
-            pd.concat(core_account_activity_daily, ignore_index=True)
+    data = st.session_state.api.fetch_many(
+        {
+            "core_stats_by_collateral": [
+                dict(
+                    method="get_core_stats_by_collateral",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                    resolution=APR_RESOLUTION,
+                    incremental=True,
+                )
+                for current_chain in chains_to_fetch
+            ],
+            "core_account_activity_daily": [
+                dict(
+                    method="get_core_account_activity",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                    resolution="day",
+                )
+                for current_chain in chains_to_fetch
+            ],
+        }
+    )
+
+    if not data["core_account_activity_daily"].empty:
+        data["core_account_activity_daily"] = (
+            data["core_account_activity_daily"]
             .groupby(["date", "action"])
             .nof_accounts.sum()
             .reset_index()
-            if core_account_activity_daily
-            else pd.DataFrame()
-        ),
-    }
+        )
+    return data
 
 
 data = fetch_data(st.session_state.date_range, st.session_state.chain)
@@ -1,7 +1,6 @@
 from datetime import datetime
 
 import streamlit as st
-import pandas as pd
 
 from dashboards.utils.charts import chart_bars, chart_area
 from dashboards.utils.date_utils import get_start_date
@@ -25,30 +24,32 @@ def fetch_data(date_range, chain):
 
     chains_to_fetch = [*SUPPORTED_CHAINS_PERPS] if chain == "all" else [chain]
 
-    perps_stats = [
-        st.session_state.api.get_perps_stats(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-            resolution="daily",
-        )
-        for current_chain in chains_to_fetch
-        if current_chain in SUPPORTED_CHAINS_PERPS
-    ]
-    perps_account_activity = [
-        st.session_state.api.get_perps_account_activity(
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            chain=current_chain,
-        )
-        for current_chain in chains_to_fetch
-        if current_chain in SUPPORTED_CHAINS_PERPS
-    ]
-
-    return {
-        "perps_stats": pd.concat(perps_stats, ignore_index=True),
-        "perps_account_activity": pd.concat(perps_account_activity, ignore_index=True),
-    }
+    return st.session_state.api.fetch_many(
+        {
+            "perps_stats": [
+                dict(
+                    method="get_perps_stats",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                    resolution="daily",
+                    incremental=True,
+                )
+                for current_chain in chains_to_fetch
+                if current_chain in SUPPORTED_CHAINS_PERPS
+            ],
+            "perps_account_activity": [
+                dict(
+                    method="get_perps_account_activity",
+                    start_date=start_date.date(),
+                    end_date=end_date.date(),
+                    chain=current_chain,
+                )
+                for current_chain in chains_to_fetch
+                if current_chain in SUPPORTED_CHAINS_PERPS
+            ],
+        }
+    )
 
 
 data = fetch_data(st.session_state.date_range, st.session_state.chain)
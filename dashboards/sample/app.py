@@ -1,5 +1,6 @@
 import streamlit as st
 from api.internal_api import SynthetixAPI, get_db_config
+from api.cache import get_result_cache
 
 st.set_page_config(
     page_title="Synthetix Dashboards",
@@ -11,7 +12,9 @@ st.set_page_config(
 # set the API
 @st.cache_resource
 def load_api():
-    return SynthetixAPI(db_config=get_db_config(streamlit=True))
+    return SynthetixAPI(
+        db_config=get_db_config(streamlit=True), cache=get_result_cache()
+    )
 
 
 st.session_state.api = load_api()
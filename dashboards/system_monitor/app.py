@@ -1,6 +1,6 @@
 from dotenv import load_dotenv
 import streamlit as st
-from api.internal_api import SynthetixAPI, get_db_config
+from dashboards.system_monitor.modules.settings import load_api
 
 load_dotenv()
 
@@ -22,12 +22,7 @@ hide_footer = """
 st.markdown(hide_footer, unsafe_allow_html=True)
 
 
-# set the API
-@st.cache_resource
-def load_api():
-    return SynthetixAPI(db_config=get_db_config(streamlit=True))
-
-
+# set the API, shared with the pages through the settings module
 st.session_state.api = load_api()
 
 # pages
@@ -2,6 +2,8 @@ import os
 import streamlit as st
 from synthetix import Synthetix
 from api.internal_api import SynthetixAPI, get_db_config
+from api.cache import get_result_cache
+from api.instrumentation import QueryRecorder
 from dashboards.utils.providers import get_provider_url
 
 # constants
@@ -46,10 +48,14 @@ NETWORK_CONFIGS = {
 }
 
 
-# set the API
+# set the API, one instance and query recorder for the whole app
 @st.cache_resource
 def load_api():
-    return SynthetixAPI(db_config=get_db_config(streamlit=True))
+    return SynthetixAPI(
+        db_config=get_db_config(streamlit=True),
+        cache=get_result_cache(),
+        recorder=QueryRecorder(explain_threshold=2),
+    )
 
 
 @st.cache_resource(ttl=3600)
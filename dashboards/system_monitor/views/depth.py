@@ -1,12 +1,16 @@
+import logging
+
+import numpy as np
 import streamlit as st
 import pandas as pd
 
 from synthetix import Synthetix
-from synthetix.utils.multicall import multicall_erc7412, call_erc7412
+from synthetix.utils.multicall import decode_result, handle_erc7412_error
 from synthetix.utils import ether_to_wei, wei_to_ether
 from dashboards.system_monitor.modules.settings import settings
 from dashboards.utils.charts import chart_lines
 
+logger = logging.getLogger(__name__)
 
 PERPS_NETWORKS = [
     8453,
@@ -19,6 +23,14 @@ ALL_USD_POSITION_SIZES = [-10000, -1000, -100, 100, 1000, 10000] + list(
     range(-10000000, 10000000, 50000)
 )
 
+# calls per multicall, to stay under the gas and payload limits of RPC nodes
+DEPTH_CHUNK_SIZE = 500
+
+# sizes checked on chain against the local fill price and fee model, along
+# with the size closing the skew, where the fee switches from maker to taker
+SAMPLE_USD_POSITION_SIZES = [-1000000, -1000, 1000, 1000000]
+MODEL_TOLERANCE = 1e-6
+
 DISPLAY_USD_POSITION_SIZES = [
     10000000,
     5000000,
@@ -128,15 +140,9 @@ def get_market_info(snx, market_name):
         ]
     ]
 
-    # max leverage
-    liquidation_parameters = call_erc7412(
-        snx,
-        snx.perps.market_proxy,
-        "getLiquidationParameters",
-        (market_info["market_id"]),
-    )
-    min_initial_margin_ratio = wei_to_ether(liquidation_parameters[1])
-    max_leverage = 1 / min_initial_margin_ratio
+    # max leverage, read with the depth of every market
+    _, max_leverage = get_all_depths(snx, get_depth_block(snx))
+    max_leverage = max_leverage[market_name]
 
     pct_cols = ["current_funding_rate", "maker_fee", "taker_fee"]
     df_market_info[pct_cols] = df_market_info[pct_cols].applymap(lambda x: f"{x:.4%}")
@@ -151,65 +157,324 @@ def get_market_info(snx, market_name):
     return df_market_info.transpose()
 
 
+def _chunked_multicall(snx, requests, block):
+    """Run calls to the perps market proxy in multicalls, all at the same block.
+
+    Calls to different functions can share a multicall, so related reads are
+    made against the same state. Oracle price updates required by the first
+    multicall are prepended to the following ones.
+
+    Args:
+        snx (Synthetix): The Synthetix instance.
+        requests (list): (function name, arguments) of every call.
+        block (int): The block number to call at.
+
+    Returns:
+        list: The decoded results, in the order of `requests`.
+    """
+    contract = snx.perps.market_proxy
+    oracle_calls = []
+    results = []
+    for start in range(0, len(requests), DEPTH_CHUNK_SIZE):
+        chunk = requests[start : start + DEPTH_CHUNK_SIZE]
+        calls = [
+            (contract.address, True, 0, contract.encodeABI(fn_name=name, args=args))
+            for name, args in chunk
+        ]
+        while True:
+            try:
+                all_calls = oracle_calls + calls
+                response = snx.multicall.functions.aggregate3Value(all_calls).call(
+                    {"value": sum(call[2] for call in all_calls)},
+                    block_identifier=block,
+                )
+                break
+            except Exception as e:
+                # add the oracle updates the error asks for, and retry
+                oracle_calls = handle_erc7412_error(snx, e) + oracle_calls
+
+        for (name, _), (_, data) in zip(chunk, response[-len(chunk) :]):
+            result = decode_result(contract, name, data)
+            results.append(result if len(result) > 1 else result[0])
+    return results
+
+
 @st.cache_data(ttl=600, hash_funcs={Synthetix: lambda x: x.network_id})
-def get_depth(snx, market_name):
-    """Retrieve the depth information for a specific market.
+def get_depth_block(snx):
+    """Retrieve the block number the depth of every market is computed at.
+
+    The block is refreshed with the cache, so every market is read at the same
+    block and reruns in between are served from the cached depth.
 
     Args:
         snx (Synthetix): The Synthetix instance.
-        market_name (str): The name of the market.
 
     Returns:
-        pd.DataFrame: DataFrame containing the depth information.
+        int: The block number.
     """
-    market_info = snx.perps.markets_by_name[market_name]
-    price = market_info["index_price"]
-    skew = market_info["skew"]
-    skew_usd = skew * price
-    funding_rate_24h = market_info["current_funding_rate"]
-    funding_rate_1h = funding_rate_24h / 24
-
-    # check the market depth at various sizes
-    position_sizes_usd = ALL_USD_POSITION_SIZES + [-skew_usd]
-    position_sizes_usd.sort(reverse=True)
-    position_sizes = [size / price for size in position_sizes_usd]
-
-    order_fees_result = multicall_erc7412(
+    return snx.web3.eth.block_number
+
+
+def compute_order_fees(price, skew, skew_scale, maker_fee, taker_fee, sizes):
+    """Compute the order fees and fill prices of orders, like the perps market.
+
+    A vectorized version of `computeOrderFeesWithPrice`. The fill price is the
+    average of the premium-adjusted prices before and after the order, and
+    the fee is the maker fee for the part of the order reducing the skew and
+    the taker fee for the part increasing it.
+
+    Args:
+        price (float): The index price of the market.
+        skew (float): The skew of the market, in units of the asset.
+        skew_scale (float): The skew scale of the market.
+        maker_fee (float): The maker fee rate.
+        taker_fee (float): The taker fee rate.
+        sizes (np.ndarray): The order sizes, in units of the asset.
+
+    Returns:
+        tuple: Arrays of the order fees and of the fill prices.
+    """
+    sizes = np.asarray(sizes, dtype=float)
+    new_skew = skew + sizes
+
+    if skew_scale > 0:
+        fill_price = price * (1 + (skew + new_skew) / (2 * skew_scale))
+    else:
+        fill_price = np.full(sizes.shape, float(price))
+    notional = sizes * fill_price
+
+    # orders keeping the skew on one side pay a single rate on the whole size
+    keeps_side = (new_skew == 0) | (skew == 0) | ((new_skew > 0) == (skew > 0))
+    increases_skew = (notional == 0) | (skew == 0) | ((notional > 0) == (skew > 0))
+    static_fees = np.abs(notional) * np.where(increases_skew, taker_fee, maker_fee)
+
+    # orders flipping the skew pay the taker fee on the part past zero
+    with np.errstate(divide="ignore", invalid="ignore"):
+        taker_share = np.abs(new_skew / sizes)
+        flip_fees = np.abs(notional) * (
+            taker_share * taker_fee + (1 - taker_share) * maker_fee
+        )
+    return np.where(keeps_side, static_fees, flip_fees), fill_price
+
+
+def _order_fees_on_chain(snx, market, sizes, block):
+    """Retrieve order fees and fill prices from `computeOrderFeesWithPrice`.
+
+    Args:
+        snx (Synthetix): The Synthetix instance.
+        market (dict): The market state, from `_get_market_states`.
+        sizes (list): The order sizes, in units of the asset.
+        block (int): The block number to call at.
+
+    Returns:
+        tuple: Arrays of the order fees and of the fill prices.
+    """
+    results = _chunked_multicall(
         snx,
-        snx.perps.market_proxy,
-        "computeOrderFeesWithPrice",
         [
-            (market_info["market_id"], ether_to_wei(size), ether_to_wei(price))
-            for size in position_sizes
+            (
+                "computeOrderFeesWithPrice",
+                (
+                    market["market_id"],
+                    ether_to_wei(size),
+                    ether_to_wei(market["index_price"]),
+                ),
+            )
+            for size in sizes
         ],
+        block,
     )
-
-    settlement_reward_cost = call_erc7412(
-        snx,
-        snx.perps.market_proxy,
-        "getSettlementRewardCost",
-        (market_info["market_id"], 0),
+    fees = np.array([wei_to_ether(result[0]) for result in results])
+    fill_prices = np.array([wei_to_ether(result[1]) for result in results])
+    return fees, fill_prices
+
+
+def _model_order_fees(market, sizes, price=None):
+    return compute_order_fees(
+        market["index_price"] if price is None else price,
+        market["skew"],
+        market["skew_scale"],
+        market["maker_fee"],
+        market["taker_fee"],
+        sizes,
     )
-    settlement_reward_cost = wei_to_ether(settlement_reward_cost)
-
-    depths = {}
-    for size_usd, size, fee_result in zip(
-        position_sizes_usd, position_sizes, order_fees_result
-    ):
-        order_fees = wei_to_ether(fee_result[0])
-        fill_price = wei_to_ether(fee_result[1])
-
-        depths[size_usd] = {
-            "order_size_usd": size_usd,
-            "order_size": size,
-            "order_fees": order_fees,
-            "fill_price": fill_price,
-            "index_price": price,
-            "settlement_reward_cost": settlement_reward_cost,
+
+
+# market reads at the depth block, and how to store their results
+MARKET_STATE_CALLS = {
+    "getMarketSummary": lambda result: {
+        "skew": wei_to_ether(result[0]),
+        "current_funding_rate": wei_to_ether(result[3]),
+        "index_price": wei_to_ether(result[5]),
+    },
+    "getOrderFees": lambda result: {
+        "maker_fee": wei_to_ether(result[0]),
+        "taker_fee": wei_to_ether(result[1]),
+    },
+    "getFundingParameters": lambda result: {
+        "skew_scale": wei_to_ether(result[0]),
+    },
+    "getLiquidationParameters": lambda result: {
+        "max_leverage": 1 / wei_to_ether(result[1]),
+    },
+}
+
+
+def _get_market_states(snx, markets, samples, block_number):
+    """Read the state of every market and sample the contract, in one multicall.
+
+    The skew, price, fee and skew scale configuration of every market are
+    read at the same block as the sampled `computeOrderFeesWithPrice` calls,
+    so the model is checked against the state the contract used.
+
+    Args:
+        snx (Synthetix): The Synthetix instance.
+        markets (list): Markets from `markets_by_name`.
+        samples (list): (market, size, price) of every sampled order.
+        block_number (int): The block number to read at.
+
+    Returns:
+        tuple: Dictionary of the state of every market by name, and the
+            (order fees, fill price) results of the samples.
+    """
+    requests = [
+        (function_name, (market_info["market_id"],))
+        for market_info in markets
+        for function_name in MARKET_STATE_CALLS
+    ]
+    requests += [
+        ("getSettlementRewardCost", (market_info["market_id"], 0))
+        for market_info in markets
+    ]
+    requests += [
+        (
+            "computeOrderFeesWithPrice",
+            (market_info["market_id"], ether_to_wei(size), ether_to_wei(price)),
+        )
+        for market_info, size, price in samples
+    ]
+    results = _chunked_multicall(snx, requests, block_number)
+
+    states = {}
+    state_results = iter(results[: len(markets) * len(MARKET_STATE_CALLS)])
+    for market_info in markets:
+        state = {
+            "market_id": market_info["market_id"],
+            "market_name": market_info["market_name"],
         }
+        for parse in MARKET_STATE_CALLS.values():
+            state.update(parse(next(state_results)))
+        states[market_info["market_name"]] = state
+
+    settlement_results = results[len(markets) * len(MARKET_STATE_CALLS) :]
+    for market_info, settlement_reward_cost in zip(markets, settlement_results):
+        states[market_info["market_name"]]["settlement_reward_cost"] = wei_to_ether(
+            settlement_reward_cost
+        )
+
+    sample_results = [
+        (wei_to_ether(result[0]), wei_to_ether(result[1]))
+        for result in results[len(requests) - len(samples) :]
+    ]
+    return states, sample_results
 
-    df = pd.DataFrame().from_dict(depths, orient="index")
-    df = df.reset_index()
+
+@st.cache_data(ttl=600, max_entries=8, hash_funcs={Synthetix: lambda x: x.network_id})
+def get_all_depths(snx, block_number):
+    """Retrieve the depth information for every perps market at a block.
+
+    Fill prices and order fees are computed locally with
+    `compute_order_fees`, for every position size of every market, from the
+    skew, price and fee configuration read at the block. The model is checked
+    against `computeOrderFeesWithPrice` at a few sampled sizes of every
+    market, in the same multicall as the market state; markets where it
+    disagrees are computed on chain instead. Results are cached per network
+    and block, so switching markets reads from the cache.
+
+    Args:
+        snx (Synthetix): The Synthetix instance.
+        block_number (int): The block number to compute the depth at.
+
+    Returns:
+        tuple: DataFrame containing the depth information of every market,
+            and a dictionary of the max leverage of every market by name.
+    """
+    markets = [
+        market_info
+        for market_info in snx.perps.markets_by_name.values()
+        if market_info["index_price"] > 0
+    ]
+
+    # sample sizes and prices come from the snapshot, the contract uses the
+    # market state at the block for everything else
+    samples = [
+        (
+            market_info,
+            size_usd / market_info["index_price"],
+            market_info["index_price"],
+        )
+        for market_info in markets
+        for size_usd in SAMPLE_USD_POSITION_SIZES
+        + [-market_info["skew"] * market_info["index_price"]]
+    ]
+    states, sample_results = _get_market_states(
+        snx, markets, samples, block_number
+    )
+
+    mismatched = set()
+    for (market_info, size, price), result in zip(samples, sample_results):
+        market = states[market_info["market_name"]]
+        fees, fill_price = _model_order_fees(market, [size], price)
+        if not np.allclose(
+            [fees[0], fill_price[0]],
+            result,
+            rtol=MODEL_TOLERANCE,
+            atol=MODEL_TOLERANCE,
+        ):
+            mismatched.add(market["market_name"])
+
+    max_leverage = {
+        market_name: market["max_leverage"] for market_name, market in states.items()
+    }
+
+    frames = []
+    for market_name, market in states.items():
+        price = market["index_price"]
+        if price <= 0:
+            continue
+
+        # check the market depth at various sizes
+        skew_usd = market["skew"] * price
+        sizes_usd = np.array(
+            sorted(set(ALL_USD_POSITION_SIZES + [-skew_usd]), reverse=True)
+        )
+        sizes = sizes_usd / price
+        if market_name in mismatched:
+            logger.warning(
+                f"Depth model does not match the contract for {market_name}, "
+                "computing its depth on chain"
+            )
+            order_fees, fill_prices = _order_fees_on_chain(
+                snx, market, sizes, block_number
+            )
+        else:
+            order_fees, fill_prices = _model_order_fees(market, sizes)
+
+        frames.append(
+            pd.DataFrame(
+                {
+                    "market_name": market_name,
+                    "order_size_usd": sizes_usd,
+                    "order_size": sizes,
+                    "order_fees": order_fees,
+                    "fill_price": fill_prices,
+                    "index_price": price,
+                    "settlement_reward_cost": market["settlement_reward_cost"],
+                    "funding_rate_1h": market["current_funding_rate"] / 24,
+                }
+            )
+        )
+    df = pd.concat(frames, ignore_index=True)
 
     # add columns
     df["total_fee_usd"] = df["order_fees"] + df["settlement_reward_cost"]
@@ -222,8 +487,21 @@ def get_depth(snx, market_name):
     df["order_fee_pct"] = abs(df["order_fees"] / df["order_size_usd"])
     df["settlement_fee_pct"] = df["settlement_reward_cost"] / df["order_size_usd"]
     df["total_fee_pct"] = df["total_fee_usd"] / df["order_size_usd"]
-    df["funding_per_hour_usd"] = funding_rate_1h * df["order_size_usd"]
+    df["funding_per_hour_usd"] = df["funding_rate_1h"] * df["order_size_usd"]
+    return df, max_leverage
 
+
+def get_depth(snx, market_name):
+    """Retrieve the depth information for a specific market.
+
+    Args:
+        snx (Synthetix): The Synthetix instance.
+        market_name (str): The name of the market.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the depth information.
+    """
+    df, _ = get_all_depths(snx, get_depth_block(snx))
     cols = [
         "order_size_usd",
         "index_price",
@@ -238,7 +516,7 @@ def get_depth(snx, market_name):
         "settlement_reward_cost",
         "settlement_fee_pct",
     ]
-    return df[cols]
+    return df.loc[df["market_name"] == market_name, cols].reset_index(drop=True)
 
 
 def format_depth(df):
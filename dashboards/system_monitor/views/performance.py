@@ -19,3 +19,65 @@ st.button("Run queries", on_click=time_queries)
 
 if st.session_state.df_query is not None:
     st.dataframe(st.session_state.df_query)
+
+# query log
+st.markdown("## Query Log")
+recorder = st.session_state.api.recorder
+if recorder is None:
+    st.info("Query recording is not enabled for this API.")
+    st.stop()
+
+# the recorder is shared by every session, so its threshold is only shown here
+if recorder.explain_threshold is None:
+    st.caption("Plan capture is disabled.")
+else:
+    st.caption(
+        f"Queries slower than {recorder.explain_threshold:g} seconds are re-run "
+        "with EXPLAIN (ANALYZE, BUFFERS) in the background."
+    )
+
+df_log = recorder.to_dataframe()
+if df_log.empty:
+    st.info("No queries recorded yet.")
+    st.stop()
+
+st.button("Clear log", on_click=recorder.clear)
+
+# summary by query
+df_summary = (
+    df_log.groupby(["query", "source"])
+    .agg(
+        count=("wall_seconds", "size"),
+        p50_seconds=("wall_seconds", "median"),
+        p95_seconds=("wall_seconds", lambda x: x.quantile(0.95)),
+        max_seconds=("wall_seconds", "max"),
+        pool_wait_seconds=("pool_wait_seconds", "mean"),
+        connect_seconds=("connect_seconds", "mean"),
+        rows=("rows", "mean"),
+        memory_bytes=("memory_bytes", "mean"),
+        errors=("error", "count"),
+    )
+    .reset_index()
+    .sort_values("p95_seconds", ascending=False)
+)
+st.dataframe(df_summary, use_container_width=True, hide_index=True)
+
+# slow queries and their plans
+st.markdown("### Captured Plans")
+df_plans = df_log[df_log["plan"].notna()].sort_values("wall_seconds", ascending=False)
+if df_plans.empty:
+    st.info("No plans captured yet.")
+for _, row in df_plans.iterrows():
+    with st.expander(f"{row['wall_seconds']:.2f}s - {row['query'][:120]}"):
+        st.code(row["query"], language="sql")
+        st.write(
+            {
+                "execution_seconds": row["plan_seconds"],
+                "shared_hit_blocks": row["shared_hit_blocks"],
+                "shared_read_blocks": row["shared_read_blocks"],
+            }
+        )
+        st.json(row["plan"])
+
+with st.expander("All records"):
+    st.dataframe(df_log.drop(columns="plan"), use_container_width=True, hide_index=True)
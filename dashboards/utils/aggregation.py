@@ -0,0 +1,149 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+# aggregations computed with NumPy segment reductions, others go through pandas
+SEGMENT_REDUCTIONS = ("sum", "mean", "min", "max", "count")
+
+# results shared by the charts of one `make_charts` call, keyed by frame
+_shared: ContextVar[Optional[dict]] = ContextVar("shared_aggregations", default=None)
+
+
+class SortedIndex(NamedTuple):
+    """Rows of a frame grouped by x: sorted unique x, row order and group starts."""
+
+    x: pd.Index
+    order: np.ndarray
+    starts: np.ndarray
+
+
+@contextmanager
+def shared_aggregations():
+    """
+    Share aggregations across the charts built inside the block.
+
+    Charts that aggregate the same frame, x column, field and function reuse
+    one result instead of grouping the frame again. Results are keyed by the
+    frame itself and dropped when the block ends, so frames changed after the
+    block are never served stale results. Nested blocks share the outer one.
+    """
+    if _shared.get() is not None:
+        yield
+        return
+
+    token = _shared.set({})
+    try:
+        yield
+    finally:
+        _shared.reset(token)
+
+
+def memoize(df, key: tuple, compute: Callable):
+    """
+    Return `compute()`, shared for `df` and `key` inside `shared_aggregations`.
+
+    Args:
+        df (pandas.DataFrame): The frame the result is computed from
+        key (tuple): Arguments of the computation, besides the frame
+        compute (callable): Function computing the result
+
+    Returns:
+        The result of `compute`, computed at most once per block
+    """
+    shared = _shared.get()
+    if shared is None:
+        return compute()
+
+    key = (id(df),) + key
+    if key not in shared:
+        # keep the frame alive, so its id is not reused during the block
+        shared[key] = (df, compute())
+    return shared[key][1]
+
+
+def sorted_index(df, x_col: str) -> SortedIndex:
+    """
+    Group the rows of a frame by x with a single sort.
+
+    Rows without an x value are dropped, like `DataFrame.groupby`.
+
+    Args:
+        df (pandas.DataFrame): The data
+        x_col (str): Column to group by
+
+    Returns:
+        SortedIndex: Sorted unique x values, the order of the rows grouped by
+            x, and the position in that order where every group starts
+    """
+
+    def compute():
+        codes, uniques = pd.factorize(df[x_col], sort=True)
+        # a stable sort of 16-bit keys is a radix sort, linear in the rows
+        keys = codes + 1
+        if len(uniques) < np.iinfo(np.uint16).max:
+            keys = keys.astype(np.uint16)
+        order = np.argsort(keys, kind="stable")
+        order = order[np.count_nonzero(codes < 0) :]
+        starts = np.searchsorted(codes[order], np.arange(len(uniques)))
+        return SortedIndex(pd.Index(uniques), order, starts)
+
+    return memoize(df, ("index", x_col), compute)
+
+
+def _segment_reduce(values: np.ndarray, starts: np.ndarray, agg: str) -> np.ndarray:
+    # missing values are skipped, like the pandas aggregations
+    valid = ~np.isnan(values)
+    if agg in ("sum", "mean", "count"):
+        count = np.add.reduceat(valid.astype(np.int64), starts)
+        if agg == "count":
+            return count
+        total = np.add.reduceat(np.where(valid, values, 0.0), starts)
+        if agg == "sum":
+            return total
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return total / count
+    reduce = np.fmin if agg == "min" else np.fmax
+    return reduce.reduceat(values, starts)
+
+
+def aggregate(df, x_col: str, field: str, agg: str = "sum") -> pd.DataFrame:
+    """
+    Aggregate a field for every x value.
+
+    Equivalent to `df.groupby(x_col)[field].agg(agg).reset_index()`. The
+    aggregations in SEGMENT_REDUCTIONS reduce contiguous segments of the
+    values ordered by `sorted_index`, which is shared by every field of the
+    frame. Inside `shared_aggregations`, results are computed once per frame,
+    x column, field and aggregation.
+
+    Args:
+        df (pandas.DataFrame): The data
+        x_col (str): Column to group by
+        field (str): Column to aggregate
+        agg (str): Aggregation function
+
+    Returns:
+        pandas.DataFrame: One row per x value, with `x_col` and `field` columns
+    """
+
+    def compute():
+        if agg not in SEGMENT_REDUCTIONS or not pd.api.types.is_numeric_dtype(
+            df[field]
+        ):
+            return df.groupby(x_col)[field].agg(agg).reset_index()
+
+        index = sorted_index(df, x_col)
+        if len(index.x) == 0:
+            return df.groupby(x_col)[field].agg(agg).reset_index()
+        values = df[field].to_numpy(dtype=float, na_value=np.nan)[index.order]
+        return pd.DataFrame(
+            {
+                x_col: index.x,
+                field: _segment_reduce(values, index.starts, agg),
+            }
+        )
+
+    return memoize(df, ("aggregate", x_col, field, agg), compute)
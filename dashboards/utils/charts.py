@@ -4,7 +4,14 @@ from typing import List, Optional, Union, Dict
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from dashboards.utils.formatting import human_format as format_func
+from dashboards.utils.formatting import human_format_array as format_func
+from dashboards.utils.aggregation import aggregate, memoize
+from dashboards.utils.downsample import (
+    TARGET_WIDTH_PX,
+    downsample_bars,
+    downsample_traces,
+)
+from dashboards.utils.series import fold_tail, rank_by_last_value, split_series
 
 # Constants
 HOVER_PREFIX_MAP = {"$": "$", "#": "", "%": ""}
@@ -28,6 +35,10 @@ DEFAULT_LINE_WIDTH = 0
 HELP_TEXT_BGCOLOR = "#333333"
 HELP_TEXT_FONT_SIZE = 14
 HELP_TEXT_FONT_COLOR = "white"
+# above these point counts, the browser struggles to render SVG traces: lines
+# switch to WebGL and the x values of bar charts are thinned
+WEBGL_POINT_THRESHOLD = 10000
+MAX_BAR_POINTS = 5000
 
 
 def chart_bars(
@@ -47,11 +58,27 @@ def chart_bars(
     sort_ascending: bool = False,
     unified_hover: bool = True,
     no_decimals: bool = False,
+    max_points: Optional[int] = MAX_BAR_POINTS,
+    fold_groups: bool = False,
+    downsample: Optional[str] = "minmax",
+    target_width: int = TARGET_WIDTH_PX,
 ):
-    """Create a bar chart."""
+    """
+    Create a bar chart.
+
+    Bars have no WebGL renderer, so charts with more than `max_points` bars
+    keep only the x values `target_width` pixels can show, selected from the
+    stacked total. Set `downsample` to None to draw every bar. With
+    `fold_groups`, the smallest groups of `color_by` are first summed into an
+    'Other' group, when that brings the chart within `max_points`.
+    """
     if isinstance(y_cols, str):
         traces = _create_traces_from_string(
-            df=df,
+            df=(
+                fold_tail(df, x_col, y_cols, color_by, max_points)
+                if fold_groups and color_by is not None and max_points is not None
+                else df
+            ),
             x_col=x_col,
             y_cols=y_cols,
             trace_type="bar",
@@ -59,6 +86,8 @@ def chart_bars(
             human_format=human_format,
             y_format=y_format,
             no_decimals=no_decimals,
+            sort_by_last_value=sort_by_last_value,
+            sort_ascending=sort_ascending,
         )
     else:
         traces = _create_traces_from_list(
@@ -69,11 +98,18 @@ def chart_bars(
             human_format=human_format,
             y_format=y_format,
             no_decimals=no_decimals,
+            sort_by_last_value=sort_by_last_value,
+            sort_ascending=sort_ascending,
         )
-    if sort_by_last_value:
-        traces = sort_traces(traces, sort_ascending)
     if custom_agg is not None:
         traces = add_aggregation(traces, custom_agg, df, x_col, y_format, human_format)
+    if (
+        downsample is not None
+        and max_points is not None
+        and sum(len(trace["y"]) for trace in traces if trace["y"] is not None)
+        > max_points
+    ):
+        traces = downsample_bars(traces, target_width, downsample)
     fig = go.Figure(
         traces,
         layout=dict(
@@ -137,8 +173,17 @@ def chart_area(
     custom_agg: Optional[Dict[str, str]] = None,
     unified_hover: bool = True,
     no_decimals: bool = False,
+    downsample: Optional[str] = "minmax",
+    target_width: int = TARGET_WIDTH_PX,
 ):
-    """Create an area chart."""
+    """
+    Create an area chart.
+
+    Dense series are downsampled to the points `target_width` pixels can show,
+    keeping the same x values across stacked traces. Set `downsample` to
+    'lttb' to follow the shape instead of the extremes, or None to keep
+    every point.
+    """
     if isinstance(y_cols, str):
         traces = _create_traces_from_string(
             df=df,
@@ -150,6 +195,8 @@ def chart_area(
             y_format=y_format,
             stackgroup="one",
             no_decimals=no_decimals,
+            sort_by_last_value=sort_by_last_value,
+            sort_ascending=sort_ascending,
         )
     else:
         traces = _create_traces_from_list(
@@ -161,11 +208,13 @@ def chart_area(
             y_format=y_format,
             stackgroup="one",
             no_decimals=no_decimals,
+            sort_by_last_value=sort_by_last_value,
+            sort_ascending=sort_ascending,
         )
-    if sort_by_last_value:
-        traces = sort_traces(traces, sort_ascending)
     if custom_agg is not None:
         traces = add_aggregation(traces, custom_agg, df, x_col, y_format, human_format)
+    if downsample is not None:
+        traces = downsample_traces(traces, target_width, downsample, shared_x=True)
     fig = go.Figure(
         traces,
         layout=dict(
@@ -199,8 +248,19 @@ def chart_lines(
     custom_agg: Optional[Dict[str, str]] = None,
     unified_hover: bool = True,
     no_decimals: bool = False,
+    downsample: Optional[str] = "minmax",
+    target_width: int = TARGET_WIDTH_PX,
+    webgl_threshold: Optional[int] = WEBGL_POINT_THRESHOLD,
 ):
-    """Create a line chart."""
+    """
+    Create a line chart.
+
+    Dense series are downsampled to the points `target_width` pixels can show,
+    keeping the minimum and maximum of every bucket so peaks survive. Set
+    `downsample` to 'lttb' to follow the shape instead, or None to keep every
+    point. Charts left with more than `webgl_threshold` points are rendered
+    with WebGL; set it to None to always use SVG.
+    """
     if isinstance(y_cols, str):
         traces = _create_traces_from_string(
             df=df,
@@ -212,6 +272,8 @@ def chart_lines(
             y_format=y_format,
             stackgroup="",
             no_decimals=no_decimals,
+            sort_by_last_value=sort_by_last_value,
+            sort_ascending=sort_ascending,
         )
     else:
         traces = _create_traces_from_list(
@@ -223,11 +285,15 @@ def chart_lines(
             y_format=y_format,
             stackgroup="",
             no_decimals=no_decimals,
+            sort_by_last_value=sort_by_last_value,
+            sort_ascending=sort_ascending,
         )
-    if sort_by_last_value:
-        traces = sort_traces(traces, sort_ascending)
     if custom_agg is not None:
         traces = add_aggregation(traces, custom_agg, df, x_col, y_format, human_format)
+    if downsample is not None:
+        traces = downsample_traces(traces, target_width, downsample)
+    if webgl_threshold is not None:
+        traces = use_webgl(traces, webgl_threshold)
     fig = go.Figure(traces)
     fig.update_layout(
         title=title,
@@ -330,16 +396,44 @@ def add_help_text(fig, help_text: str):
     return fig
 
 
-def sort_traces(traces, sort_ascending):
-    traces.sort(
-        key=lambda trace: trace["y"][-1] if len(trace["y"]) > 0 else 0,
-        reverse=not sort_ascending,
-    )
+def sort_traces(traces, sort_ascending, last_values=None):
+    if last_values is None:
+        last_values = [trace["y"][-1] if len(trace["y"]) > 0 else 0 for trace in traces]
+    order = rank_by_last_value(last_values, sort_ascending)
+    traces[:] = [traces[i] for i in order]
     for rank, trace in enumerate(traces):
         trace["legendrank"] = -rank
     return traces
 
 
+def use_webgl(traces, threshold: int = WEBGL_POINT_THRESHOLD):
+    """
+    Switch line traces to WebGL when the chart has more than `threshold` points.
+
+    Stacked traces are kept as SVG, since Scattergl cannot stack.
+
+    Args:
+        traces (list): Plotly traces
+        threshold (int): Number of points above which WebGL is used
+
+    Returns:
+        list: The traces, with Scatter lines replaced by Scattergl
+    """
+    points = sum(len(trace["y"]) for trace in traces if trace["y"] is not None)
+    if points <= threshold:
+        return traces
+
+    webgl_traces = []
+    for trace in traces:
+        if trace.type == "scatter" and not trace.stackgroup:
+            properties = trace.to_plotly_json()
+            properties.pop("type")
+            properties.pop("stackgroup", None)
+            trace = go.Scattergl(properties)
+        webgl_traces.append(trace)
+    return webgl_traces
+
+
 def add_aggregation(traces, custom_agg, df, x_col, y_format, human_format):
     percentage = True if y_format == "%" else False
     no_decimals = False if y_format == "$" else True
@@ -347,11 +441,12 @@ def add_aggregation(traces, custom_agg, df, x_col, y_format, human_format):
         field = custom_agg.get("field")
         name = custom_agg.get("name", "Total")
         agg = custom_agg.get("agg", "sum")
-        y = df.groupby(x_col)[field].agg(agg).reset_index()
+        y = aggregate(df, x_col, field, agg)
         custom_data = (
-            y[field].apply(
-                format_func,
-                args=(no_decimals, percentage),
+            memoize(
+                df,
+                ("labels", x_col, field, agg, no_decimals, percentage),
+                lambda: format_func(y[field], no_decimals, percentage),
             )
             if human_format
             else y[field]
@@ -382,6 +477,8 @@ def _create_traces_from_list(
     stackgroup: Optional[str] = "one",
     color_map: Optional[Dict[str, str]] = CATEGORICAL_COLORS,
     no_decimals: bool = False,
+    sort_by_last_value: bool = False,
+    sort_ascending: bool = False,
 ):
     traces = []
     percentage = True if y_format == "%" else False
@@ -390,7 +487,7 @@ def _create_traces_from_list(
         hover_template = f"<extra></extra>%{{fullData.name}}: {HOVER_PREFIX_MAP[y_format]}%{{customdata}}"
         custom_data = df[y_col]
         if human_format:
-            custom_data = custom_data.apply(format_func, args=(no_decimals, percentage))
+            custom_data = format_func(custom_data, no_decimals, percentage)
         trace = _create_trace(
             x=df[x_col],
             y=df[y_col],
@@ -404,6 +501,13 @@ def _create_traces_from_list(
             stackgroup=stackgroup,
         )
         traces.append(trace)
+    if sort_by_last_value:
+        last_values = (
+            df[y_cols].iloc[-1].to_numpy(dtype=float)
+            if len(df) > 0
+            else np.zeros(len(y_cols))
+        )
+        traces = sort_traces(traces, sort_ascending, last_values)
     return traces
 
 
@@ -418,42 +522,42 @@ def _create_traces_from_string(
     stackgroup: Optional[str] = "one",
     color_map: Optional[Dict[str, str]] = CATEGORICAL_COLORS,
     no_decimals: bool = False,
+    sort_by_last_value: bool = False,
+    sort_ascending: bool = False,
 ):
     traces = []
     percentage = True if y_format == "%" else False
+    hover_template = f"<extra></extra>%{{fullData.name}}: {HOVER_PREFIX_MAP[y_format]}%{{customdata}}"
     if color_by is not None:
-        if trace_type == "area":
-            all_indexes = pd.Index([])
-            for _, group in df.groupby(color_by):
-                all_indexes = all_indexes.union(pd.Index(group[x_col].unique()))
-
-        for i, (label, group) in enumerate(df.groupby(color_by)):
-            if trace_type == "area":
-                group = group.drop_duplicates(subset=x_col).sort_values(by=x_col)
-                group = group.set_index(x_col).reindex(all_indexes, fill_value=0)
+        # one sort splits every group, areas are aligned on the same x values
+        series = split_series(
+            df, x_col, y_cols, color_by, align=trace_type == "area"
+        )
+        custom_data = series.y
+        if human_format and series.labels:
+            # format every series in one call, then split at the same bounds
+            bounds = np.cumsum([len(y) for y in series.y])[:-1]
+            formatted = format_func(np.concatenate(series.y), no_decimals, percentage)
+            custom_data = np.split(formatted, bounds)
+        for i, (label, x, y) in enumerate(zip(series.labels, series.x, series.y)):
             color = color_map[i % len(color_map)]
-            custom_data = group[y_cols]
-            if human_format:
-                custom_data = custom_data.apply(
-                    format_func, args=(no_decimals, percentage)
-                )
-            hover_template = f"<extra></extra>%{{fullData.name}}: {HOVER_PREFIX_MAP[y_format]}%{{customdata}}"
             trace = _create_trace(
-                x=group.index if trace_type == "area" else group[x_col],
-                y=group[y_cols],
+                x=x,
+                y=y,
                 name=label,
                 trace_type=trace_type,
                 color=color,
                 legendrank=0,
                 stackgroup=stackgroup,
-                custom_data=custom_data,
+                custom_data=custom_data[i],
                 hover_template=hover_template,
                 show_legend=True,
             )
             traces.append(trace)
+        if sort_by_last_value:
+            traces = sort_traces(traces, sort_ascending, series.last)
     else:
         color = color_map[0]
-        hover_template = f"<extra></extra>%{{fullData.name}}: {HOVER_PREFIX_MAP[y_format]}%{{customdata}}"
         trace = _create_trace(
             x=df[x_col],
             y=df[y_cols],
@@ -461,11 +565,13 @@ def _create_traces_from_string(
             color=color,
             trace_type=trace_type,
             legendrank=0,
-            custom_data=df[y_cols].apply(format_func, args=(no_decimals, percentage)),
+            custom_data=format_func(df[y_cols], no_decimals, percentage),
             hover_template=hover_template,
             show_legend=True,
         )
         traces.append(trace)
+        if sort_by_last_value:
+            traces = sort_traces(traces, sort_ascending)
     return traces
 
 
@@ -1,11 +1,131 @@
+import io
+import os
+import tempfile
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
 import streamlit as st
 
+from dashboards.utils.warmup import get_api
+
+# download formats: file extension and mime type
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow": ("arrow", "application/vnd.apache.arrow.file"),
+}
+
+# formats of full exports streamed from the database
+STREAM_FORMATS = ["Parquet", "CSV"]
+
+
+@st.cache_data(ttl="30m", max_entries=32)
+def encode_export(df: pd.DataFrame, file_format: str) -> bytes:
+    """
+    Encode a DataFrame for download.
+
+    Results are cached on the content of the frame, so a frame that is
+    re-fetched from the data cache on a rerun is not encoded again.
+
+    Args:
+        df (pandas.DataFrame): The data to export
+        file_format (str): One of EXPORT_FORMATS
+
+    Returns:
+        bytes: The encoded file
+    """
+    if file_format == "CSV":
+        return df.to_csv(index=False).encode("utf-8")
+
+    buffer = io.BytesIO()
+    if file_format == "Parquet":
+        df.to_parquet(buffer, index=False)
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.ipc.new_file(buffer, table.schema) as writer:
+            writer.write_table(table)
+    return buffer.getvalue()
+
 
+def _prepare(prepared_key: str, file_format: str):
+    st.session_state[prepared_key] = file_format
+
+
+@st.fragment
 def export_data(title, df):
-    csv = df.to_csv(index=False).encode("utf-8")
+    """
+    Show a preview of a DataFrame with an on-demand download.
+
+    Nothing is encoded until the user prepares a download, and choosing a
+    format or preparing it only reruns this fragment, not the whole page.
+    """
+    prepared_key = f"{title}-prepared"
 
     st.write(f"### {title}")
-    st.download_button(
-        f"Download CSV", csv, "export.csv", "text/csv", key=f"{title}-csv"
+    file_format = st.radio(
+        "Format",
+        options=list(EXPORT_FORMATS),
+        key=f"{title}-format",
+        horizontal=True,
+        label_visibility="collapsed",
     )
+    if st.session_state.get(prepared_key) != file_format:
+        st.button(
+            f"Prepare {file_format}",
+            key=f"{title}-prepare",
+            on_click=_prepare,
+            args=(prepared_key, file_format),
+        )
+    else:
+        extension, mime = EXPORT_FORMATS[file_format]
+        st.download_button(
+            f"Download {file_format}",
+            encode_export(df, file_format),
+            f"{title}.{extension}",
+            mime,
+            key=f"{title}-{extension}",
+        )
     st.write(df.head(25))
+
+
+@st.fragment
+def stream_export(title: str, query: str, params: Optional[dict] = None):
+    """
+    Export every row of a query, streamed from the database to a file.
+
+    Unlike `export_data`, the rows never go through a DataFrame: chunks from a
+    server-side stream are written straight to a temporary file on disk, so
+    the export itself holds at most one chunk in memory. The download button
+    still keeps a single copy of the finished file in memory for serving. The
+    query only runs when the user requests the file.
+
+    Args:
+        title (str): Title of the export, also used as the file name
+        query (str): The SQL query, with `:name` bind parameters
+        params (dict, optional): Values of the bind parameters
+    """
+    st.write(f"### {title}")
+    file_format = st.radio(
+        "Format",
+        options=STREAM_FORMATS,
+        key=f"{title}-stream-format",
+        horizontal=True,
+        label_visibility="collapsed",
+    )
+    if st.button(f"Export all rows as {file_format}", key=f"{title}-stream"):
+        extension, mime = EXPORT_FORMATS[file_format]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f"export.{extension}")
+            with st.spinner("Exporting..."):
+                rows = get_api().export_query(
+                    query, path, file_format=extension, params=params
+                )
+            with open(path, "rb") as file:
+                st.download_button(
+                    f"Download {rows:,} rows",
+                    file,
+                    f"{title}.{extension}",
+                    mime,
+                    key=f"{title}-stream-{extension}",
+                )
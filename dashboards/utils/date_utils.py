@@ -1,8 +1,16 @@
 from datetime import datetime, timedelta
 
+from api.windows import floor_datetime
 
-def get_start_date(date_range: str) -> datetime:
-    end_date = datetime.now()
+
+def get_start_date(date_range: str, resolution: str = "daily") -> datetime:
+    """
+    Return the start of a date range, floored to a bucket boundary.
+
+    Flooring keeps the start stable between reruns, so cache keys derived from
+    it keep hitting until the next bucket starts.
+    """
+    end_date = floor_datetime(datetime.now(), resolution)
 
     if date_range == "30d":
         return end_date - timedelta(days=30)
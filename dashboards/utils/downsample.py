@@ -0,0 +1,214 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# width in pixels of a full-width chart, which caps the points worth drawing
+TARGET_WIDTH_PX = 1200
+
+DOWNSAMPLE_METHODS = ("minmax", "lttb")
+
+
+def max_points(target_width: int = TARGET_WIDTH_PX, method: str = "minmax") -> int:
+    """Return the number of points to keep for a chart of `target_width` pixels."""
+    # min/max keeps two points per pixel column, so peaks of both signs survive
+    return 2 * target_width if method == "minmax" else target_width
+
+
+def x_values(x) -> np.ndarray:
+    """Return x as floats, using positions for categorical axes."""
+    index = pd.Index(x)
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(float)
+    if pd.api.types.is_numeric_dtype(index):
+        return index.to_numpy(dtype=float)
+    return np.arange(len(index), dtype=float)
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select the minimum and maximum of equal-count buckets.
+
+    Every bucket of a sorted series keeps its extremes, so peaks and troughs
+    are exact whatever the downsampling factor.
+
+    Args:
+        y (numpy.ndarray): Values, sorted by x
+        n_out (int): Maximum number of points to keep
+
+    Returns:
+        numpy.ndarray: Sorted positions of the points to keep
+    """
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+
+    n_buckets = max((n_out - 2) // 2, 1)
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+
+    # sort by value within each bucket: the first and last rows are the extremes
+    order = np.lexsort((np.nan_to_num(y, nan=0.0), bucket))
+    selected = np.concatenate([[0, n - 1], order[edges[:-1]], order[edges[1:] - 1]])
+    return np.unique(selected)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select points with Largest-Triangle-Three-Buckets.
+
+    Each bucket keeps the point forming the largest triangle with the point
+    kept in the previous bucket and the mean of the next one, which follows
+    the visual shape of the series closely. Areas are computed for a whole
+    bucket at once.
+
+    Args:
+        x (numpy.ndarray): Sorted x values as floats
+        y (numpy.ndarray): Values
+        n_out (int): Maximum number of points to keep
+
+    Returns:
+        numpy.ndarray: Sorted positions of the points to keep
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    y = np.nan_to_num(y, nan=0.0)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return np.unique(selected)
+
+
+def select_indices(x, y: np.ndarray, n_out: int, method: str = "minmax") -> np.ndarray:
+    """
+    Return the positions of the points to keep from a series.
+
+    Args:
+        x: x values, which need not be sorted
+        y (numpy.ndarray): Values
+        n_out (int): Maximum number of points to keep
+        method (str): 'minmax' or 'lttb'
+
+    Returns:
+        numpy.ndarray: Positions in the original series, ordered by x
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Invalid downsample method: {method}")
+
+    xs = x_values(x)
+    order = np.argsort(xs, kind="stable")
+    y = np.asarray(y, dtype=float)[order]
+    if method == "minmax":
+        return order[minmax_indices(y, n_out)]
+    return order[lttb_indices(xs[order], y, n_out)]
+
+
+def _slice_trace(trace, indices: np.ndarray):
+    for attr in ["x", "y", "customdata"]:
+        values = trace[attr]
+        if values is not None and len(values) > 0:
+            trace[attr] = np.asarray(values)[indices]
+
+
+def downsample_traces(
+    traces: List,
+    target_width: int = TARGET_WIDTH_PX,
+    method: str = "minmax",
+    shared_x: bool = False,
+) -> List:
+    """
+    Downsample line and area traces to the points a chart can show.
+
+    Traces with fewer points than the cap are left untouched. Stacked areas
+    need every trace on the same x values, so with `shared_x` the points are
+    selected once from the stacked total and applied to every trace of the
+    same length.
+
+    Args:
+        traces (list): Plotly traces, modified in place
+        target_width (int): Width of the chart in pixels
+        method (str): 'minmax' or 'lttb'
+        shared_x (bool): Whether traces must keep the same x values
+
+    Returns:
+        list: The traces
+    """
+    n_out = max_points(target_width, method)
+    remaining = [trace for trace in traces if trace["y"] is not None]
+    if shared_x and remaining:
+        n = max(len(trace["y"]) for trace in remaining)
+        stacked = [trace for trace in remaining if len(trace["y"]) == n]
+        remaining = [trace for trace in remaining if len(trace["y"]) != n]
+        if n > n_out:
+            total = np.sum(
+                [np.nan_to_num(np.asarray(trace["y"], dtype=float)) for trace in stacked],
+                axis=0,
+            )
+            indices = select_indices(stacked[0]["x"], total, n_out, method)
+            for trace in stacked:
+                _slice_trace(trace, indices)
+
+    for trace in remaining:
+        if len(trace["y"]) > n_out:
+            _slice_trace(trace, select_indices(trace["x"], trace["y"], n_out, method))
+    return traces
+
+
+def downsample_bars(
+    traces: List, target_width: int = TARGET_WIDTH_PX, method: str = "minmax"
+) -> List:
+    """
+    Thin the x values of bar traces to the bars a chart can show.
+
+    Bars have no WebGL renderer, so charts with more bars than pixel columns
+    only draw some of them. The x values are selected once from the stacked
+    total of all traces and every trace keeps its bars at those x values, so
+    the values of the remaining bars and their stacking are unchanged.
+
+    Args:
+        traces (list): Plotly bar traces, modified in place
+        target_width (int): Width of the chart in pixels
+        method (str): 'minmax' or 'lttb'
+
+    Returns:
+        list: The traces
+    """
+    n_out = max_points(target_width, method)
+    remaining = [trace for trace in traces if trace["y"] is not None]
+    if not remaining:
+        return traces
+
+    totals = (
+        pd.concat(
+            [
+                pd.Series(np.asarray(trace["y"], dtype=float), index=trace["x"])
+                for trace in remaining
+            ]
+        )
+        .fillna(0)
+        .groupby(level=0)
+        .sum()
+    )
+    if len(totals) <= n_out:
+        return traces
+
+    kept = totals.index[select_indices(totals.index, totals.to_numpy(), n_out, method)]
+    for trace in remaining:
+        _slice_trace(trace, np.flatnonzero(pd.Index(trace["x"]).isin(kept)))
+    return traces
@@ -0,0 +1,209 @@
+import base64
+import functools
+import json
+import math
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.elements.lib.form_utils import current_form_id
+from streamlit.elements.lib.utils import compute_and_register_element_id
+from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+
+from dashboards.utils.aggregation import shared_aggregations
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# dtypes of the typed arrays plotly.js decodes, by NumPy dtype
+TYPED_ARRAY_DTYPES = {
+    "int8": "i1",
+    "uint8": "u1",
+    "int16": "i2",
+    "uint16": "u2",
+    "int32": "i4",
+    "uint32": "u4",
+    "float32": "f4",
+    "float64": "f8",
+}
+
+# default config of st.plotly_chart
+DEFAULT_CONFIG = {"showLink": False, "linkText": False}
+SELECTION_MODES = ("points", "box", "lasso")
+
+
+class FigureJSON(str):
+    """A Plotly figure serialized to JSON, ready to be sent to the browser."""
+
+
+def _typed_array(values: np.ndarray) -> dict:
+    if values.dtype.kind in "iu" and values.dtype.name not in TYPED_ARRAY_DTYPES:
+        # plotly.js has no 64-bit integers
+        info = np.iinfo(np.int32)
+        in_range = len(values) == 0 or (
+            values.min() >= info.min and values.max() <= info.max
+        )
+        values = values.astype(np.int32 if in_range else np.float64)
+    elif values.dtype.name not in TYPED_ARRAY_DTYPES:
+        values = values.astype(np.float64)
+
+    spec = {
+        "dtype": TYPED_ARRAY_DTYPES[values.dtype.name],
+        "bdata": base64.b64encode(np.ascontiguousarray(values)).decode("ascii"),
+    }
+    if values.ndim > 1:
+        spec["shape"] = ",".join(str(size) for size in values.shape)
+    return spec
+
+
+def _dates(values: np.ndarray) -> Optional[list]:
+    """Return ISO strings for an array of timestamps, or None if it is not one."""
+    if len(values) == 0 or not isinstance(values[0], pd.Timestamp):
+        return None
+    try:
+        index = pd.DatetimeIndex(values)
+    except (TypeError, ValueError):
+        return None
+    if index.tz is not None and str(index.tz) != "UTC":
+        return None
+
+    nanos = index.asi8
+    unit = "s" if np.all(nanos % 1_000_000_000 == 0) else "us"
+    strings = np.datetime_as_string(index.tz_localize(None).values, unit=unit)
+    strings = np.where(index.isna(), None, strings)
+    if index.tz is not None:
+        return [value if value is None else f"{value}+00:00" for value in strings]
+    return strings.tolist()
+
+
+def _to_json_types(value):
+    """Convert a figure dict to JSON types, with numeric arrays as typed arrays."""
+    if isinstance(value, dict):
+        return {key: _to_json_types(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json_types(item) for item in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in "iuf":
+            return _typed_array(value)
+        dates = _dates(value) if value.dtype.kind == "O" and value.ndim == 1 else None
+        if dates is not None:
+            return dates
+        return [_to_json_types(item) for item in value.tolist()]
+    if isinstance(value, (float, np.floating)):
+        # JSON has no NaN or infinity, plotly.js treats null as missing
+        return float(value) if math.isfinite(value) else None
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    return value
+
+
+def figure_to_json(fig) -> FigureJSON:
+    """
+    Serialize a Plotly figure to JSON for the browser.
+
+    Numeric arrays are written as base64 typed arrays, which plotly.js decodes
+    directly, instead of lists of numbers. This makes the JSON smaller and
+    faster to encode than `plotly.io.to_json`. orjson is used when installed.
+
+    Args:
+        fig (plotly.graph_objects.Figure): The figure
+
+    Returns:
+        FigureJSON: The serialized figure
+    """
+    # _to_json_types builds new containers, so the properties of the figure
+    # are read in place rather than through the deep copy of `to_dict`
+    spec = {"data": fig._data, "layout": fig._layout}
+    frames = [frame._props for frame in fig._frame_objs]
+    if frames:
+        spec["frames"] = frames
+    spec = _to_json_types(spec)
+    if orjson is not None:
+        return FigureJSON(orjson.dumps(spec).decode("utf-8"))
+    return FigureJSON(json.dumps(spec, separators=(",", ":")))
+
+
+def cache_figures(ttl=None, max_entries: Optional[int] = None):
+    """
+    Cache a function returning a dict of figures as serialized JSON.
+
+    Works like `st.cache_data`, but figures are serialized once, when the
+    cache is filled. Reruns then load JSON strings instead of unpickling
+    figures, and `plotly_chart` sends them without encoding them again.
+    Values that are not figures, like None, are returned as they are. Charts
+    built in one call share their aggregations, see `shared_aggregations`.
+
+    Args:
+        ttl (str, float or timedelta): Maximum time to keep an entry
+        max_entries (int): Maximum number of entries to keep
+
+    Returns:
+        callable: The decorator
+    """
+
+    def decorator(func):
+        @st.cache_data(ttl=ttl, max_entries=max_entries)
+        @functools.wraps(func)
+        def cached(*args, **kwargs):
+            with shared_aggregations():
+                figures = func(*args, **kwargs)
+            return {
+                name: fig if fig is None else figure_to_json(fig)
+                for name, fig in figures.items()
+            }
+
+        return cached
+
+    return decorator
+
+
+def plotly_chart(
+    figure,
+    use_container_width: bool = False,
+    theme: Optional[str] = "streamlit",
+    key: Optional[str] = None,
+    config: Optional[dict] = None,
+):
+    """
+    Display a Plotly chart from a figure or its serialized JSON.
+
+    A drop-in for `st.plotly_chart` without selections. Serialized figures
+    from `cache_figures` are sent as they are, and figures are serialized with
+    `figure_to_json`, skipping the validation and encoding of
+    `st.plotly_chart`.
+
+    Args:
+        figure (plotly.graph_objects.Figure or FigureJSON): The chart
+        use_container_width (bool): Whether to use the width of the container
+        theme (str): 'streamlit' or None for the Plotly theme
+        key (str): Unique key of the element
+        config (dict): Plotly config options
+    """
+    spec = figure if isinstance(figure, FigureJSON) else figure_to_json(figure)
+    dg = st._main
+
+    proto = PlotlyChartProto()
+    proto.use_container_width = use_container_width
+    proto.theme = theme or ""
+    proto.form_id = current_form_id(dg)
+    proto.spec = spec
+    proto.config = json.dumps({**DEFAULT_CONFIG, **(config or {})})
+    proto.id = compute_and_register_element_id(
+        "plotly_chart",
+        user_key=key,
+        form_id=proto.form_id,
+        plotly_spec=proto.spec,
+        plotly_config=proto.config,
+        selection_mode=SELECTION_MODES,
+        is_selection_activated=False,
+        theme=theme,
+        use_container_width=use_container_width,
+    )
+    return dg._enqueue("plotly_chart", proto)
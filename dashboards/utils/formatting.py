@@ -1,3 +1,7 @@
+import numpy as np
+from numpy.dtypes import StringDType
+
+
 def human_format(num, no_decimals=False, percentage=False):
     if percentage:
         return f"{num:.2%}"
@@ -34,3 +38,103 @@ def human_format(num, no_decimals=False, percentage=False):
 
     # Return the formatted number with the appropriate suffix
     return f"{formatted_num}{magnitude_labels[magnitude]}"
+
+
+MAGNITUDE_LABELS = np.array(["", "K", "M", "B", "T"], dtype=StringDType())
+
+
+def _fixed(values: np.ndarray, decimals: int) -> np.ndarray:
+    """Format floats with a fixed number of decimals, like f"{num:.{decimals}f}"."""
+    out = np.empty(values.shape, dtype=StringDType())
+
+    # round in integer arithmetic, except for values whose scaled product lands
+    # on a half (the true binary value may round either way), large and
+    # non-finite values: those fall back to printf-style formatting
+    product = np.abs(values) * 10**decimals
+    with np.errstate(invalid="ignore"):
+        exact = (product < 1e12) & (product % 1 != 0.5)
+    scaled = np.round(product[exact]).astype(np.int64)
+    text = (scaled // 10**decimals).astype(StringDType())
+    if decimals > 0:
+        fraction = (scaled % 10**decimals).astype(StringDType())
+        text = text + "." + np.strings.zfill(fraction, decimals)
+    out[exact] = np.where(np.signbit(values[exact]), "-", "") + text
+    out[~exact] = np.char.mod(f"%.{decimals}f", values[~exact])
+    return out
+
+
+def _significant(values: np.ndarray) -> np.ndarray:
+    """Format floats below 1 with 3 significant digits, like f"{num:.3g}"."""
+    out = np.empty(values.shape, dtype=StringDType())
+
+    # fixed notation down to 1e-4, with the decimals given by the exponent;
+    # smaller values use scientific notation and fall back to printf-style
+    fixed = np.abs(values) >= 1e-4
+    num = values[fixed]
+    with np.errstate(divide="ignore"):
+        exponent = np.floor(np.log10(np.abs(num))).astype(int)
+    exponent += np.abs(num) >= 10.0 ** (exponent + 1)
+    exponent -= np.abs(num) < 10.0**exponent
+    formatted = np.empty(num.shape, dtype=StringDType())
+    for decimals in np.unique(2 - exponent):
+        mask = 2 - exponent == decimals
+        formatted[mask] = _fixed(num[mask], decimals)
+    # like "g", drop trailing zeros and a trailing decimal point
+    formatted = np.strings.rstrip(np.strings.rstrip(formatted, "0"), ".")
+    out[fixed] = formatted
+    out[~fixed] = np.char.mod("%.3g", values[~fixed])
+    return out
+
+
+def human_format_array(values, no_decimals=False, percentage=False) -> np.ndarray:
+    """
+    Format an array of numbers like `human_format`, without a Python call per value.
+
+    The magnitude of every value is found with log10, then values are scaled,
+    rounded and suffixed array-wise. Results match `human_format` except for
+    values exactly halfway between two roundings, and values above the
+    trillions keep the 'T' suffix instead of raising.
+
+    Args:
+        values (array-like): Numbers to format
+        no_decimals (bool): Format values below 100 without decimals
+        percentage (bool): Format values as percentages with two decimals
+
+    Returns:
+        numpy.ndarray: Object array of the formatted strings
+    """
+    values = np.asarray(values, dtype=float)
+    if percentage:
+        return (_fixed(values * 100, 2) + "%").astype(object)
+
+    out = np.empty(values.shape, dtype=StringDType())
+    zero = values == 0
+    whole = ~zero & (values < 100) & no_decimals
+    small = ~zero & ~whole & (np.abs(values) < 1)
+    rest = ~(zero | whole | small)
+
+    out[zero] = "0"
+    out[whole] = _fixed(values[whole], 0)
+    out[small] = _significant(values[small])
+
+    # scale to 3 integer digits at most, correcting log10 rounding at the edges
+    num = values[rest]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        magnitude = np.floor(np.log10(np.abs(num)) / 3)
+    magnitude = np.nan_to_num(magnitude, nan=0, posinf=0).clip(0, 4).astype(int)
+    num = num / 1000.0**magnitude
+    up = (np.abs(num) >= 1000) & (magnitude < 4) & np.isfinite(num)
+    down = (np.abs(num) < 1) & (magnitude > 0)
+    magnitude = magnitude + up - down
+    num = np.where(up, num / 1000, np.where(down, num * 1000, num))
+
+    # 3 significant digits: no decimals from 100, one from 10, two below
+    formatted = np.empty(num.shape, dtype=StringDType())
+    for decimals, mask in [
+        (0, num >= 100),
+        (1, (num >= 10) & (num < 100)),
+        (2, ~(num >= 10)),
+    ]:
+        formatted[mask] = _fixed(num[mask], decimals)
+    out[rest] = formatted + MAGNITUDE_LABELS[magnitude]
+    return out.astype(object)
@@ -1,9 +1,14 @@
-import streamlit as st
+import argparse
+import copy
+import sys
 import time
 import logging
-from typing import Dict, List, Tuple, TypedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, TypedDict
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
+from api.coalesce import SingleFlight
 
 logging.basicConfig(
     level=logging.INFO,
@@ -12,49 +17,91 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# cache modes: 'cold' queries the database on every run, 'warm' after the
+# result cache has been populated by the warmup runs
+CACHE_MODES = ("cold", "warm")
+
+# columns identifying a scenario when comparing against a baseline
+SCENARIO_COLUMNS = ["query_name", "chain", "date_range", "concurrency", "cache"]
+
 
 class BenchmarkData(TypedDict):
     query_name: str
+    date_range: str
     params: dict
+    concurrency: int
+    cache: str
     execution_times: List[float]
     errors: List[str]
+    wall_time: float
 
 
-def create_benchmark_data(query_name: str, params: dict) -> BenchmarkData:
+def create_benchmark_data(
+    query_name: str, date_range: str, params: dict, concurrency: int, cache: str
+) -> BenchmarkData:
     """Create a new benchmark data dictionary."""
     return {
         "query_name": query_name,
+        "date_range": date_range,
         "params": params,
+        "concurrency": concurrency,
+        "cache": cache,
         "execution_times": [],
         "errors": [],
+        "wall_time": 0,
     }
 
 
 def calculate_stats(benchmark_data: BenchmarkData) -> Dict[str, float]:
     """Calculate statistics for a benchmark result."""
-    times = benchmark_data["execution_times"]
-    if not times:
-        return {"avg_time": 0, "min_time": 0, "max_time": 0, "success_rate": 0}
+    times = np.array(benchmark_data["execution_times"])
+    if len(times) == 0:
+        return {
+            "avg_time": 0,
+            "min_time": 0,
+            "max_time": 0,
+            "p50_time": 0,
+            "p95_time": 0,
+            "p99_time": 0,
+            "throughput": 0,
+            "success_rate": 0,
+        }
 
     total_attempts = len(times) + len(benchmark_data["errors"])
+    p50, p95, p99 = np.percentile(times, [50, 95, 99])
     return {
-        "avg_time": sum(times) / len(times),
-        "min_time": min(times),
-        "max_time": max(times),
+        "avg_time": times.mean(),
+        "min_time": times.min(),
+        "max_time": times.max(),
+        "p50_time": p50,
+        "p95_time": p95,
+        "p99_time": p99,
+        "throughput": (
+            len(times) / benchmark_data["wall_time"]
+            if benchmark_data["wall_time"] > 0
+            else 0
+        ),
         "success_rate": len(times) / total_attempts if total_attempts > 0 else 0,
     }
 
 
 def time_query(api, query_name: str, *args, **kwargs) -> float:
-    """Execute a query and measure its execution time."""
-    start_time = time.time()
+    """Execute a query and measure its execution time in seconds."""
+    start_time = time.perf_counter_ns()
     getattr(api, query_name)(*args, **kwargs)
-    end_time = time.time()
-    return end_time - start_time
+    end_time = time.perf_counter_ns()
+    return (end_time - start_time) / 1e9
 
 
-def generate_scenarios(api) -> List[Tuple[str, dict]]:
-    """Generate test scenarios for benchmarking."""
+def generate_scenarios(
+    api, queries: Optional[Sequence[str]] = None
+) -> List[Tuple[str, str, dict]]:
+    """
+    Generate test scenarios for benchmarking.
+
+    Returns:
+        list: (query_name, date_range, params) tuples
+    """
     end_date = datetime.now()
     date_ranges = {
         "1d": end_date - timedelta(days=1),
@@ -62,16 +109,18 @@ def generate_scenarios(api) -> List[Tuple[str, dict]]:
         "30d": end_date - timedelta(days=30),
     }
 
-    queries = [
-        method
-        for method in dir(api)
-        if method.startswith("get_") and callable(getattr(api, method))
-    ]
+    if queries is None:
+        queries = [
+            method
+            for method in dir(api)
+            if method.startswith("get_") and callable(getattr(api, method))
+        ]
     v3_queries = [query for query in queries if "v2" not in query]
 
     scenarios = [
         (
             query_name,
+            date_range,
             {
                 "start_date": start_date,
                 "end_date": end_date,
@@ -79,37 +128,123 @@ def generate_scenarios(api) -> List[Tuple[str, dict]]:
             },
         )
         for query_name in v3_queries
-        for start_date_label, start_date in date_ranges.items()
+        for date_range, start_date in date_ranges.items()
         for chain in ["arbitrum_mainnet", "base_mainnet"]
     ]
 
     return scenarios
 
 
-def run_benchmarks(api, num_runs: int = 3) -> Dict[str, BenchmarkData]:
-    """Run benchmarks for all scenarios."""
+def get_cache_api(api, cache: str):
+    """
+    Return the API to benchmark a cache mode with.
+
+    Runs use a shallow copy of the API, which shares the connection pool and
+    result cache of the original but does not coalesce concurrent identical
+    queries, so every call of a run reaches the cache or the database. Cold
+    runs also drop the result cache, without clearing the cache of the original.
+    """
+    bench_api = copy.copy(api)
+    if hasattr(api, "single_flight"):
+        bench_api.single_flight = SingleFlight(coalesce=False)
+    if cache == "cold":
+        bench_api.cache = None
+    return bench_api
+
+
+def run_scenario(
+    api,
+    benchmark_data: BenchmarkData,
+    num_runs: int = 3,
+    warmup: int = 1,
+):
+    """
+    Run a single scenario, recording the time of every call.
+
+    Every run submits `concurrency` identical calls at once. Pass an API from
+    `get_cache_api`, which runs every call, so concurrency levels above one
+    exercise the connection pool.
+    """
+    query_name = benchmark_data["query_name"]
+    params = benchmark_data["params"]
+    concurrency = benchmark_data["concurrency"]
+
+    for _ in range(warmup):
+        try:
+            time_query(api, query_name, **params)
+        except Exception as e:
+            logger.debug(f"  Warmup failed: {e}")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start_time = time.perf_counter_ns()
+        for run in range(num_runs):
+            logger.debug(f"  Run {run + 1}/{num_runs}")
+            futures = [
+                executor.submit(time_query, api, query_name, **params)
+                for _ in range(concurrency)
+            ]
+            for future in futures:
+                try:
+                    benchmark_data["execution_times"].append(future.result())
+                except Exception as e:
+                    error_msg = f"Error in run {run + 1}: {str(e)}"
+                    benchmark_data["errors"].append(error_msg)
+                    logger.error(error_msg)
+        benchmark_data["wall_time"] = (time.perf_counter_ns() - start_time) / 1e9
+
+
+def run_benchmarks(
+    api,
+    num_runs: int = 3,
+    warmup: int = 1,
+    concurrency_levels: Sequence[int] = (1,),
+    cache_modes: Sequence[str] = ("cold",),
+    queries: Optional[Sequence[str]] = None,
+) -> Dict[str, BenchmarkData]:
+    """
+    Run benchmarks for all scenarios.
+
+    Args:
+        api (SynthetixAPI): The API to benchmark
+        num_runs (int): Timed runs per scenario
+        warmup (int): Untimed runs per scenario before the timed runs
+        concurrency_levels (list): Numbers of parallel clients to run
+        cache_modes (list): Cache modes to run ('cold' and/or 'warm')
+        queries (list, optional): get_* methods to run. Defaults to all V3 queries.
+
+    Returns:
+        dict: Benchmark data by scenario
+    """
     logger.info("Starting benchmark run")
-    scenarios = generate_scenarios(api)
+    if "warm" in cache_modes and api.cache is None:
+        logger.warning("The API has no result cache, skipping warm scenarios")
+        cache_modes = [mode for mode in cache_modes if mode != "warm"]
+
+    scenarios = [
+        (scenario, concurrency, cache)
+        for scenario in generate_scenarios(api, queries)
+        for concurrency in concurrency_levels
+        for cache in cache_modes
+    ]
     results: Dict[str, BenchmarkData] = {}
 
     total_scenarios = len(scenarios)
-    for idx, (query_name, params) in enumerate(scenarios, 1):
-        scenario_key = f"{query_name} - {params}"
+    for idx, ((query_name, date_range, params), concurrency, cache) in enumerate(
+        scenarios, 1
+    ):
+        scenario_key = (
+            f"{query_name} - {params['chain']} - {date_range}"
+            f" - x{concurrency} - {cache}"
+        )
         logger.info(f"Running scenario {idx}/{total_scenarios}: {scenario_key}")
 
-        benchmark_data = create_benchmark_data(query_name, params)
+        benchmark_data = create_benchmark_data(
+            query_name, date_range, params, concurrency, cache
+        )
         results[scenario_key] = benchmark_data
-
-        for run in range(num_runs):
-            try:
-                logger.debug(f"  Run {run + 1}/{num_runs}")
-                execution_time = time_query(api, query_name, **params)
-                benchmark_data["execution_times"].append(execution_time)
-                logger.debug(f"  Completed in {execution_time:.4f} seconds")
-            except Exception as e:
-                error_msg = f"Error in run {run + 1}: {str(e)}"
-                benchmark_data["errors"].append(error_msg)
-                logger.error(error_msg)
+        run_scenario(
+            get_cache_api(api, cache), benchmark_data, num_runs=num_runs, warmup=warmup
+        )
 
     logger.info("Benchmark run completed")
     return results
@@ -124,10 +259,10 @@ def create_benchmark_dataframe(results: Dict[str, BenchmarkData]) -> pd.DataFram
 
         row = {
             "query_name": benchmark_data["query_name"],
-            "avg_time": stats["avg_time"],
-            "min_time": stats["min_time"],
-            "max_time": stats["max_time"],
-            "success_rate": stats["success_rate"],
+            "date_range": benchmark_data["date_range"],
+            "concurrency": benchmark_data["concurrency"],
+            "cache": benchmark_data["cache"],
+            **stats,
             "error_count": len(benchmark_data["errors"]),
         }
         row.update(params)
@@ -136,6 +271,33 @@ def create_benchmark_dataframe(results: Dict[str, BenchmarkData]) -> pd.DataFram
     return pd.DataFrame(data)
 
 
+def compare_to_baseline(
+    df: pd.DataFrame, df_baseline: pd.DataFrame, threshold: float = 0.1
+) -> pd.DataFrame:
+    """
+    Compare benchmark results to a saved baseline.
+
+    Args:
+        df (pandas.DataFrame): Results from `create_benchmark_dataframe`
+        df_baseline (pandas.DataFrame): Baseline results in the same format
+        threshold (float): Relative p95 increase counted as a regression
+
+    Returns:
+        pandas.DataFrame: Scenarios in both runs with their p95 times, the
+            relative change and whether it regressed
+    """
+    df_compare = df[SCENARIO_COLUMNS + ["p95_time"]].merge(
+        df_baseline[SCENARIO_COLUMNS + ["p95_time"]],
+        on=SCENARIO_COLUMNS,
+        suffixes=("", "_baseline"),
+    )
+    df_compare["p95_change"] = (
+        df_compare["p95_time"] / df_compare["p95_time_baseline"] - 1
+    )
+    df_compare["regressed"] = df_compare["p95_change"] > threshold
+    return df_compare.sort_values("p95_change", ascending=False)
+
+
 def print_report(results: Dict[str, BenchmarkData]):
     """Print a formatted report of benchmark results."""
     print("\nSynthetixAPI Benchmark Report")
@@ -164,9 +326,13 @@ def print_report(results: Dict[str, BenchmarkData]):
             continue
 
         stats = calculate_stats(benchmark_data)
-        print(f"  Average execution time: {stats['avg_time']:.4f} seconds")
+        print(
+            f"  p50 / p95 / p99: {stats['p50_time']:.4f} / "
+            f"{stats['p95_time']:.4f} / {stats['p99_time']:.4f} seconds"
+        )
         print(f"  Min execution time: {stats['min_time']:.4f} seconds")
         print(f"  Max execution time: {stats['max_time']:.4f} seconds")
+        print(f"  Throughput: {stats['throughput']:.2f} queries/second")
         print(f"  Success rate: {stats['success_rate'] * 100:.1f}%")
 
         if benchmark_data["errors"]:
@@ -183,14 +349,58 @@ def save_results(df: pd.DataFrame, prefix: str = "benchmark_results") -> str:
     return filename
 
 
-if __name__ == "__main__":
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the benchmarks from the command line.
+
+    The database is configured with the DB_* environment variables, so the
+    suite can run against a local postgres seeded with synthetic data.
+
+    Returns:
+        int: 1 if any scenario regressed against the baseline, otherwise 0
+    """
+    from api.cache import get_result_cache
+    from api.internal_api import SynthetixAPI, get_db_config
+
+    parser = argparse.ArgumentParser(description="Benchmark the SynthetixAPI")
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs first")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1], help="parallel clients"
+    )
+    parser.add_argument(
+        "--cache", nargs="+", choices=CACHE_MODES, default=["cold"], help="cache modes"
+    )
+    parser.add_argument("--queries", nargs="+", help="get_* methods to run")
+    parser.add_argument("--baseline", help="baseline CSV to compare against")
+    parser.add_argument("--save-baseline", help="save the results as a baseline CSV")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative p95 increase that fails the run",
+    )
+    args = parser.parse_args(argv)
+
     logger.info("Initializing benchmark script")
 
     db_config = get_db_config(streamlit=False)
-    api = SynthetixAPI(db_config, environment="prod", streamlit=False)
+    api = SynthetixAPI(
+        db_config,
+        environment="prod",
+        streamlit=False,
+        cache=get_result_cache(streamlit=False),
+    )
 
     # Run benchmarks
-    results = run_benchmarks(api)
+    results = run_benchmarks(
+        api,
+        num_runs=args.runs,
+        warmup=args.warmup,
+        concurrency_levels=args.concurrency,
+        cache_modes=args.cache,
+        queries=args.queries,
+    )
 
     # Create DataFrame
     df = create_benchmark_dataframe(results)
@@ -201,3 +411,27 @@ if __name__ == "__main__":
     # Save results
     csv_filename = save_results(df)
     logger.info(f"Results saved to {csv_filename}")
+    if args.save_baseline:
+        df.to_csv(args.save_baseline, index=False)
+        logger.info(f"Baseline saved to {args.save_baseline}")
+
+    # Compare to the baseline
+    if args.baseline:
+        df_compare = compare_to_baseline(
+            df, pd.read_csv(args.baseline), threshold=args.threshold
+        )
+        print("\nBaseline Comparison:")
+        print("--------------------")
+        print(df_compare.to_string(index=False))
+        regressions = df_compare[df_compare["regressed"]]
+        if not regressions.empty:
+            logger.error(
+                f"{len(regressions)} scenarios regressed by more than "
+                f"{args.threshold:.0%} at p95"
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,436 @@
+import argparse
+import collections
+import functools
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from dashboards.utils.warmup import set_api
+
+logger = logging.getLogger(__name__)
+
+# phases of a page render, in the order they usually run. Time not spent in
+# any other phase, such as widgets and layout, is attributed to 'other'.
+PHASES = ("fetch", "transform", "charts", "serialize", "export", "other")
+
+V3_MODULES = "dashboards.all_metrics.modules.v3"
+V2_MODULES = "dashboards.all_metrics.modules.v2"
+
+# pages of the all_metrics dashboard: module and the session state set by its view
+PAGES: Dict[str, Tuple[str, dict]] = {
+    "all_core": (f"{V3_MODULES}.all_core", {}),
+    "all_perps": (f"{V3_MODULES}.all_perps", {}),
+    "eth_mainnet/chain_core_stats": (
+        f"{V3_MODULES}.chain_core_stats",
+        {"chain": "eth_mainnet"},
+    ),
+    **{
+        f"{chain}/{module}": (f"{V3_MODULES}.{module}", {"chain": chain})
+        for chain in ["arbitrum_mainnet", "base_mainnet"]
+        for module in [
+            "chain_core_stats",
+            "chain_perp_stats",
+            "chain_perp_markets",
+            "chain_perp_monitor",
+            "chain_perp_integrators",
+            "chain_perp_keepers",
+            "chain_perp_account",
+            "chain_spot_markets",
+        ]
+    },
+    **{
+        f"optimism_mainnet/{module}": (
+            f"{V2_MODULES}.{module}",
+            {"chain": "optimism_mainnet"},
+        )
+        for module in ["perp_stats", "perp_monitor", "perp_markets", "perp_integrators"]
+    },
+}
+
+# profiler of the page being rendered, read by the AppTest script
+_active = None
+
+
+class StackSampler:
+    """
+    Sample the call stack of one thread into collapsed stacks.
+
+    The output has one line per distinct stack, with frames separated by ';'
+    and followed by the number of samples, which flamegraph.pl, speedscope
+    and similar tools render as a flamegraph.
+    """
+
+    def __init__(self, interval: float = 0.001, root: Optional[Callable] = None):
+        """
+        Args:
+            interval (float): Seconds between samples
+            root (callable, optional): Function where stacks start. Frames
+                above it, such as the script runner, are dropped.
+        """
+        self.interval = interval
+        self.root = root.__code__ if root else None
+        self.counts = collections.Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _fold(self, frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            )
+            if code is self.root:
+                break
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def _run(self, thread_id: int):
+        while not self._stop.is_set():
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                self.counts[self._fold(frame)] += 1
+            del frame
+            time.sleep(self.interval)
+
+    def start(self, thread_id: Optional[int] = None):
+        """Start sampling a thread, by default the calling one."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(thread_id or threading.get_ident(),),
+            name="stack-sampler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write(self, path: str) -> str:
+        """Write the collapsed stacks to a file."""
+        with open(path, "w") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+class PhaseProfiler:
+    """
+    Attribute the time and memory of a page render to phases.
+
+    Phases nest, e.g. queries run inside `fetch_data`, and time is exclusive:
+    a parent phase is paused while a child runs, so phase times add up to the
+    render time. Memory is the peak traced allocation above the start of a
+    phase, including its children, and is only measured while tracemalloc is
+    tracing.
+    """
+
+    def __init__(self, sampler: Optional[StackSampler] = None):
+        """
+        Args:
+            sampler (StackSampler, optional): Sampler started with the render
+                to collect stacks for a flamegraph
+        """
+        self.sampler = sampler
+        self.stats = {
+            phase: {"seconds": 0.0, "calls": 0, "peak_bytes": 0} for phase in PHASES
+        }
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _memory() -> Tuple[int, int]:
+        if not tracemalloc.is_tracing():
+            return 0, 0
+        return tracemalloc.get_traced_memory()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Context manager attributing the time and memory of a block to a phase."""
+        stack = self._local.__dict__.setdefault("stack", [])
+        now = time.perf_counter()
+        current, peak = self._memory()
+        if stack:
+            parent = stack[-1]
+            parent["seconds"] += now - parent["start"]
+            parent["peak"] = max(parent["peak"], peak)
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        frame = {"start": now, "seconds": 0.0, "base": current, "peak": current}
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            frame["seconds"] += time.perf_counter() - frame["start"]
+            frame["peak"] = max(frame["peak"], self._memory()[1])
+            stack.pop()
+            with self._lock:
+                stats = self.stats[name]
+                stats["seconds"] += frame["seconds"]
+                stats["calls"] += 1
+                stats["peak_bytes"] = max(
+                    stats["peak_bytes"], frame["peak"] - frame["base"]
+                )
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], frame["peak"])
+                stack[-1]["start"] = time.perf_counter()
+
+    def wrap(self, fn: Callable, name: str) -> Callable:
+        """Wrap a function so its calls are attributed to a phase."""
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+
+def instrument(module, api, profiler: PhaseProfiler) -> Callable[[], None]:
+    """
+    Patch a dashboard module and the API to report phases to a profiler.
+
+    - fetch: queries run through `api._run_query`
+    - transform: the rest of `fetch_data`, including `st.cache_data` hashing
+    - charts: `make_charts`, building the Plotly figures
+    - serialize: `st.plotly_chart` and the `plotly_chart` of `cache_figures`
+      pages, converting figures to JSON
+    - export: `export_data`, previews and requested downloads
+
+    Returns:
+        callable: Function that removes the patches
+    """
+    patches = [
+        (api, "_run_query", "fetch"),
+        (module, "fetch_data", "transform"),
+        (module, "make_charts", "charts"),
+        (st, "plotly_chart", "serialize"),
+        (module, "plotly_chart", "serialize"),
+        (module, "export_data", "export"),
+    ]
+    originals = []
+    for target, attr, phase in patches:
+        if not hasattr(target, attr):
+            continue
+        original = getattr(target, attr)
+        originals.append((target, attr, original, attr in vars(target)))
+        setattr(target, attr, profiler.wrap(original, phase))
+
+    def restore():
+        for target, attr, original, own in reversed(originals):
+            if own:
+                setattr(target, attr, original)
+            else:
+                delattr(target, attr)
+
+    return restore
+
+
+def render_page(module_name: str):
+    """Render a module's page under the active profiler. Runs inside AppTest."""
+    module = importlib.import_module(module_name)
+    profiler = _active
+    if profiler.sampler is not None:
+        profiler.sampler.start()
+    try:
+        with profiler.phase("other"):
+            module.main()
+    finally:
+        if profiler.sampler is not None:
+            profiler.sampler.stop()
+
+
+def _page_script(module_name):
+    from dashboards.utils import profiling
+
+    profiling.render_page(module_name)
+
+
+def profile_page(
+    api,
+    module_name: str,
+    state: Optional[dict] = None,
+    track_memory: bool = True,
+    sampler: Optional[StackSampler] = None,
+    timeout: float = 300,
+) -> dict:
+    """
+    Render a module's page headlessly and measure its phases.
+
+    The page runs in Streamlit's AppTest with empty `st.cache_data` caches for
+    the module, so every phase does its full work as on a first visit.
+
+    Args:
+        api (SynthetixAPI): API used by the page's `fetch_data`
+        module_name (str): Import path of the module, e.g.
+            'dashboards.all_metrics.modules.v3.chain_perp_stats'
+        state (dict, optional): Session state set before the render, e.g.
+            the chain set by the page's view
+        track_memory (bool): Whether to trace memory, which slows the render
+        sampler (StackSampler, optional): Sampler collecting the render's stacks
+        timeout (float): Seconds before the render is stopped
+
+    Returns:
+        dict: Wall time, errors and the stats of every phase
+    """
+    global _active
+    from streamlit.testing.v1 import AppTest
+
+    module = importlib.import_module(module_name)
+    module.fetch_data.clear()
+    module.make_charts.clear()
+
+    profiler = PhaseProfiler(sampler=sampler)
+    set_api(api)
+    restore = instrument(module, api, profiler)
+    _active = profiler
+    if track_memory:
+        tracemalloc.start()
+    try:
+        at = AppTest.from_function(
+            _page_script, args=(module_name,), default_timeout=timeout
+        )
+        for key, value in (state or {}).items():
+            at.session_state[key] = value
+        start = time.perf_counter()
+        at.run()
+        wall_seconds = time.perf_counter() - start
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+        _active = None
+        restore()
+
+    return {
+        "wall_seconds": wall_seconds,
+        "errors": [exception.message for exception in at.exception],
+        "phases": profiler.stats,
+    }
+
+
+def profile_pages(
+    api,
+    pages: Optional[List[str]] = None,
+    track_memory: bool = True,
+    flamegraph: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Profile the render of several pages.
+
+    Args:
+        api (SynthetixAPI): API used by the pages
+        pages (list, optional): Names of PAGES to profile. Defaults to all.
+        track_memory (bool): Whether to trace memory
+        flamegraph (str, optional): Path of a collapsed-stack file written
+            for the slowest page, which is rendered again under a sampler
+
+    Returns:
+        pandas.DataFrame: One row per page and phase, with seconds, calls,
+            peak memory in MB and the phase's share of the render
+    """
+    rows = []
+    for page in pages or PAGES:
+        module_name, state = PAGES[page]
+        logger.info(f"Profiling {page}")
+        result = profile_page(api, module_name, state, track_memory=track_memory)
+        total = sum(stats["seconds"] for stats in result["phases"].values())
+        for phase, stats in result["phases"].items():
+            rows.append(
+                {
+                    "page": page,
+                    "phase": phase,
+                    "seconds": stats["seconds"],
+                    "calls": stats["calls"],
+                    "peak_mb": stats["peak_bytes"] / 1e6,
+                    "share": stats["seconds"] / total if total else 0,
+                    "wall_seconds": result["wall_seconds"],
+                    "errors": "; ".join(result["errors"]),
+                }
+            )
+    df = pd.DataFrame(rows)
+
+    if flamegraph and not df.empty:
+        slowest = df.groupby("page")["seconds"].sum().idxmax()
+        module_name, state = PAGES[slowest]
+        sampler = StackSampler(root=render_page)
+        profile_page(api, module_name, state, track_memory=False, sampler=sampler)
+        sampler.write(flamegraph)
+        logger.info(f"Flamegraph stacks of {slowest} saved to {flamegraph}")
+    return df
+
+
+def print_report(df: pd.DataFrame):
+    """Print the seconds spent in each phase per page, slowest pages first."""
+    print("\nPage Render Profile")
+    print("===================")
+    seconds = df.pivot(index="page", columns="phase", values="seconds")[list(PHASES)]
+    seconds["total"] = seconds.sum(axis=1)
+    print(seconds.sort_values("total", ascending=False).round(3).to_string())
+
+    if df["peak_mb"].any():
+        print("\nPeak memory (MB)")
+        print("----------------")
+        memory = df.pivot(index="page", columns="phase", values="peak_mb")[list(PHASES)]
+        print(memory.loc[seconds.sort_values("total", ascending=False).index].round(1).to_string())
+
+    errors = df.loc[df["errors"] != "", ["page", "errors"]].drop_duplicates()
+    for _, row in errors.iterrows():
+        print(f"\n{row['page']} raised: {row['errors']}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Profile page renders from the command line.
+
+    The database is configured with the DB_* environment variables, so pages
+    can be profiled against a local postgres seeded with `api.synthetic`.
+    """
+    from api.internal_api import SynthetixAPI, get_db_config
+
+    parser = argparse.ArgumentParser(description="Profile dashboard page renders")
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), help="pages to profile")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip tracemalloc, for exact timings"
+    )
+    parser.add_argument(
+        "--flamegraph", help="collapsed-stack file for the slowest page"
+    )
+    parser.add_argument("--environment", default="prod")
+    args = parser.parse_args(argv)
+
+    api = SynthetixAPI(
+        get_db_config(streamlit=False),
+        environment=args.environment,
+        streamlit=False,
+    )
+    df = profile_pages(
+        api,
+        pages=args.pages,
+        track_memory=not args.no_memory,
+        flamegraph=args.flamegraph,
+    )
+    print_report(df)
+
+    filename = f"render_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    df.to_csv(filename, index=False)
+    logger.info(f"Results saved to {filename}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,127 @@
+from typing import List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class SplitSeries(NamedTuple):
+    """Series of a long DataFrame split by a label column, one per label."""
+
+    labels: List
+    x: List
+    y: List
+    last: np.ndarray
+
+
+def split_series(df, x_col: str, y_col: str, by: str, align: bool = False) -> SplitSeries:
+    """
+    Split a long DataFrame into one series per label with a single sort.
+
+    Rows are ordered by label once and every series is a slice of the sorted
+    columns, instead of a groupby with one filter per label. Labels are
+    sorted and rows without a label are dropped, like `DataFrame.groupby`.
+
+    With `align`, every series is laid on the sorted union of the x values
+    through one pivot: the first row of each label and x is kept and missing
+    points are filled with 0, as stacked areas need.
+
+    Args:
+        df (pandas.DataFrame): Data in long format
+        x_col (str): Column of the x values
+        y_col (str): Column of the y values
+        by (str): Column of the labels
+        align (bool): Whether to put every series on the same x values
+
+    Returns:
+        SplitSeries: Labels, x and y of every series, and the last y value of
+            each, which ranks the series without reading the traces back
+    """
+    codes, labels = pd.factorize(df[by], sort=True)
+    labels = list(labels)
+    valid = codes >= 0
+
+    if align:
+        x = df[x_col].to_numpy()[valid]
+        codes = codes[valid]
+        axis = pd.Index(pd.unique(x)).sort_values()
+        positions = axis.get_indexer(x)
+
+        # keep the first row of every (label, x) pair
+        keys = codes.astype(np.int64) * len(axis) + positions
+        keys, first = np.unique(keys, return_index=True)
+        values = np.zeros((len(labels), len(axis)))
+        values.flat[keys] = df[y_col].to_numpy(dtype=float)[valid][first]
+
+        last = values[:, -1] if len(axis) > 0 else np.zeros(len(labels))
+        return SplitSeries(labels, [axis] * len(labels), list(values), last)
+
+    order = np.argsort(codes, kind="stable")[np.count_nonzero(~valid) :]
+    bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+    xs = df[x_col].iloc[order]
+    ys = df[y_col].iloc[order]
+    x = [xs.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    y = [ys.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    ends = bounds[1:]
+    last = np.zeros(len(labels))
+    filled = ends > bounds[:-1]
+    last[filled] = ys.to_numpy(dtype=float)[ends[filled] - 1]
+    return SplitSeries(labels, x, y, last)
+
+
+def rank_by_last_value(last: np.ndarray, sort_ascending: bool = False) -> np.ndarray:
+    """
+    Return the order of series sorted by their last value.
+
+    The sort is stable in both directions, so series with equal last values
+    keep their order. Missing last values come last.
+
+    Args:
+        last (numpy.ndarray): Last value of every series
+        sort_ascending (bool): Whether to put the smallest value first
+
+    Returns:
+        numpy.ndarray: Positions of the series in ranked order
+    """
+    last = np.asarray(last, dtype=float)
+    return np.argsort(last if sort_ascending else -last, kind="stable")
+
+
+def fold_tail(
+    df, x_col: str, y_col: str, by: str, max_points: int, other_label: str = "Other"
+) -> pd.DataFrame:
+    """
+    Fold the smallest labels into one so a long DataFrame fits a point budget.
+
+    Labels are ranked by the total absolute value of `y_col`. The most labels
+    whose rows fit in `max_points` together with one folded point per x value
+    are kept, and the rest are summed for every x value under `other_label`,
+    so stacked totals are unchanged. When even a single label and the folded
+    rows exceed the budget, folding cannot help and the data is returned as is.
+
+    Args:
+        df (pandas.DataFrame): Data in long format
+        x_col (str): Column of the x values
+        y_col (str): Column of the y values
+        by (str): Column of the labels
+        max_points (int): Maximum number of (label, x) points to keep
+        other_label (str): Label of the folded rows
+
+    Returns:
+        pandas.DataFrame: The data, with the tail labels folded
+    """
+    if len(df) <= max_points:
+        return df
+
+    totals = df[y_col].abs().groupby(df[by]).sum().sort_values(ascending=False)
+    rows = df[by].value_counts().reindex(totals.index).to_numpy()
+    # the folded label has at most one point per x value
+    fits = np.cumsum(rows) + df[x_col].nunique() <= max_points
+    keep = int(np.count_nonzero(fits))
+    if keep < 1 or keep + 1 >= len(totals):
+        return df
+
+    tail = df[by].isin(totals.index[keep:])
+    other = df[tail].groupby(x_col, as_index=False)[y_col].sum()
+    other[by] = other_label
+    return pd.concat([df[~tail], other], ignore_index=True)
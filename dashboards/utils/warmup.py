@@ -0,0 +1,25 @@
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from api.internal_api import SynthetixAPI
+
+# API used by fetches that run outside of a user session, such as cache warmup
+_api = None
+
+
+def set_api(api: SynthetixAPI):
+    """Set the process-wide API used outside of user sessions."""
+    global _api
+    _api = api
+
+
+def get_api() -> SynthetixAPI:
+    """
+    Return the API for the current session, or the process-wide API when
+    called from a background thread without a session.
+    """
+    if get_script_run_ctx(suppress_warning=True) is not None and "api" in st.session_state:
+        return st.session_state.api
+    if _api is None:
+        raise RuntimeError("No API set, call set_api first")
+    return _api
@@ -0,0 +1,99 @@
+import asyncio
+import weakref
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from api.async_api import AsyncSynthetixAPI
+from api.cache import DiskCache
+from api.coalesce import AsyncSingleFlight
+from api.incremental import IncrementalStore
+from api.instrumentation import QueryRecorder
+from api.windows import align_window, split_window
+
+
+class VolumeAPI(AsyncSynthetixAPI):
+    """AsyncSynthetixAPI answering the volume query from an in-memory table."""
+
+    def __init__(self, stats: pd.DataFrame, cache=None, delay=0):
+        self.environment = "prod"
+        self.cache = cache
+        self.recorder = QueryRecorder()
+        self.single_flight = AsyncSingleFlight()
+        self.incremental_store = IncrementalStore()
+        self._incremental_locks = weakref.WeakKeyDictionary()
+        self._background_tasks = set()
+        self.stats = stats
+        self.delay = delay
+        self.executed = []
+
+    async def _execute(self, query, backend="pandas"):
+        self.executed.append(query)
+        await asyncio.sleep(self.delay)
+        params = query.params
+        return self.stats[
+            (self.stats["ts"] >= params["start_date"])
+            & (self.stats["ts"] < params["end_date"])
+        ].reset_index(drop=True)
+
+
+@pytest.fixture
+def stats():
+    # daily stats up to today, so the window has closed and open buckets
+    ts = pd.date_range(end=pd.Timestamp.now().normalize(), periods=60, freq="D")
+    volume = pd.Series(range(60), dtype=float)
+    return pd.DataFrame(
+        {"ts": ts, "volume": volume, "cumulative_volume": volume.cumsum()}
+    )
+
+
+def test_windowed_query_with_cache(stats, tmp_path):
+    api = VolumeAPI(stats, cache=DiskCache(str(tmp_path)))
+    start = stats["ts"].iloc[0].date()
+    end = date.today()
+
+    result = asyncio.run(api.get_volume(start, end))
+
+    assert len(api.executed) == len(split_window(*align_window(start, end)))
+    pd.testing.assert_frame_equal(result, stats)
+
+
+def test_concurrent_queries_share_one_execution(stats, tmp_path):
+    # slow enough that every call looks the cache up before the first finishes
+    api = VolumeAPI(stats, cache=DiskCache(str(tmp_path)), delay=0.2)
+    start = stats["ts"].iloc[0].date()
+    end = date.today()
+
+    async def run():
+        return await asyncio.gather(*[api.get_volume(start, end) for _ in range(3)])
+
+    results = asyncio.run(run())
+    executed = len(api.executed)
+    cached = asyncio.run(api.get_volume(start, end))
+
+    assert executed == len(split_window(*align_window(start, end)))
+    assert len(api.executed) == executed
+    assert api.single_flight.stats["coalesced"] == 2 * executed
+    sources = [record["source"] for record in api.recorder.records]
+    assert sources == ["cache"] * executed
+    for result in [*results, cached]:
+        pd.testing.assert_frame_equal(result, stats)
+
+
+def test_incremental_query(stats):
+    api = VolumeAPI(stats)
+    start = stats["ts"].iloc[0].date()
+    end = date.today()
+
+    async def run():
+        await api.get_volume(start, end - timedelta(days=10), incremental=True)
+        return await api.get_volume(start, end, incremental=True)
+
+    result = asyncio.run(run())
+
+    assert len(api.executed) == 2
+    assert api.executed[-1].params["start_date"] == datetime.combine(
+        end - timedelta(days=11), datetime.min.time()
+    )
+    pd.testing.assert_frame_equal(result, stats)
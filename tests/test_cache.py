@@ -0,0 +1,19 @@
+import time
+
+import pyarrow as pa
+
+from api.cache import DiskCache
+
+
+def test_get_counts_stale_entries_as_misses(tmp_path):
+    cache = DiskCache(str(tmp_path), ttl=0.01, stale_ttl=60)
+    cache.set("key", pa.table({"value": [1]}))
+    time.sleep(0.05)
+
+    assert cache.get("key") is None
+    assert cache.stats["misses"] == 1
+    assert cache.stats["stale_hits"] == 0
+
+    table, stale = cache.lookup("key")
+    assert stale and table is not None
+    assert cache.stats["stale_hits"] == 1
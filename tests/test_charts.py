@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboards.utils.charts import chart_bars, chart_lines, use_webgl
+from dashboards.utils.series import fold_tail
+
+
+def long_frame(n_x, n_labels, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "ts": np.repeat(
+                pd.date_range("2024-01-01", periods=n_x, freq="h"), n_labels
+            ),
+            "label": np.tile([f"m{i}" for i in range(n_labels)], n_x),
+            # label sizes decrease, so the tail is well defined
+            "value": rng.uniform(0, 1, n_x * n_labels)
+            * np.tile(np.arange(n_labels, 0, -1), n_x),
+        }
+    )
+
+
+def totals(df):
+    return df.groupby("ts")["value"].sum()
+
+
+def test_fold_tail_fits_the_budget_and_keeps_totals():
+    df = long_frame(100, 80)
+
+    folded = fold_tail(df, "ts", "value", "label", 5000)
+
+    assert len(folded) <= 5000
+    assert "Other" in set(folded["label"])
+    pd.testing.assert_series_equal(totals(folded), totals(df))
+    kept = folded[folded["label"] != "Other"]
+    pd.testing.assert_frame_equal(
+        kept.reset_index(drop=True),
+        df[df["label"].isin(kept["label"])].reset_index(drop=True),
+    )
+
+
+def test_fold_tail_leaves_data_it_cannot_fit():
+    # 10k x values: even one label and the folded rows exceed the budget
+    df = long_frame(10_000, 3)
+
+    assert fold_tail(df, "ts", "value", "label", 5000) is df
+
+
+def test_chart_bars_only_folds_when_asked():
+    df = long_frame(100, 80)
+
+    labels = {trace.name for trace in chart_bars(df, "ts", "value", "", "label").data}
+    folded = chart_bars(df, "ts", "value", "", "label", fold_groups=True)
+
+    assert len(labels) == 80
+    assert "Other" in {trace.name for trace in folded.data}
+
+
+def test_chart_bars_thins_x_values_without_changing_bars():
+    df = long_frame(10_000, 3)
+
+    fig = chart_bars(df, "ts", "value", "", "label")
+
+    kept = pd.DatetimeIndex(fig.data[0].x)
+    assert 0 < len(kept) < 10_000
+    for trace in fig.data:
+        # every trace keeps the same x values and its own bar heights
+        assert pd.DatetimeIndex(trace.x).equals(kept)
+        expected = df[df["label"] == trace.name].set_index("ts")["value"]
+        np.testing.assert_array_equal(trace.y, expected.loc[kept].to_numpy())
+    # the tallest and shortest stacks survive the thinning
+    assert {totals(df).idxmax(), totals(df).idxmin()} <= set(kept)
+
+
+@pytest.mark.parametrize("n_x, webgl", [(1000, False), (5000, True)])
+def test_use_webgl_keeps_the_traces(n_x, webgl):
+    df = long_frame(n_x, 3)
+    svg = chart_lines(
+        df, "ts", "value", "", "label", downsample=None, webgl_threshold=None
+    )
+
+    traces = use_webgl(list(svg.data), threshold=10_000)
+
+    for trace, original in zip(traces, svg.data):
+        assert trace.type == ("scattergl" if webgl else "scatter")
+        np.testing.assert_array_equal(trace.x, original.x)
+        np.testing.assert_array_equal(trace.y, original.y)
+        assert trace.name == original.name and trace.customdata is not None
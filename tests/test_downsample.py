@@ -0,0 +1,133 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboards.utils.charts import chart_area, chart_lines
+from dashboards.utils.downsample import (
+    lttb_indices,
+    max_points,
+    minmax_indices,
+    select_indices,
+)
+
+
+def reference_lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets as published, one point at a time."""
+    n = len(y)
+    every = (n - 2) / (n_out - 2)
+    previous = 0
+    selected = [0]
+    for i in range(n_out - 2):
+        next_start = math.floor((i + 1) * every) + 1
+        next_end = min(math.floor((i + 2) * every) + 1, n)
+        next_x, next_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        best, pick = -1, None
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs(
+                (x[previous] - next_x) * (y[j] - y[previous])
+                - (x[previous] - x[j]) * (next_y - y[previous])
+            )
+            if area > best:
+                best, pick = area, j
+        selected.append(pick)
+        previous = pick
+    selected.append(n - 1)
+    return np.array(selected)
+
+
+def random_walk(n, seed=0):
+    return np.random.default_rng(seed).standard_normal(n).cumsum()
+
+
+@pytest.mark.parametrize("n, n_out", [(1000, 100), (997, 50), (10_000, 1200)])
+def test_lttb_matches_reference(n, n_out):
+    x = np.arange(n, dtype=float)
+    y = random_walk(n)
+
+    np.testing.assert_array_equal(
+        lttb_indices(x, y, n_out), reference_lttb(x, y, n_out)
+    )
+
+
+@pytest.mark.parametrize("n, n_out", [(1000, 100), (10_001, 2400)])
+def test_minmax_keeps_every_bucket_extreme(n, n_out):
+    y = random_walk(n)
+
+    indices = minmax_indices(y, n_out)
+
+    assert len(indices) <= n_out and np.all(np.diff(indices) > 0)
+    assert {0, n - 1} <= set(indices)
+    n_buckets = (n_out - 2) // 2
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    kept = set(indices)
+    for start, end in zip(edges[:-1], edges[1:]):
+        assert start + np.argmin(y[start:end]) in kept
+        assert start + np.argmax(y[start:end]) in kept
+
+
+def test_select_indices_orders_unsorted_x():
+    x = pd.date_range("2024-01-01", periods=5000, freq="h")
+    order = np.random.default_rng(0).permutation(len(x))
+    y = random_walk(len(x))
+
+    indices = select_indices(x[order], y[order], 200)
+
+    assert np.all(np.diff(np.asarray(x[order][indices])) > pd.Timedelta(0))
+    assert y[order][indices].max() == y.max()
+
+
+def long_frame(n_x, n_labels=3):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "ts": np.repeat(
+                pd.date_range("2024-01-01", periods=n_x, freq="min"), n_labels
+            ),
+            "label": np.tile([f"m{i}" for i in range(n_labels)], n_x),
+            "value": rng.standard_normal(n_x * n_labels).cumsum(),
+        }
+    )
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_chart_lines_keeps_a_subset_of_every_trace(method):
+    df = long_frame(20_000)
+    full = chart_lines(df, "ts", "value", "", "label", downsample=None)
+
+    fig = chart_lines(df, "ts", "value", "", "label", downsample=method)
+
+    for trace, original in zip(fig.data, full.data):
+        assert trace.name == original.name
+        assert len(trace.y) <= max_points(method=method)
+        points = pd.Series(original.y, index=pd.DatetimeIndex(original.x))
+        x = pd.DatetimeIndex(trace.x)
+        np.testing.assert_array_equal(trace.y, points.loc[x].to_numpy())
+        if method == "minmax":
+            assert max(trace.y) == max(original.y) and min(trace.y) == min(original.y)
+
+
+def test_chart_lines_leaves_short_series():
+    df = long_frame(500)
+
+    fig = chart_lines(df, "ts", "value", "", "label")
+    full = chart_lines(df, "ts", "value", "", "label", downsample=None)
+
+    for trace, original in zip(fig.data, full.data):
+        np.testing.assert_array_equal(trace.y, original.y)
+
+
+def test_chart_area_keeps_stacks_aligned():
+    df = long_frame(20_000)
+    full = chart_area(df, "ts", "value", "", "label", downsample=None)
+
+    fig = chart_area(df, "ts", "value", "", "label")
+
+    x = pd.DatetimeIndex(fig.data[0].x)
+    assert len(x) <= max_points()
+    stacked = sum(pd.Series(t.y, index=pd.DatetimeIndex(t.x)) for t in full.data)
+    for trace in fig.data:
+        assert pd.DatetimeIndex(trace.x).equals(x)
+    # the extremes of the stacked total survive
+    assert {stacked.idxmax(), stacked.idxmin()} <= set(x)
@@ -0,0 +1,108 @@
+"""
+EXPLAIN checks that every get_* query can filter its fact table through an index.
+
+The checks load the `api.synthetic` fixture into the postgres configured with
+the DB_* environment variables, under their own schema prefix, and are skipped
+when no database is reachable:
+
+    DB_HOST=localhost DB_PORT=5432 DB_NAME=... DB_USER=... DB_PASS=... pytest tests/test_explain.py
+"""
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+import sqlalchemy
+
+psycopg = pytest.importorskip("psycopg")
+
+from api.internal_api import SynthetixAPI, get_db_config
+from api.synthetic import SyntheticData, load
+
+# schema prefix of the fixture tables, kept apart from real environments
+ENVIRONMENT = "explain_test"
+GET_METHODS = sorted(name for name in dir(SynthetixAPI) if name.startswith("get_"))
+
+
+class ExplainAPI(SynthetixAPI):
+    """SynthetixAPI returning the plan of every query instead of its rows."""
+
+    def __init__(self):
+        super().__init__({"env": None}, environment=ENVIRONMENT, streamlit=False)
+        self.plans = []
+
+    def _execute(self, query, backend="pandas"):
+        with self._get_connection() as conn:
+            # the fixture tables are small enough for the planner to prefer
+            # sequential scans, disabling them shows whether an index can
+            # serve the filter at all
+            conn.execute(sqlalchemy.text("SET LOCAL enable_seqscan = off"))
+            plan = conn.execute(
+                sqlalchemy.text(f"EXPLAIN (FORMAT JSON) {query.sql}"), query.params
+            ).scalar()
+        self.plans.append(plan[0]["Plan"])
+        return pd.DataFrame()
+
+
+def scans(node: dict):
+    """Yield the nodes of a plan that read a table."""
+    if "Relation Name" in node:
+        yield node
+    for child in node.get("Plans", []):
+        yield from scans(child)
+
+
+@pytest.fixture(scope="module")
+def api():
+    db_config = get_db_config(streamlit=False)
+    if not db_config["host"]:
+        pytest.skip("DB_HOST is not set")
+    try:
+        connection = psycopg.connect(
+            dbname=db_config["dbname"],
+            user=db_config["user"],
+            password=db_config["password"],
+            host=db_config["host"],
+            port=db_config["port"],
+            connect_timeout=5,
+        )
+    except psycopg.OperationalError as e:
+        pytest.skip(f"Database is not reachable: {e}")
+
+    with connection:
+        load(
+            connection,
+            SyntheticData(accounts=200, markets=4, hours=24 * 30, trades_per_hour=10),
+            environment=ENVIRONMENT,
+        )
+        with ExplainAPI() as api:
+            yield api
+
+        schemas = connection.execute(
+            "SELECT schema_name FROM information_schema.schemata WHERE schema_name LIKE %s",
+            (f"{ENVIRONMENT}%",),
+        ).fetchall()
+        for (schema,) in schemas:
+            connection.execute(
+                psycopg.sql.SQL("DROP SCHEMA {} CASCADE").format(
+                    psycopg.sql.Identifier(schema)
+                )
+            )
+
+
+@pytest.mark.parametrize("method", GET_METHODS)
+def test_get_method_uses_index(api, method):
+    end_date = date.today() - timedelta(days=1)
+    api.plans.clear()
+
+    getattr(api, method)(end_date - timedelta(days=7), end_date)
+
+    assert api.plans
+    for plan in api.plans:
+        for node in scans(plan):
+            if node["Relation Name"].startswith("fct_"):
+                # a full index scan has no condition, a bitmap scan keeps
+                # its index condition as the recheck condition
+                assert "Index Cond" in node or "Recheck Cond" in node, (
+                    f"{method} reads {node['Relation Name']} with a "
+                    f"{node['Node Type']} that does not filter on an index"
+                )
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from dashboards.utils.formatting import human_format, human_format_array
+
+
+def reference(values, **kwargs):
+    return np.array([human_format(value, **kwargs) for value in values], dtype=object)
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    magnitudes = rng.lognormal(0, 8, 20_000) * rng.choice([-1, 1], 20_000)
+    return np.concatenate(
+        [
+            magnitudes[np.abs(magnitudes) < 1e14],
+            np.round(rng.uniform(-2000, 2000, 5000), 1),
+            np.round(rng.uniform(-2, 2, 5000), 3) + 0.0005,
+            [0, -0.0, 1, -1, 999.5, 999_999.5, 99.995, 0.9995, 1e-7, 5e-324],
+        ]
+    )
+
+
+@pytest.mark.parametrize("no_decimals", [False, True])
+@pytest.mark.parametrize("percentage", [False, True])
+def test_matches_human_format(values, no_decimals, percentage):
+    kwargs = {"no_decimals": no_decimals, "percentage": percentage}
+    np.testing.assert_array_equal(
+        human_format_array(values, **kwargs), reference(values, **kwargs)
+    )
+
+
+@pytest.mark.parametrize(
+    "value",
+    [0.5, 1.5, 2.5, -3.5, 0.125, 0.0125, 10.25, 10.35, 15.25, 100.5, 150.5, 1234.5, 2.675],
+)
+@pytest.mark.parametrize("no_decimals", [False, True])
+def test_halfway_values_round_like_human_format(value, no_decimals):
+    # values whose decimal expansion ends in 5 round on their binary value
+    assert human_format_array([value], no_decimals)[0] == human_format(value, no_decimals)
+
+
+def test_non_finite_values():
+    # human_format does not terminate on infinities, so they are checked directly
+    formatted = human_format_array([np.nan, np.inf, -np.inf])
+
+    assert formatted[0] == human_format(np.nan)
+    assert list(formatted[1:]) == ["inf", "-inf"]
+
+
+def test_keeps_shape_and_order():
+    values = np.array([[1234.5, 0.5], [-2e9, 7]])
+
+    formatted = human_format_array(values)
+
+    assert formatted.shape == values.shape and formatted.dtype == object
+    np.testing.assert_array_equal(formatted.ravel(), reference(values.ravel()))
@@ -0,0 +1,98 @@
+import re
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.cache import DiskCache
+from api.coalesce import SingleFlight
+from api.incremental import IncrementalStore
+from api.internal_api import SynthetixAPI
+
+TRUNC_RE = re.compile(r"DATE_TRUNC\('(\w+)', ts\)")
+
+
+class MarketHistoryAPI(SynthetixAPI):
+    """SynthetixAPI answering the open interest query from an in-memory table."""
+
+    def __init__(self, history: pd.DataFrame):
+        self.environment = "prod"
+        self.cache = None
+        self.recorder = None
+        self.single_flight = SingleFlight()
+        self.incremental_store = IncrementalStore()
+        self.history = history
+        self.executed = []
+
+    def _execute(self, query, backend="pandas"):
+        self.executed.append(query)
+        params = query.params
+        rows = self.history[
+            (self.history["ts"] >= params["start_date"])
+            & (self.history["ts"] < params["end_date"])
+        ]
+        unit = TRUNC_RE.search(query.sql).group(1)
+        result = (
+            rows.groupby(rows["ts"].dt.floor("D" if unit == "day" else "h"))[
+                "total_oi_usd"
+            ]
+            .max()
+            .reset_index()
+        )
+        result.insert(1, "chain", "Arbitrum")
+        return result
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(0)
+    ts = pd.date_range("2024-01-01", "2024-01-06", freq="h", inclusive="left")
+    # open interest peaks early in the day, so a partial day has a lower max
+    return pd.DataFrame(
+        {
+            "ts": ts,
+            "total_oi_usd": rng.uniform(10, 100, len(ts)) + 10_000 * (ts.hour < 12),
+        }
+    )
+
+
+@pytest.mark.parametrize("resolution", ["daily", "hourly"])
+def test_incremental_open_interest_matches_full_query(history, resolution):
+    api = MarketHistoryAPI(history)
+    start = date(2024, 1, 1)
+
+    # the daily delta starts INCREMENTAL_OVERLAP before the last stored
+    # bucket, which is on the previous day
+    api.get_perps_open_interest(
+        start, date(2024, 1, 4), resolution=resolution, incremental=True
+    )
+    incremental = api.get_perps_open_interest(
+        start, date(2024, 1, 5), resolution=resolution, incremental=True
+    )
+
+    delta_start = api.executed[-1].params["start_date"]
+    assert delta_start == pd.Timestamp(
+        "2024-01-03" if resolution == "daily" else "2024-01-04 21:00"
+    )
+    full = MarketHistoryAPI(history).get_perps_open_interest(
+        start, date(2024, 1, 5), resolution=resolution, incremental=True
+    )
+    pd.testing.assert_frame_equal(incremental, full)
+
+
+def test_incremental_delta_is_shared_through_the_cache(history, tmp_path):
+    cache = DiskCache(str(tmp_path))
+    start = date(2024, 1, 1)
+    results = []
+    for _ in range(2):
+        api = MarketHistoryAPI(history)
+        api.cache = cache
+        api.get_perps_open_interest(start, date(2024, 1, 4), incremental=True)
+        results.append(
+            api.get_perps_open_interest(start, date(2024, 1, 5), incremental=True)
+        )
+
+    # the second store fetches its full range but reuses the cached delta
+    assert len(api.executed) == 1
+    pd.testing.assert_frame_equal(results[0], results[1])
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from api.pool import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self, fail_rollback=False):
+        self.fail_rollback = fail_rollback
+        self.rollbacks = 0
+        self.closed = False
+
+    def rollback(self):
+        self.rollbacks += 1
+        if self.fail_rollback:
+            raise RuntimeError("connection lost")
+
+    def close(self):
+        self.closed = True
+
+
+def test_connections_are_reused_and_rolled_back():
+    pool = ConnectionPool(FakeConnection, size=1, max_overflow=1)
+
+    first, connect = pool.acquire()
+    assert connect is not None
+    pool.release(first)
+    second, connect = pool.acquire()
+
+    assert second is first and connect is None
+    assert first.rollbacks == 1
+
+
+def test_overflow_and_broken_connections_are_closed():
+    opened = [FakeConnection(), FakeConnection(), FakeConnection(fail_rollback=True)]
+    pool = ConnectionPool(opened.pop, size=1, max_overflow=1)
+
+    broken, _ = pool.acquire()
+    overflow, _ = pool.acquire()
+    pool.release(overflow)
+    kept, _ = pool.acquire()
+    pool.release(broken)
+
+    assert broken.closed
+    assert kept is overflow and not kept.closed
+    assert pool.stats["discards"] == 1
+
+
+def test_acquire_waits_for_a_free_connection():
+    pool = ConnectionPool(FakeConnection, size=1, max_overflow=0, timeout=0.05)
+    connection, _ = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+    threading.Timer(0.01, pool.release, [connection]).start()
+    pool.timeout = 1
+    assert pool.acquire()[0] is connection
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboards.utils.series import rank_by_last_value, split_series
+
+
+def reference_split(df, x_col, y_col, by, align=False):
+    """The groupby the chart traces were built with before `split_series`."""
+    groups = list(df.groupby(by))
+    if align:
+        axis = pd.Index([])
+        for _, group in groups:
+            axis = axis.union(pd.Index(group[x_col].unique()))
+    labels, xs, ys = [], [], []
+    for label, group in groups:
+        if align:
+            group = group.drop_duplicates(subset=x_col).sort_values(by=x_col)
+            group = group.set_index(x_col).reindex(axis, fill_value=0)
+            xs.append(group.index)
+        else:
+            xs.append(group[x_col])
+        labels.append(label)
+        ys.append(group[y_col])
+    return labels, xs, ys
+
+
+def reference_rank(ys, sort_ascending):
+    """The order `sort_traces` gave traces, by their last y value."""
+    return sorted(
+        range(len(ys)),
+        key=lambda i: ys[i].iloc[-1] if len(ys[i]) > 0 else 0,
+        reverse=not sort_ascending,
+    )
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame(
+        {
+            "ts": pd.Timestamp("2024-01-01")
+            + pd.to_timedelta(rng.integers(0, 200, n), unit="h"),
+            "label": rng.choice(["ETH", "BTC", "SOL", "OP", None], n),
+            # few distinct values, so last values tie
+            "value": rng.integers(-3, 4, n).astype(float),
+        }
+    )
+    # rows are unordered and some (label, ts) pairs are duplicated
+    return pd.concat([df, df.sample(200, random_state=0)], ignore_index=True)
+
+
+@pytest.mark.parametrize("align", [False, True])
+def test_split_series_matches_groupby(df, align):
+    labels, xs, ys = reference_split(df, "ts", "value", "label", align)
+
+    split = split_series(df, "ts", "value", "label", align=align)
+
+    assert split.labels == labels
+    for x, y, expected_x, expected_y in zip(split.x, split.y, xs, ys):
+        # the old axis was an object index of timestamps, the values are the same
+        assert list(x) == list(expected_x)
+        np.testing.assert_array_equal(np.asarray(y, dtype=float), expected_y.to_numpy())
+    np.testing.assert_array_equal(split.last, [y.iloc[-1] for y in ys])
+
+
+@pytest.mark.parametrize("align", [False, True])
+@pytest.mark.parametrize("sort_ascending", [False, True])
+def test_rank_by_last_value_matches_sort_traces(df, align, sort_ascending):
+    _, _, ys = reference_split(df, "ts", "value", "label", align)
+    split = split_series(df, "ts", "value", "label", align=align)
+
+    order = rank_by_last_value(split.last, sort_ascending)
+
+    assert list(order) == reference_rank(ys, sort_ascending)
+
+
+def test_split_series_without_labels():
+    df = pd.DataFrame({"ts": [1, 2], "value": [1.0, 2.0], "label": [None, None]})
+
+    split = split_series(df, "ts", "value", "label", align=True)
+
+    assert split.labels == [] and len(split.last) == 0
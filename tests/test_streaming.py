@@ -0,0 +1,38 @@
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from api.internal_api import _rechunk
+from api.streaming import write_chunks
+
+SCHEMA = pa.schema([("ts", pa.timestamp("us")), ("volume", pa.float64())])
+
+
+def test_empty_stream_yields_its_schema():
+    chunks = list(_rechunk(iter([]), SCHEMA, 10))
+
+    assert len(chunks) == 1
+    assert chunks[0].num_rows == 0 and chunks[0].schema == SCHEMA
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet"])
+def test_empty_stream_writes_the_header(file_format):
+    sink = io.BytesIO()
+
+    rows = write_chunks(_rechunk(iter([]), SCHEMA, 10), sink, file_format)
+
+    assert rows == 0
+    if file_format == "csv":
+        assert sink.getvalue() == b'"ts","volume"\n'
+    else:
+        assert pq.read_table(io.BytesIO(sink.getvalue())).schema == SCHEMA
+
+
+def test_no_chunks_writes_the_given_schema():
+    sink = io.BytesIO()
+
+    write_chunks([], sink, "csv", schema=SCHEMA)
+
+    assert sink.getvalue() == b'"ts","volume"\n'